@@ -1,11 +1,29 @@
 import asyncio
+import base64
+import functools
+import hashlib
+import heapq
+import html
+import itertools
 import json
 import logging
+import mmap
 import os
-import requests
+import random
 import re
+import ssl
+import struct
+import sys
+import threading
 import time
-from typing import Optional, Dict
+import unicodedata
+import zlib
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left
+from collections import Counter, OrderedDict, deque
+from typing import Optional, Dict, Iterable, Iterator, Callable, Awaitable
+from urllib.parse import urljoin, urlsplit
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -17,66 +35,2693 @@ CURATOR_IDS = [
     38115929,  # Geforce Now Friendly (original)
     45481916,  # Geforce Now Friendly Part 2
 ]
+CURATOR_NAMES = {
+    38115929: "Geforce Now Friendly",
+    45481916: "Geforce Now Friendly Part 2",
+}
+
+# Where the sources live. Overridable so refreshes can run against a local
+# stand-in server (see scripts/bench_refresh.py).
+STEAM_STORE_URL = os.environ.get("GFN_STEAM_STORE_URL", "https://store.steampowered.com")
+
+# NVIDIA's public list of supported PC games. Curator sources are identified
+# by their curator ID; this one gets a small ID no curator uses.
+NVIDIA_GAME_LIST_URL = os.environ.get(
+    "GFN_NVIDIA_GAME_LIST_URL", "https://static.nvidiagrid.net/supported-public-game-list/gfnpc.json"
+)
+NVIDIA_SOURCE_ID = 1
+
+# Every source the games database is built from, in GameIndex bitmask order
+SOURCE_IDS = CURATOR_IDS + [NVIDIA_SOURCE_ID]
+
+# Per-lookup log lines are sampled: one in every LOOKUP_LOG_SAMPLE lookups is
+# logged at DEBUG level, 0 turns them off. Set GFN_LOOKUP_LOG_SAMPLE=1 to log
+# every lookup while debugging.
+LOOKUP_LOG_SAMPLE = int(os.environ.get("GFN_LOOKUP_LOG_SAMPLE", "0") or 0)
+if LOOKUP_LOG_SAMPLE > 0:
+    logger.setLevel(logging.DEBUG)
+_lookup_log_counter = itertools.count()
+
+
+def _sample_lookup_log() -> bool:
+    """Whether this lookup should write its debug log lines"""
+    return LOOKUP_LOG_SAMPLE > 0 and next(_lookup_log_counter) % LOOKUP_LOG_SAMPLE == 0
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram; observing a value is O(log buckets)"""
+
+    # Upper bounds in seconds, from 50 us up to a 30 s refresh
+    BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+               0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(self.BUCKETS) + 1)
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[bisect_left(self.BUCKETS, seconds)] += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile, capped at the max seen"""
+        rank = q * self.count
+        seen = 0
+        for bound, hits in zip(self.BUCKETS, self.buckets):
+            seen += hits
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, any]:
+        return {
+            "count": self.count,
+            "avg_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": self.quantile(0.5) * 1000,
+            "p95_ms": self.quantile(0.95) * 1000,
+            "max_ms": self.max * 1000,
+        }
 
 
-def fetch_curator_games(curator_id: int, batch_size: int = 100) -> Dict[str, Dict]:
-    """Fetch all games from a Steam curator."""
-    games = {}
-    start = 0
+class Metrics:
+    """
+    Process-wide counters and latency histograms.
 
-    logger.info(f"Fetching games from curator {curator_id}...")
+    Cheap enough for hot paths: one lock, one dict lookup and a bisect.
+    Exposed through Plugin.get_metrics.
+    """
 
-    while True:
-        url = f"https://store.steampowered.com/curator/{curator_id}/ajaxgetfilteredrecommendations/render/?query=&start={start}&count={batch_size}"
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.counters: Dict[str, int] = {}
+        self.histograms: Dict[str, LatencyHistogram] = {}
+
+    def incr(self, name: str, value: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+            histogram.observe(seconds)
+
+    def snapshot(self) -> Dict[str, any]:
+        with self._lock:
+            return {
+                "uptime_s": time.time() - self.started,
+                "counters": dict(self.counters),
+                "latency": {name: h.to_dict() for name, h in self.histograms.items()},
+            }
 
-        # Retry the HTTP fetch up to 3 times with exponential backoff
-        data = None
-        for attempt in range(3):
-            try:
-                response = requests.get(url, timeout=10)
-                data = response.json()
-                break  # success — exit retry loop
-            except Exception as e:
-                wait = 2 ** attempt  # 1s, 2s, 4s
-                logger.warning(f"  Attempt {attempt + 1}/3 failed for curator {curator_id}: {e}. Retrying in {wait}s...")
-                if attempt < 2:
-                    time.sleep(wait)
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self.started = time.time()
+
+
+metrics = Metrics()
+
+
+def instrumented(method):
+    """Count calls, errors and latency of a Plugin RPC method under rpc.<name>"""
+    name = f"rpc.{method.__name__}"
+
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        except Exception:
+            metrics.incr(f"{name}.errors")
+            raise
+        finally:
+            metrics.observe(name, time.perf_counter() - start)
+
+    return wrapper
+
+
+# Curator page fetching: parallelism cap and polite request rate towards Steam.
+# The rate is shared by every worker of a refresh, so raising the concurrency
+# only helps until the rate limit becomes the bottleneck.
+FETCH_CONCURRENCY = 4
+FETCH_RATE_LIMIT = 4.0  # requests per second
+FETCH_TIMEOUT = 10  # seconds per HTTP request, redirects included
+FETCH_MAX_REDIRECTS = 5
+_REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+STREAM_CHUNK_SIZE = 16 * 1024  # bytes per read when streaming response bodies
+
+# Incremental sync bookkeeping lives next to defaults/gfn_games.json
+SYNC_STATE_FILENAME = "gfn_sync_state.json"
+FULL_SYNC_INTERVAL = timedelta(days=30)
+
+# Checkpoints of an unfinished refresh, so the next attempt resumes instead of
+# starting over; pages older than JOURNAL_MAX_AGE are fetched again
+JOURNAL_FILENAME = "gfn_refresh_journal.json"
+JOURNAL_MAX_AGE = timedelta(hours=6)
+JOURNAL_FLUSH_INTERVAL = 2  # seconds between journal writes while pages arrive
+
+
+class RateLimiter:
+    """Thread-safe limiter that spaces requests evenly at `rate` per second"""
+
+    def __init__(self, rate: float = FETCH_RATE_LIMIT):
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Reserve the next request slot and return how long to wait for it"""
+        if not self._interval:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+
+        return slot - now
+
+    async def wait_async(self):
+        """Sleep on the event loop until the caller's request slot comes up"""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def _curator_page_url(curator_id: int, start: int, batch_size: int) -> str:
+    return f"{STEAM_STORE_URL}/curator/{curator_id}/ajaxgetfilteredrecommendations/render/?query=&start={start}&count={batch_size}"
+
+
+class AppidStreamParser:
+    """
+    Incremental app ID extractor for curator `ajaxgetfilteredrecommendations`
+    responses.
+
+    The response is a JSON object whose `results_html` string holds the
+    rendered recommendations. Instead of decoding the whole body and running
+    a regex over the HTML, raw body chunks are fed in as they arrive and
+    every `data-ds-appid` attribute is turned into an int as soon as it is
+    complete. The first `alt` text inside the element carrying an app ID
+    (its capsule image) is kept as the game's title; an empty one leaves the
+    game untitled, and later `alt` texts, or any after that element closes,
+    are never attached to it. Tags are only counted, not parsed: opening
+    tags of non-void elements nest, and a closing tag at the app ID's own
+    level ends its element. Attributes match both the JSON-escaped (\\") and
+    plain (") quote forms, closing tags both </ and <\\/. Only a small overlap
+    of the previous chunk is kept, so memory is bounded by the chunk size
+    instead of the page size.
+    """
+
+    _TOKEN = re.compile(rb'data-ds-appid=\\?"(\d+)\\?"'
+                        rb'|\balt=\\?"((?:[^"\\]|\\[^"]){0,400}?)\\?"'
+                        rb'|<([a-zA-Z][a-zA-Z0-9]*)(?=[\s>/\\])'  # an opening tag, once its name is complete
+                        rb'|(<\\?/|/>)')  # a closing tag or the end of a self-closing one
+    _VOID_TAGS = frozenset((b"area", b"base", b"br", b"col", b"embed", b"hr", b"img", b"input", b"link",
+                            b"meta", b"source", b"track", b"wbr"))
+    _TOTAL_COUNT = re.compile(rb'"total_count"\s*:\s*"?(\d+)')
+    _OVERLAP = 1024  # longer than any token above (an escape is 2 bytes), so none is split across feeds
+
+    def __init__(self):
+        self._tail = b""
+        self.appids: list = []
+        self.names: Dict[str, str] = {}
+        self.total_count: Optional[int] = None
+        self._pending: Optional[int] = None  # app ID still waiting for its alt text
+        self._depth = 0  # elements open inside the pending app ID's element
+        self._open_void = False  # whether the last opening tag was a void element
+
+    @staticmethod
+    def _decode_name(raw: bytes) -> str:
+        try:
+            text = json.loads(b'"' + raw + b'"')  # JSON escapes inside results_html
+        except ValueError:
+            text = raw.decode("utf-8", "replace")
+        return html.unescape(text).strip()
+
+    def feed(self, chunk: bytes) -> list:
+        """Consume the next body chunk and return the app IDs completed by it"""
+        buffer = self._tail + chunk
+        found = []
+        end = 0
+        for match in self._TOKEN.finditer(buffer):
+            appid, name, tag, close = match.groups()
+            end = match.end()
+            if tag is not None:
+                self._open_void = tag.lower() in self._VOID_TAGS
+                if self._pending is not None and not self._open_void:
+                    self._depth += 1
+            elif close is not None:
+                if self._pending is None or (close == b"/>" and self._open_void):
+                    continue
+                if self._depth:
+                    self._depth -= 1
                 else:
-                    logger.error(f"  All retries exhausted for curator {curator_id} at offset {start}")
+                    self._pending = None  # the app ID's element closed without a title
+            elif appid is not None:
+                self._pending = int(appid)
+                self._depth = 0
+                found.append(self._pending)
+            elif self._pending is not None:
+                name = self._decode_name(name) if name else ""
+                if name:
+                    self.names[str(self._pending)] = name
+                self._pending = None
+
+        if self.total_count is None:
+            match = self._TOTAL_COUNT.search(buffer)
+            # Digits at the very end of the buffer may continue in the next chunk
+            if match and match.end() < len(buffer):
+                self.total_count = int(match.group(1))
+
+        self._tail = buffer[max(end, len(buffer) - self._OVERLAP):]
+        self.appids.extend(found)
+        return found
+
+    def iter_appids(self, chunks: Iterable[bytes]) -> Iterator[int]:
+        """Feed `chunks` and yield app IDs as they appear"""
+        for chunk in chunks:
+            yield from self.feed(chunk)
+
+    def page(self) -> Dict[str, any]:
+        """Finish the body and return {'total_count', 'appids', 'names'} for _CuratorPager"""
+        if self.total_count is None:
+            match = self._TOTAL_COUNT.search(self._tail)
+            if match is None:
+                raise ValueError("curator response has no total_count")
+            self.total_count = int(match.group(1))
+        self._tail = b""
+        return {"total_count": self.total_count, "appids": self.appids, "names": self.names}
+
+
+def _page_fingerprint(appids: list) -> str:
+    """Order-independent fingerprint of the app IDs on one curator page"""
+    digest = hashlib.sha1(",".join(sorted(appids)).encode("ascii")).hexdigest()
+    return digest[:16]
+
+
+class CuratorSyncState:
+    """
+    Per-curator sync bookkeeping stored next to the games database.
+
+    For every curator it remembers the `total_count` Steam reported, a
+    fingerprint per fetched page offset and the app IDs the curator listed,
+    so the next refresh can tell which pages still need downloading.
+    """
 
-        if data is None:
-            break  # all retries failed — stop pagination
+    VERSION = 1
 
-        html = data.get('results_html', '')
-        total_count = int(data.get('total_count', 0))
+    def __init__(self, curators: Optional[Dict[str, Dict]] = None):
+        self.curators: Dict[str, Dict] = curators or {}
 
-        # Extract app IDs from HTML
-        appids = list(set(re.findall(r'data-ds-appid="(\d+)"', html)))
+    @classmethod
+    def load(cls, path: Path) -> "CuratorSyncState":
+        """Load the sync state, falling back to an empty one (full sync)"""
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            if data.get("version") == cls.VERSION:
+                return cls(data.get("curators", {}))
+            logger.info(f"Ignoring sync state with version {data.get('version')}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Could not read sync state {path}: {e}")
+        return cls()
+
+    def save(self, path: Path):
+        data = json.dumps({"version": self.VERSION, "curators": self.curators}, separators=(",", ":"))
+        _write_atomic(path, data.encode("utf-8"), fsync=False)  # a lost state only costs a full sync
+
+    def get(self, curator_id: int) -> Optional[Dict]:
+        return self.curators.get(str(curator_id))
+
+    def update(self, curator_id: int, entry: Dict):
+        self.curators[str(curator_id)] = entry
+
+
+class RefreshJournal:
+    """
+    Checkpoint journal of an in-progress refresh.
+
+    Records the app IDs of every curator page as it is fetched, keyed by
+    curator, `total_count` and offset, and is written every few seconds and
+    whenever a fetch stops (including cancellation). Pages are recorded on the
+    event loop; writes run on worker threads from a copy taken under the lock,
+    so recording never waits for the disk. A refresh interrupted by an unload,
+    a crash or a dropped network resumes from it: pages already in the journal
+    are not requested again as long as the curator's `total_count` still
+    matches. The journal is discarded once a complete refresh has been
+    published.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Optional[Path] = None, curators: Optional[Dict[str, Dict]] = None,
+                 started: Optional[str] = None):
+        self.path = path
+        self.curators: Dict[str, Dict] = curators or {}
+        self.started = started or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self._dirty = False
+        self._last_flush = 0.0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path) -> "RefreshJournal":
+        """Load the journal of an interrupted refresh, or start a new one"""
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            started = datetime.strptime(data.get("started", ""), "%Y-%m-%d %H:%M:%S")
+            if data.get("version") == cls.VERSION and datetime.now() - started <= JOURNAL_MAX_AGE:
+                return cls(path, data.get("curators", {}), data["started"])
+            logger.info("Ignoring outdated refresh journal")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Could not read refresh journal {path}: {e}")
+        return cls(path)
+
+    def begin(self, curator_id: int, total_count: int, batch_size: int) -> Dict[int, list]:
+        """Start (or resume) a curator; returns the checkpointed pages still valid"""
+        with self._lock:
+            entry = self.curators.get(str(curator_id))
+            if entry and entry["total_count"] == total_count and entry["batch_size"] == batch_size:
+                return {int(start): appids for start, appids in entry["pages"].items()}
+            self.curators[str(curator_id)] = {"total_count": total_count, "batch_size": batch_size, "pages": {}}
+            self._dirty = True
+        return {}
+
+    def record(self, curator_id: int, start: int, appids: list):
+        with self._lock:
+            entry = self.curators.get(str(curator_id))
+            if entry is not None:
+                entry["pages"][str(start)] = appids
+                self._dirty = True
+
+    def flush_due(self) -> bool:
+        """
+        Whether pending checkpoints should be written now (the last write is
+        JOURNAL_FLUSH_INTERVAL old); claims the write, so concurrent page
+        fetches schedule one flush between them
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not self._dirty or now - self._last_flush < JOURNAL_FLUSH_INTERVAL:
+                return False
+            self._last_flush = now
+            return True
+
+    def flush(self):
+        """
+        Write pending checkpoints (best effort: a lost journal only costs
+        re-downloads). Blocking; call it through asyncio.to_thread.
+        """
+        if self.path is None:
+            return
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                self._last_flush = time.monotonic()
+                self._dirty = False
+                # Recorded page lists are never mutated, only replaced
+                curators = {curator_id: dict(entry, pages=dict(entry["pages"]))
+                            for curator_id, entry in self.curators.items()}
+            data = {"version": self.VERSION, "started": self.started, "curators": curators}
+            try:
+                _write_atomic(self.path, json.dumps(data, separators=(",", ":")).encode("utf-8"), fsync=False)
+            except OSError as e:
+                logger.warning(f"Could not write refresh journal {self.path}: {e}")
+                with self._lock:
+                    self._dirty = True
+
+    def discard(self):
+        """Forget the checkpoints once their refresh has been published"""
+        with self._write_lock:
+            with self._lock:
+                self.curators = {}
+                self._dirty = False
+            if self.path is not None:
+                try:
+                    self.path.unlink()
+                except FileNotFoundError:
+                    pass
 
-        if not appids:
-            break
 
-        logger.info(f"  Fetched {len(appids)} games (offset {start}/{total_count})")
+class _CuratorPager:
+    """
+    Pagination plan for one curator, driven by fetch_curator_games_async.
+
+    The driver fetches the first page, hands it to `start()` and then keeps
+    fetching the offsets it is given until `feed()` returns no more work.
+
+    Without sync state every remaining page is requested in one wave. With
+    state from a previous sync the pager compares against it:
+
+    - same `total_count` and same first page: nothing changed, stop after one request
+    - `total_count` shrank: games were removed somewhere, fall back to a full sync
+    - otherwise walk forward in waves of `wave_size` pages and stop at the first
+      page that is identical to last time or contains only known app IDs, once
+      enough new ones have been seen to account for the growth in `total_count`
+
+    Curator lists are newest-first, so additions land on the leading pages and
+    a walk usually stops after a request or two. An early stop keeps the
+    remembered app IDs for the unfetched tail, which cannot notice a removal
+    offset by an addition; a full sync is forced every FULL_SYNC_INTERVAL.
+
+    With a RefreshJournal a full sync skips the pages an interrupted attempt
+    already fetched, and records every page it fetches; writing the journal is
+    left to the driver. Pages that fail every retry are listed in `missing`;
+    the result is then "partial" and the sync state is left alone so the next
+    refresh tries again.
+    """
 
+    def __init__(self, curator_id: int, batch_size: int, sync_state: Optional[CuratorSyncState] = None,
+                 wave_size: int = FETCH_CONCURRENCY, journal: Optional[RefreshJournal] = None):
+        self.curator_id = curator_id
+        self.batch_size = batch_size
+        self.sync_state = sync_state
+        self.journal = journal
+        self.missing: list = []
+        self.wave_size = max(1, wave_size)
+        self.total_count = 0
+        self.pages: Dict[int, list] = {}
+        self.names: Dict[str, str] = {}
+        self.requests = 0
+        self._offsets: list = []
+        self._previous: Optional[Dict] = None
+        self._mode = "full"
+        self._new: set = set()
+
+        previous = sync_state.get(curator_id) if sync_state else None
+        if previous and previous.get("batch_size") == batch_size and not self._full_sync_due(previous):
+            self._previous = previous
+
+    @property
+    def mode(self) -> str:
+        """full, unchanged, incremental, partial (after finish()) or failed"""
+        return self._mode
+
+    @staticmethod
+    def _full_sync_due(previous: Dict) -> bool:
+        try:
+            last_full = datetime.strptime(previous.get("last_full_sync", ""), "%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            return True
+        return datetime.now() - last_full > FULL_SYNC_INTERVAL
+
+    def start(self, first_page: Optional[Dict]) -> list:
+        """Consume the first page and return the first wave of offsets to fetch"""
+        self.requests += 1
+        if first_page is None:
+            self._mode = "failed"
+            return []
+
+        self.total_count = int(first_page.get('total_count', 0))
+        checkpoint = self.journal.begin(self.curator_id, self.total_count, self.batch_size) if self.journal else {}
+        appids = self._add_page(0, first_page)
+        self._offsets = list(range(self.batch_size, self.total_count, self.batch_size))
+
+        previous = self._previous
+        if previous is not None:
+            if self.total_count == previous["total_count"] and \
+                    _page_fingerprint(appids) == previous["pages"].get("0"):
+                self._mode = "unchanged"
+                logger.info(f"  Curator {self.curator_id} unchanged since last sync")
+                return []
+            if self.total_count >= previous["total_count"]:
+                self._mode = "incremental"
+                self._new = set(appids) - set(str(a) for a in previous["appids"])
+                return self._next_wave()
+            logger.info(f"  Curator {self.curator_id} shrank, falling back to a full sync")
+
+        self._mode = "full"
+        wave, self._offsets = self._offsets, []
+        resumed = [start for start in wave if start in checkpoint]
+        if resumed:
+            logger.info(f"  Curator {self.curator_id}: resuming with {len(resumed)} pages from the refresh journal")
+            for start in resumed:
+                self.pages[start] = checkpoint[start]
+            wave = [start for start in wave if start not in checkpoint]
+        return wave
+
+    def feed(self, offsets: list, pages: list) -> list:
+        """Consume a fetched wave and return the next one (empty when done)"""
+        self.requests += len(offsets)
+        stop = False
+        for start, data in zip(offsets, pages):
+            if data is None:
+                self.missing.append(start)
+                continue
+            appids = self._add_page(start, data)
+            if self._mode == "incremental" and self._is_known(start, appids):
+                stop = True
+
+        if self._mode != "incremental":
+            return []
+        if stop:
+            logger.info(f"  Curator {self.curator_id}: reached already-known pages after {self.requests} requests")
+            self._offsets = []
+            return []
+        return self._next_wave()
+
+    def _next_wave(self) -> list:
+        wave, self._offsets = self._offsets[:self.wave_size], self._offsets[self.wave_size:]
+        if not wave:
+            self._mode = "full"  # walked every page: the result is complete
+        return wave
+
+    def _is_known(self, start: int, appids: list) -> bool:
+        fresh = set(appids) - set(str(a) for a in self._previous["appids"])
+        self._new |= fresh
+        unchanged = _page_fingerprint(appids) == self._previous["pages"].get(str(start)) or not fresh
+        # Never stop before the growth in total_count is accounted for
+        return unchanged and len(self._new) >= self.total_count - self._previous["total_count"]
+
+    def checkpoint(self, start: int, data: Optional[Dict]):
+        """Journal a page as soon as it arrives, before the rest of its wave"""
+        if self.journal and data is not None and data["appids"]:
+            self.journal.record(self.curator_id, start, list({str(appid) for appid in data["appids"]}))
+
+    def _add_page(self, start: int, data: Optional[Dict]) -> list:
+        appids = list({str(appid) for appid in data["appids"]}) if data is not None else []
+        if data is not None:
+            self.names.update(data.get("names") or {})
+        if appids:
+            logger.info(f"  Fetched {len(appids)} games (offset {start}/{self.total_count})")
+            self.pages[start] = appids
+            if self.journal:
+                self.journal.record(self.curator_id, start, appids)
+        return appids
+
+    def finish(self) -> Dict[str, Dict]:
+        """Build the curator's games dict and record the new sync state"""
+        appids = set()
+        for page in self.pages.values():
+            appids.update(page)
+
+        previous = self._previous
+        if self._mode in ("unchanged", "incremental"):
+            # Reuse what the unfetched pages held last time
+            appids.update(str(a) for a in previous["appids"])
+
+        if self.missing:
+            logger.warning(f"  Curator {self.curator_id}: {len(self.missing)} pages could not be fetched, "
+                           f"result is partial")
+            self._mode = "partial"
+
+        if self.sync_state is not None and self._mode not in ("failed", "partial"):
+            if self._mode == "full":
+                fingerprints = {}
+                last_full_sync = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            else:
+                # Offsets after the first changed page have shifted; only keep
+                # fingerprints of pages that are known to be current
+                fingerprints = dict(previous["pages"]) if self._mode == "unchanged" else {}
+                last_full_sync = previous["last_full_sync"]
+            fingerprints.update({str(start): _page_fingerprint(page) for start, page in self.pages.items()})
+            self.sync_state.update(self.curator_id, {
+                "total_count": self.total_count,
+                "batch_size": self.batch_size,
+                "last_full_sync": last_full_sync,
+                "pages": fingerprints,
+                "appids": sorted(int(a) for a in appids),
+            })
+
+        games = {}
         for appid in appids:
-            games[appid] = {
-                "available": True,
-                "curator_id": curator_id
+            games[appid] = {"available": True, "curator_id": self.curator_id}
+            name = self.names.get(appid)
+            if name:
+                games[appid]["name"] = name
+        return games
+
+
+class HTTPValidatorCache:
+    """
+    Persistent HTTP cache of validators and bodies, keyed by URL.
+
+    Responses that carry an ETag or Last-Modified header are stored on disk
+    (index.json plus one body file per URL). The next request for the same
+    URL sends If-None-Match / If-Modified-Since, and a 304 is answered from
+    the stored body, so nothing is downloaded. Callers can check the
+    response's `from_cache` flag to skip re-parsing entirely. Used by
+    AsyncHTTPClient.
+    """
+
+    INDEX_FILENAME = "index.json"
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        try:
+            with open(self.directory / self.INDEX_FILENAME, 'r') as f:
+                self._entries = json.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable HTTP cache index in {self.directory}: {e}")
+
+    @staticmethod
+    def _body_name(url: str) -> str:
+        return hashlib.sha1(url.encode("utf-8")).hexdigest() + ".body"
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Validator headers to send for `url` (empty when nothing is cached)"""
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry is None or not (self.directory / entry["file"]).exists():
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def hit(self, url: str) -> Optional[bytes]:
+        """Stored body for a 304 response, or None if it went missing"""
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry is None:
+            return None
+        try:
+            with open(self.directory / entry["file"], 'rb') as f:
+                body = f.read()
+        except OSError:
+            return None
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += len(body)
+        metrics.incr("http_cache.hits")
+        metrics.incr("http_cache.bytes_saved", len(body))
+        return body
+
+    def store(self, url: str, headers, body: bytes):
+        """Remember `body` if the response carries validators; count a miss either way"""
+        with self._lock:
+            self.misses += 1
+        metrics.incr("http_cache.misses")
+
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        if not etag and not last_modified:
+            return
+
+        entry = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "file": self._body_name(url),
+            "size": len(body),
+        }
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            _write_atomic(self.directory / entry["file"], body)
+            with self._lock:
+                self._entries[url] = entry
+            # Stores run on worker threads; one index write at a time, each
+            # with every entry recorded so far
+            with self._write_lock:
+                with self._lock:
+                    index = json.dumps(self._entries).encode("utf-8")
+                _write_atomic(self.directory / self.INDEX_FILENAME, index)
+        except OSError as e:
+            logger.warning(f"Could not store {url} in the HTTP cache: {e}")
+
+    def stats(self) -> Dict[str, any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "bytes_saved": self.bytes_saved,
             }
 
-        start += batch_size
 
-        # Stop if we've fetched everything
-        if start >= total_count:
-            break
+def _ssl_context() -> ssl.SSLContext:
+    """TLS context using the bundled certifi store when available, like requests does"""
+    # certifi is imported on first use: only refreshes need it (ssl is
+    # loaded by asyncio anyway)
+    try:
+        import certifi
+        return ssl.create_default_context(cafile=certifi.where())
+    except ImportError:
+        return ssl.create_default_context()
+
+
+class AsyncHTTPResponse:
+    """Status, lower-cased headers and decoded body of an AsyncHTTPClient request"""
+
+    def __init__(self, status: int, headers: Dict[str, str], body: bytes, from_cache: bool = False):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.from_cache = from_cache
 
-        # Be nice to Steam's servers
-        time.sleep(0.5)
+    def json(self):
+        return json.loads(self.body)
 
+
+class AsyncHTTPClient:
+    """
+    Minimal HTTP/1.1 GET client on asyncio streams.
+
+    Connections are kept alive and pooled per host; at most `max_connections`
+    requests are in flight at once. Redirects (301/302/303/307/308) are
+    followed up to FETCH_MAX_REDIRECTS times. With an HTTPValidatorCache,
+    requests are revalidated and a 304 is answered from the stored body.
+    Every request runs under its own deadline, and a request that times out
+    or is cancelled closes its connection instead of returning it to the
+    pool, so cancellation never leaves a half-read response behind.
+    """
+
+    def __init__(self, max_connections: int = FETCH_CONCURRENCY, timeout: float = FETCH_TIMEOUT,
+                 cache: Optional[HTTPValidatorCache] = None):
+        self._timeout = timeout
+        self._cache = cache
+        self._semaphore = asyncio.Semaphore(max_connections)
+        self._idle: Dict[tuple, list] = {}
+        self._ssl: Optional[ssl.SSLContext] = None
+        self._closed = False
+
+    async def get(self, url: str, timeout: Optional[float] = None,
+                  sink: Optional[Callable[[bytes], any]] = None) -> AsyncHTTPResponse:
+        """
+        GET `url`, raising asyncio.TimeoutError once the deadline passes
+
+        With a `sink`, the decoded body is passed to it chunk by chunk as it
+        arrives and the response body is left empty. Redirects are followed
+        within the same deadline.
+        """
+        if self._closed:
+            raise RuntimeError("HTTP client is closed")
+
+        async with self._semaphore:
+            return await asyncio.wait_for(self._follow(url, sink), timeout or self._timeout)
+
+    async def _follow(self, url: str, sink: Optional[Callable[[bytes], any]] = None) -> AsyncHTTPResponse:
+        for _ in range(FETCH_MAX_REDIRECTS + 1):
+            response = await self._request(url, sink)
+            location = response.headers.get("location")
+            if response.status not in _REDIRECT_STATUSES or not location:
+                return response
+            url = urljoin(url, location)
+        raise ConnectionError(f"more than {FETCH_MAX_REDIRECTS} redirects")
+
+    async def close(self):
+        """Close all pooled connections"""
+        self._closed = True
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+
+    async def _connect(self, key: tuple):
+        scheme, host, port = key
+        if scheme == "https":
+            if self._ssl is None:
+                self._ssl = _ssl_context()
+            return await asyncio.open_connection(host, port, ssl=self._ssl)
+        return await asyncio.open_connection(host, port)
+
+    async def _request(self, url: str, sink: Optional[Callable[[bytes], any]] = None) -> AsyncHTTPResponse:
+        parts = urlsplit(url)
+        scheme = parts.scheme or "https"
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname, port)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        host = parts.hostname if parts.port is None else f"{parts.hostname}:{parts.port}"
+        validators = self._cache.conditional_headers(url) if self._cache else {}
+        request = (
+            f"GET {path} HTTP/1.1\r\n"
+            f"Host: {host}\r\n"
+            "User-Agent: gfn-for-deck\r\n"
+            "Accept: application/json\r\n"
+            "Accept-Encoding: gzip\r\n"
+            "Connection: keep-alive\r\n"
+            + "".join(f"{name}: {value}\r\n" for name, value in validators.items()) +
+            "\r\n"
+        ).encode("latin-1")
+
+        # A pooled connection may have been closed by the server while idle;
+        # in that case retry once on a fresh connection
+        idle = self._idle.get(key)
+        reused = bool(idle)
+        reader, writer = idle.pop() if idle else await self._connect(key)
+
+        try:
+            try:
+                writer.write(request)
+                await writer.drain()
+                status_line = await reader.readline()
+                if not status_line:
+                    raise ConnectionResetError("connection closed before response")
+            except (ConnectionError, OSError):
+                if not reused:
+                    raise
+                writer.close()
+                reader, writer = await self._connect(key)
+                writer.write(request)
+                await writer.drain()
+                status_line = await reader.readline()
+
+            status, headers, body, keep_alive = await self._read_response(
+                reader, status_line, sink, capture=self._cache is not None)
+        except BaseException:
+            # Timeouts and cancellation land here too: never pool a half-read connection
+            writer.close()
+            raise
+
+        if keep_alive and not self._closed:
+            self._idle.setdefault(key, []).append((reader, writer))
+        else:
+            writer.close()
+
+        # Reading and writing cached bodies (gfnpc.json is several MB, written
+        # with an fsync) happens on a worker thread, not on the event loop
+        if self._cache:
+            if status == 304:
+                cached = await asyncio.to_thread(self._cache.hit, url)
+                if cached is not None:
+                    if sink is not None:
+                        for i in range(0, len(cached), STREAM_CHUNK_SIZE):
+                            sink(cached[i:i + STREAM_CHUNK_SIZE])
+                        cached = b""
+                    return AsyncHTTPResponse(200, headers, cached, from_cache=True)
+            elif status == 200:
+                await asyncio.to_thread(self._cache.store, url, headers, body)
+
+        return AsyncHTTPResponse(status, headers, b"" if sink is not None else body)
+
+    @staticmethod
+    async def _read_response(reader: asyncio.StreamReader, status_line: bytes,
+                             sink: Optional[Callable[[bytes], any]] = None, capture: bool = False) -> tuple:
+        """
+        Read one response. The decoded body goes to `sink` when given; it is
+        also collected and returned when there is no sink, or when `capture`
+        is set and the response carries validators worth caching.
+        """
+        version, status = status_line.decode("latin-1").split(None, 2)[:2]
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+        chunks = []
+        cacheable = capture and status == "200" and ("etag" in headers or "last-modified" in headers)
+        if sink is None:
+            emit = chunks.append
+        elif int(status) in _REDIRECT_STATUSES:
+            def emit(data: bytes):
+                pass  # a redirect's body is not the caller's
+        elif cacheable:
+            def emit(data: bytes):
+                chunks.append(data)
+                sink(data)
+        else:
+            emit = sink
+        decoder = None
+        if headers.get("content-encoding", "").lower() == "gzip":
+            decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        received = 0
+
+        def consume(data: bytes):
+            nonlocal received
+            received += len(data)
+            if decoder is not None:
+                data = decoder.decompress(data)
+            if data:
+                emit(data)
+
+        if status in ("204", "304") or status.startswith("1"):
+            pass  # no body by definition
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    # Skip trailers up to the terminating blank line
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                while size > 0:
+                    data = await reader.readexactly(min(size, STREAM_CHUNK_SIZE))
+                    size -= len(data)
+                    consume(data)
+                await reader.readexactly(2)  # CRLF after each chunk
+        elif "content-length" in headers:
+            remaining = int(headers["content-length"])
+            while remaining > 0:
+                data = await reader.readexactly(min(remaining, STREAM_CHUNK_SIZE))
+                remaining -= len(data)
+                consume(data)
+        else:
+            while True:
+                data = await reader.read(STREAM_CHUNK_SIZE)
+                if not data:
+                    break
+                consume(data)
+            keep_alive = False
+
+        if decoder is not None:
+            tail = decoder.flush()
+            if tail:
+                emit(tail)
+
+        metrics.incr("http.requests")
+        metrics.incr("http.bytes_downloaded", received)
+        return int(status), headers, b"".join(chunks), keep_alive
+
+
+async def _fetch_curator_page_async(client: AsyncHTTPClient, curator_id: int, start: int, batch_size: int,
+                                    rate_limiter: Optional[RateLimiter] = None) -> Optional[Dict]:
+    """
+    Fetch one page of curator recommendations as {'total_count', 'appids',
+    'names'}, or None if every retry failed. Cancellation propagates
+    immediately.
+    """
+    url = _curator_page_url(curator_id, start, batch_size)
+
+    for attempt in range(3):
+        if rate_limiter:
+            await rate_limiter.wait_async()
+        try:
+            page_start = time.perf_counter()
+            parser = AppidStreamParser()
+            response = await client.get(url, sink=parser.feed)
+            if response.status != 200:
+                raise ConnectionError(f"HTTP {response.status}")
+            data = parser.page()
+            metrics.observe("refresh.page", time.perf_counter() - page_start)
+            return data
+        except Exception as e:
+            metrics.incr("refresh.page_errors")
+            wait = 2 ** attempt  # 1s, 2s, 4s
+            logger.warning(f"  Attempt {attempt + 1}/3 failed for curator {curator_id}: {e!r}. Retrying in {wait}s...")
+            if attempt < 2:
+                await asyncio.sleep(wait)
+            else:
+                logger.error(f"  All retries exhausted for curator {curator_id} at offset {start}")
+
+    return None
+
+
+async def fetch_curator_games_async(client: AsyncHTTPClient, curator_id: int, batch_size: int = 100,
+                                    rate_limiter: Optional[RateLimiter] = None,
+                                    sync_state: Optional[CuratorSyncState] = None,
+                                    report: Optional[Dict] = None,
+                                    journal: Optional[RefreshJournal] = None,
+                                    progress: Optional[Callable[[int, int, int], None]] = None) -> Dict[str, Dict]:
+    """
+    Fetch all games from a Steam curator on the event loop.
+
+    The first page is fetched on its own to learn `total_count`; the
+    remaining pages are then awaited concurrently, with the client's
+    connection limit as the parallelism cap. When given, `report` receives
+    the sync mode, the number of requests made and the pages that were missed,
+    and `progress(curator_id, pages_done, pages_total)` is called as pages
+    arrive (an incremental sync may finish before `pages_total`).
+    """
+    logger.info(f"Fetching games from curator {curator_id}...")
+    curator_start = time.perf_counter()
+    pager = _CuratorPager(curator_id, batch_size, sync_state, journal=journal)
+    done = 0
+
+    def page_done():
+        nonlocal done
+        done += 1
+        if progress:
+            progress(curator_id, done, max(done, -(-pager.total_count // batch_size)))
+
+    async def fetch_page(start: int) -> Optional[Dict]:
+        data = await _fetch_curator_page_async(client, curator_id, start, batch_size, rate_limiter)
+        pager.checkpoint(start, data)
+        page_done()
+        if journal and journal.flush_due():
+            await asyncio.to_thread(journal.flush)
+        return data
+
+    try:
+        wave = pager.start(await _fetch_curator_page_async(client, curator_id, 0, batch_size, rate_limiter))
+        page_done()
+        while wave:
+            pages = await asyncio.gather(*(fetch_page(start) for start in wave))
+            wave = pager.feed(wave, list(pages))
+            if journal:
+                await asyncio.to_thread(journal.flush)
+    finally:
+        # Keep what was fetched if the refresh is cancelled or times out; the
+        # worker thread finishes the write even if this await is cancelled
+        if journal:
+            await asyncio.to_thread(journal.flush)
+
+    metrics.observe(f"refresh.curator.{curator_id}", time.perf_counter() - curator_start)
+    metrics.incr(f"refresh.curator.{curator_id}.requests", pager.requests)
+    if progress:
+        progress(curator_id, done, done)
+    games = pager.finish()
+    if report is not None:
+        report["mode"] = pager.mode
+        report["requests"] = pager.requests
+        report["missing_pages"] = len(pager.missing)
+    return games
+
+
+# Per-source deadlines for one refresh. A source that misses its deadline is
+# cancelled and reported as timed out; the others are not held up by it.
+CURATOR_SOURCE_DEADLINE = 180  # seconds
+NVIDIA_SOURCE_DEADLINE = 60  # seconds
+
+_STEAM_APP_URL = re.compile(r'/app/(\d+)')
+
+
+class CatalogSource(ABC):
+    """
+    One place that lists GFN-available games.
+
+    Subclasses implement `fetch()`, returning an appid -> game data dict. They
+    may annotate the per-source `report` (e.g. `not_modified` when the source
+    has not changed since the last fetch). `source_id` is the ID recorded in
+    the GameIndex source bitmask. `previous_count` is the number of games the
+    source listed in the index being replaced; when it is non-zero and the
+    source has not changed, `fetch()` may return None instead of parsing it
+    again, and those games are carried over.
+    """
+
+    kind = "source"
+    previous_count = 0
+
+    def __init__(self, source_id: int, name: str, deadline: float):
+        self.source_id = source_id
+        self.name = name
+        self.deadline = deadline
+
+    @abstractmethod
+    async def fetch(self, client: AsyncHTTPClient, rate_limiter: Optional[RateLimiter],
+                    sync_state: Optional[CuratorSyncState], report: Dict,
+                    journal: Optional[RefreshJournal] = None,
+                    progress: Optional[Callable[[int, int, int], None]] = None) -> Optional[Dict[str, Dict]]:
+        """Fetch the source's games, or None to carry over `previous_count` unchanged ones"""
+
+    def describe(self) -> Dict[str, any]:
+        return {"id": self.source_id, "name": self.name, "kind": self.kind}
+
+
+class CuratorSource(CatalogSource):
+    """A Steam curator list, paged (and incrementally synced) through the store API"""
+
+    kind = "curator"
+
+    def __init__(self, curator_id: int, name: Optional[str] = None, batch_size: int = 100,
+                 deadline: float = CURATOR_SOURCE_DEADLINE):
+        super().__init__(curator_id, name or CURATOR_NAMES.get(curator_id, f"Curator {curator_id}"), deadline)
+        self.batch_size = batch_size
+
+    async def fetch(self, client, rate_limiter, sync_state, report, journal=None, progress=None):
+        games = await fetch_curator_games_async(client, self.source_id, self.batch_size,
+                                                rate_limiter, sync_state, report, journal, progress)
+        if report.get("mode") == "failed":
+            raise ConnectionError(f"could not fetch the first page of curator {self.source_id}")
+        report["not_modified"] = report.get("mode") == "unchanged"
+        return games
+
+
+class NvidiaGameListSource(CatalogSource):
+    """NVIDIA's public supported-games JSON (gfnpc.json), which carries real titles"""
+
+    kind = "nvidia"
+
+    def __init__(self, url: Optional[str] = None, deadline: float = NVIDIA_SOURCE_DEADLINE):
+        super().__init__(NVIDIA_SOURCE_ID, "NVIDIA supported games list", deadline)
+        self.url = url or NVIDIA_GAME_LIST_URL
+
+    async def fetch(self, client, rate_limiter, sync_state, report, journal=None, progress=None):
+        logger.info(f"Fetching NVIDIA game list from {self.url}...")
+        if rate_limiter:
+            await rate_limiter.wait_async()
+        response = await client.get(self.url, timeout=self.deadline)
+        if response.status != 200:
+            raise ConnectionError(f"HTTP {response.status}")
+        report["not_modified"] = response.from_cache
+        report["requests"] = 1
+        if progress:
+            progress(self.source_id, 1, 1)
+        if response.from_cache and self.previous_count:
+            return None  # a 304: the games it listed last time still stand
+        # A few MB of JSON: parse it off the event loop
+        return await asyncio.to_thread(lambda: parse_nvidia_game_list(response.json()))
+
+
+def parse_nvidia_game_list(data: list) -> Dict[str, Dict]:
+    """Extract Steam games from gfnpc.json entries as an appid -> game data dict"""
+    games = {}
+    for item in data:
+        steam_id = item.get("steamAppId")
+        if not steam_id:
+            match = _STEAM_APP_URL.search(item.get("steamUrl") or "")
+            if match:
+                steam_id = match.group(1)
+            elif "id" in item and "steam" in (item.get("store") or "").lower():
+                steam_id = item["id"]
+
+        steam_id = str(steam_id or "")
+        if steam_id.isdigit() and steam_id != "0":
+            games[steam_id] = {"available": True}
+            title = (item.get("title") or "").strip()
+            if title:
+                games[steam_id]["name"] = title
     return games
 
 
-def fetch_gfn_status(appid: str, local_games_db: Dict[str, Dict]) -> bool:
+def default_sources() -> list:
+    """The sources a refresh fetches: every curator plus NVIDIA's list"""
+    return [CuratorSource(curator_id) for curator_id in CURATOR_IDS] + [NvidiaGameListSource()]
+
+
+async def _fetch_source(source: CatalogSource, client: AsyncHTTPClient, rate_limiter: Optional[RateLimiter],
+                        sync_state: Optional[CuratorSyncState], journal: Optional[RefreshJournal],
+                        progress: Optional[Callable[[int, int, int], None]] = None) -> tuple:
+    """Run one source under its deadline; returns (games or None, report)"""
+    report = source.describe()
+    source_start = time.perf_counter()
+    games = None
+    try:
+        games = await asyncio.wait_for(source.fetch(client, rate_limiter, sync_state, report, journal, progress),
+                                       source.deadline)
+        report["status"] = "partial" if report.get("missing_pages") else "ok"
+        report["count"] = source.previous_count if games is None else len(games)
+    except asyncio.TimeoutError:
+        report["status"] = "timeout"
+        report["error"] = f"no result within {source.deadline}s"
+    except Exception as e:
+        report["status"] = "error"
+        report["error"] = str(e) or repr(e)
+    report["duration_s"] = round(time.perf_counter() - source_start, 3)
+
+    metrics.observe(f"refresh.source.{source.source_id}", report["duration_s"])
+    if report["status"] not in ("ok", "partial"):
+        metrics.incr(f"refresh.source.{source.source_id}.failures")
+        logger.warning(f"Source {source.name} failed ({report['status']}): {report['error']}")
+    elif games is None:
+        logger.info(f"{source.name} not modified, keeping its {report['count']} games")
+    else:
+        logger.info(f"Fetched {len(games)} games from {source.name} in {report['duration_s']:.1f}s")
+    return games, report
+
+
+def merge_catalog(results: Iterable[tuple], previous: Optional["GameIndex"] = None) -> Dict[str, Dict]:
+    """
+    Merge per-source results into one appid -> game data dict.
+
+    `results` holds (source, games or None, report) tuples. Each game lists
+    the IDs of every source that vouches for it under "sources"; the first
+    real name wins, and a game no source named this time keeps its name from
+    `previous`. A failed or unchanged source (games None) keeps vouching for
+    the games it listed in `previous`, so one bad source degrades freshness
+    instead of dropping games; a partial one (pages missing) is topped up
+    from `previous` the same way.
+    """
+    merged: Dict[str, Dict] = {}
+    for source, games, report in results:
+        if games is None or report.get("status") == "partial":
+            carried = previous.source_games(source.source_id) if previous is not None else {}
+            if games is None:
+                games = carried
+            else:
+                carried = {appid: data for appid, data in carried.items() if appid not in games}
+                games = {**carried, **games}
+            report["carried_over"] = len(carried)
+        for appid, data in games.items():
+            entry = merged.get(appid)
+            if entry is None:
+                entry = merged[appid] = {"available": True, "sources": []}
+            entry["sources"].append(source.source_id)
+            name = data.get("name")
+            if name and "name" not in entry and name != f"Game {appid}":
+                entry["name"] = name
+
+    if previous is not None:
+        # Incremental curator syncs only see the leading pages' titles
+        for appid, entry in merged.items():
+            if "name" not in entry:
+                name = (previous.get(appid) or {}).get("name")
+                if name:
+                    entry["name"] = name
+    return merged
+
+
+async def fetch_catalog(sources: Optional[list] = None, client: Optional[AsyncHTTPClient] = None,
+                        rate_limiter: Optional[RateLimiter] = None,
+                        sync_state: Optional[CuratorSyncState] = None,
+                        previous: Optional["GameIndex"] = None,
+                        cache: Optional[HTTPValidatorCache] = None,
+                        journal: Optional[RefreshJournal] = None,
+                        progress: Optional[Callable[[int, int, int], None]] = None) -> tuple:
+    """
+    Fetch every source concurrently and merge the results.
+
+    Sources share one connection pool and rate limiter, and each runs under
+    its own deadline: a slow or failing source is reported and carried over
+    from `previous` without holding up the others.
+
+    Args:
+        sources: Sources to fetch (default_sources() if omitted)
+        client: Client to reuse (a private one using `cache` is created if omitted)
+        rate_limiter: Limiter shared by all sources
+        sync_state: Curator sync state; enables incremental curator syncs
+        previous: Index the merged result replaces, for carrying over failed and unchanged sources
+        cache: HTTP validator cache for a private client
+        journal: Checkpoints for resuming curator syncs
+        progress: Called with (source_id, pages_done, pages_total) as pages arrive
+
+    Returns:
+        (appid -> game data dict, list of per-source reports)
+    """
+    sources = default_sources() if sources is None else sources
+    if previous is not None:
+        counts = previous.source_counts()
+        for source in sources:
+            source.previous_count = counts.get(source.source_id, 0)
+    own_client = client is None
+    if own_client:
+        client = AsyncHTTPClient(FETCH_CONCURRENCY, cache=cache)
+    if rate_limiter is None:
+        rate_limiter = RateLimiter(FETCH_RATE_LIMIT)
+
+    try:
+        fetched = await asyncio.gather(*(
+            _fetch_source(source, client, rate_limiter, sync_state, journal, progress) for source in sources
+        ))
+    finally:
+        if own_client:
+            await client.close()
+
+    results = [(source, games, report) for source, (games, report) in zip(sources, fetched)]
+    return merge_catalog(results, previous), [report for _, _, report in results]
+
+
+class GameIndex:
+    """
+    Compact, immutable index of GFN-available Steam app IDs.
+
+    App IDs live in a sorted `array('I')` and are looked up with `bisect`.
+    Optional per-game metadata is kept in parallel arrays:
+
+    - `sources`: `array('B')` bitmask; bit i means `source_ids[i]` lists the game
+      (so at most 8 sources)
+    - names: UTF-8 blob plus `array('I')` offsets (n + 1 entries)
+
+    That is roughly 5 bytes per game plus name text, against a few hundred
+    bytes for a string key and a small dict per game.
+    """
+
+    __slots__ = ("_appids", "_sources", "_name_offsets", "_names", "source_ids", "_buffer")
+
+    def __init__(self, appids=None, sources=None, name_offsets=None, names: bytes = b"",
+                 source_ids: tuple = (), buffer=None):
+        # The arrays may also be memoryviews into `buffer`, e.g. a mapped snapshot file
+        self._buffer = buffer
+        self._appids = appids if appids is not None else array('I')
+        self._sources = sources if sources is not None else array('B', bytes(len(self._appids)))
+        self._name_offsets = name_offsets
+        self._names = names
+        self.source_ids = tuple(source_ids)
+
+    @classmethod
+    def from_games(cls, games: Dict[str, Dict], source_ids: Iterable[int] = SOURCE_IDS) -> "GameIndex":
+        """
+        Build an index from an appid -> game data dict (fetch result or JSON `games`).
+
+        Provenance comes from each game's "sources" list of source IDs (or
+        the older single "curator_id"); IDs not in `source_ids` are dropped.
+        """
+        source_ids = tuple(source_ids)
+        if len(source_ids) > 8:
+            raise ValueError(f"GameIndex supports at most 8 sources, got {len(source_ids)}")
+        source_bits = {source_id: 1 << i for i, source_id in enumerate(source_ids)}
+
+        rows = []
+        for appid, data in games.items():
+            if not str(appid).isdigit() or not data.get("available", True):
+                continue
+            name = data.get("name")
+            if name == f"Game {appid}":
+                name = None  # placeholder written by older scripts/fetch_curator_games.py
+            mask = source_bits.get(data.get("curator_id"), 0)
+            for source_id in data.get("sources", ()):
+                mask |= source_bits.get(source_id, 0)
+            rows.append((int(appid), mask, name))
+        rows.sort()
+
+        appids = array('I', (row[0] for row in rows))
+        sources = array('B', (row[1] for row in rows))
+
+        name_offsets = None
+        names = b""
+        if any(row[2] for row in rows):
+            encoded = [(row[2] or "").encode("utf-8") for row in rows]
+            name_offsets = array('I', [0])
+            for name in encoded:
+                name_offsets.append(name_offsets[-1] + len(name))
+            names = b"".join(encoded)
+
+        return cls(appids, sources, name_offsets, names, source_ids)
+
+    def __len__(self) -> int:
+        return len(self._appids)
+
+    def __contains__(self, appid) -> bool:
+        try:
+            key = int(appid)
+        except (TypeError, ValueError):
+            return False
+        appids = self._appids
+        i = bisect_left(appids, key)
+        return i < len(appids) and appids[i] == key
+
+    def __iter__(self):
+        return iter(self._appids)
+
+    def _position(self, appid) -> int:
+        try:
+            key = int(appid)
+        except (TypeError, ValueError):
+            return -1
+        appids = self._appids
+        i = bisect_left(appids, key)
+        if i < len(appids) and appids[i] == key:
+            return i
+        return -1
+
+    def _name_at(self, i: int) -> Optional[str]:
+        if self._name_offsets is None:
+            return None
+        name = self._names[self._name_offsets[i]:self._name_offsets[i + 1]]
+        return bytes(name).decode("utf-8") if name else None
+
+    def get(self, appid, default=None) -> Optional[Dict]:
+        """Game data for `appid` in the same shape as the JSON `games` entries"""
+        i = self._position(appid)
+        if i < 0:
+            return default
+
+        data = {"available": True}
+        sources = self._sources_at(i)
+        if sources:
+            data["sources"] = sources
+        name = self._name_at(i)
+        if name:
+            data["name"] = name
+        return data
+
+    def intersect(self, appids: Iterable) -> list:
+        """
+        Sorted list of the given app IDs (as ints) that are in the index.
+
+        The query is sorted once and walked against the index, each bisect
+        starting where the previous one ended, so a whole library is answered
+        in a single pass. Malformed IDs are ignored.
+        """
+        keys = set()
+        for appid in appids:
+            try:
+                keys.add(int(appid))
+            except (TypeError, ValueError):
+                pass
+
+        index = self._appids
+        size = len(index)
+        found = []
+        i = 0
+        for key in sorted(keys):
+            i = bisect_left(index, key, i)
+            if i == size:
+                break
+            if index[i] == key:
+                found.append(key)
+        return found
+
+    def count(self, appids: Iterable) -> int:
+        """Number of the given app IDs that are in the index"""
+        return len(self.intersect(appids))
+
+    def _sources_at(self, i: int) -> list:
+        mask = self._sources[i]
+        return [source_id for bit, source_id in enumerate(self.source_ids) if mask & (1 << bit)]
+
+    def source_games(self, source_id: int) -> Dict[str, Dict]:
+        """
+        The games `source_id` vouches for, as an appid -> game data dict.
+
+        Games without provenance (mask 0, e.g. imported from a JSON file
+        written before sources were recorded) count as listed by every
+        source, so carrying a failed source over never drops them.
+        """
+        if source_id not in self.source_ids:
+            return {}
+        bit = 1 << self.source_ids.index(source_id)
+        games = {}
+        for i, appid in enumerate(self._appids):
+            mask = self._sources[i]
+            if mask & bit or not mask:
+                data = {"available": True}
+                name = self._name_at(i)
+                if name:
+                    data["name"] = name
+                games[str(appid)] = data
+        return games
+
+    def source_counts(self) -> Dict[int, int]:
+        """Number of games each source vouches for"""
+        counts = dict.fromkeys(self.source_ids, 0)
+        bits = [(1 << bit, source_id) for bit, source_id in enumerate(self.source_ids)]
+        for mask in self._sources:
+            for bit, source_id in bits:
+                if mask & bit:
+                    counts[source_id] += 1
+        return counts
+
+    def diff(self, other: "GameIndex") -> tuple:
+        """(added, removed): sorted app IDs in `other` but not here, and the reverse"""
+        mine = set(self._appids)
+        theirs = set(other._appids)
+        return sorted(theirs - mine), sorted(mine - theirs)
+
+    def named(self) -> Iterator[tuple]:
+        """(appid, name) for every game that has a name, in app ID order"""
+        if self._name_offsets is None:
+            return
+        for i, appid in enumerate(self._appids):
+            name = self._name_at(i)
+            if name:
+                yield appid, name
+
+    def to_games(self) -> Dict[str, Dict]:
+        """Expand back into an appid -> game data dict, e.g. for JSON export"""
+        games = {}
+        for i, appid in enumerate(self._appids):
+            data = {"available": True}
+            name = self._name_at(i)
+            if name:
+                data["name"] = name
+            sources = self._sources_at(i)
+            if sources:
+                data["sources"] = sources
+            games[str(appid)] = data
+        return games
+
+
+# Availability cache bounds
+CACHE_MAX_ENTRIES = 2048
+CACHE_TTL = 2 * 60 * 60  # seconds
+CACHE_PURGE_INTERVAL = 5 * 60  # seconds between sweeps of expired entries
+
+
+class TTLCache:
+    """
+    Bounded LRU cache with per-entry TTLs on the monotonic clock.
+
+    Entries are kept in LRU order and the least recently used one is evicted
+    once `max_size` is exceeded. Expired entries count as misses when read
+    and are swept from an expiry queue at most every `purge_interval`
+    seconds. Every entry shares the same TTL, so insertion order is expiry
+    order and each sweep only looks at entries that really are expired.
+    Hit, miss, eviction and expiration counters are kept as running totals,
+    which makes `stats()` O(1).
+
+    Entries are tagged with the database generation they were computed
+    from; a lookup for another generation is a miss, so publishing a new
+    database invalidates the cache without clearing it.
+    """
+
+    def __init__(self, max_size: int = CACHE_MAX_ENTRIES, ttl: float = CACHE_TTL,
+                 purge_interval: float = CACHE_PURGE_INTERVAL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.purge_interval = purge_interval
+        self._entries: OrderedDict = OrderedDict()  # key -> (expires_at, generation, value)
+        self._expiry: deque = deque()  # (expires_at, key), oldest first
+        self._next_purge = time.monotonic() + purge_interval
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key, default=None, generation: int = 0):
+        """Return the fresh value for `key` at `generation`, or `default` on a miss"""
+        now = time.monotonic()
+        self._maybe_purge(now)
+
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= now or entry[1] != generation:
+            # Expired entries stay until the next sweep so peek() can still serve them
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[2]
+
+    def peek(self, key, default=None):
+        """Return the value for `key` even if it expired, without touching stats or LRU order"""
+        entry = self._entries.get(key)
+        return default if entry is None else entry[2]
+
+    def set(self, key, value, generation: int = 0):
+        now = time.monotonic()
+        self._maybe_purge(now)
+
+        expires_at = now + self.ttl
+        self._entries[key] = (expires_at, generation, value)
+        self._entries.move_to_end(key)
+        self._expiry.append((expires_at, key))
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+        # Overwritten and evicted keys leave stale queue records behind
+        if len(self._expiry) > 2 * self.max_size:
+            self._expiry = deque(sorted((entry[0], k) for k, entry in self._entries.items()))
+
+    def clear(self) -> int:
+        """Drop every entry and return how many there were"""
+        count = len(self._entries)
+        self._entries.clear()
+        self._expiry.clear()
+        return count
+
+    def purge_expired(self) -> int:
+        """Drop every expired entry; amortized O(1) per entry"""
+        now = time.monotonic()
+        self._next_purge = now + self.purge_interval
+        purged = 0
+        expiry = self._expiry
+        while expiry and expiry[0][0] <= now:
+            expires_at, key = expiry.popleft()
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == expires_at:
+                del self._entries[key]
+                purged += 1
+        self.expirations += purged
+        return purged
+
+    def _maybe_purge(self, now: float):
+        if now >= self._next_purge:
+            self.purge_expired()
+
+    def stats(self) -> Dict[str, any]:
+        lookups = self.hits + self.misses
+        return {
+            "total": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+# Title search
+SEARCH_DEFAULT_LIMIT = 10
+SEARCH_MAX_LIMIT = 50
+SEARCH_FUZZY_MIN_LENGTH = 4  # shorter queries only match as a prefix/substring
+SEARCH_FUZZY_THRESHOLD = 0.6  # share of the query's trigrams a fuzzy match must contain
+
+
+def normalize_title(title: str) -> str:
+    """Casefolded, accent-free title with symbols dropped and punctuation as single spaces"""
+    text = "".join(ch for ch in title if not unicodedata.category(ch).startswith("S"))
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(ch if ch.isalnum() else " " for ch in text if not unicodedata.combining(ch))
+    return " ".join(text.split())
+
+
+def _title_trigrams(words: list, prefix_last: bool = False) -> set:
+    """
+    Trigrams of space-padded words. Two leading spaces make a word's first
+    letters a trigram of their own, so prefixes of one or two characters
+    are searchable; `prefix_last` leaves the trailing pad off the last word
+    of a query that is still being typed.
+    """
+    grams = set()
+    for k, word in enumerate(words):
+        padded = "  " + word + ("" if prefix_last and k == len(words) - 1 else " ")
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class GameSearchIndex:
+    """
+    Trigram inverted index over the titles of one GameIndex.
+
+    Each normalized title is split into padded-word trigrams, and every
+    trigram maps to the sorted list of the titles containing it. A query
+    starts from its rarest trigram's list and narrows it down with the other
+    lists, rarest first; the survivors are ranked exact match, title prefix,
+    word prefix, substring, then words in another order. Titles are numbered
+    shortest first (then alphabetically), which is the order ties are broken
+    in, so ranking walks the survivors in number order and stops once the best
+    tiers are full. When nothing matches as typed, longer queries count shared
+    trigrams across the lists instead and return titles sharing most of them,
+    which absorbs typos. Built once per database generation, off the event
+    loop.
+
+    Everything is kept in a few flat buffers rather than per-title and
+    per-trigram objects: the lists are slices of one array (2 bytes per
+    entry while there are fewer than 65,536 titles), the trigrams one sorted
+    string searched by bisection, the normalized titles one string with
+    offsets, and names and app IDs are read from the GameIndex.
+    """
+
+    __slots__ = ("generation", "_index", "_positions", "_titles", "_title_offsets",
+                 "_grams", "_gram_starts", "_docs")
+
+    def __init__(self, index: GameIndex, generation: int = 0):
+        self.generation = generation
+        self._index = index
+        self._positions = array('I')
+        named = []
+        for position in range(len(index)):
+            name = index._name_at(position)
+            key = normalize_title(name) if name else ""
+            if key:
+                named.append((len(key), key, position))
+        named.sort()
+
+        titles = []
+        postings: Dict[str, list] = {}
+        for doc, (_, key, position) in enumerate(named):
+            self._positions.append(position)
+            titles.append(key)
+            for gram in _title_trigrams(key.split()):
+                postings.setdefault(gram, []).append(doc)
+
+        # Normalized titles never contain a newline
+        self._titles = "\n".join(titles) + "\n"
+        self._title_offsets = array('I', [0])
+        for title in titles:
+            self._title_offsets.append(self._title_offsets[-1] + len(title) + 1)
+
+        grams = sorted(postings)
+        self._grams = "".join(grams)
+        self._gram_starts = array('I', [0])
+        self._docs = array('H' if len(titles) <= 0x10000 else 'I')
+        for gram in grams:
+            self._docs.extend(postings[gram])
+            self._gram_starts.append(len(self._docs))
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def _title(self, doc: int) -> str:
+        return self._titles[self._title_offsets[doc]:self._title_offsets[doc + 1] - 1]
+
+    def _posting(self, gram: str) -> tuple:
+        """(start, end) of the titles containing `gram` within `_docs`"""
+        grams = self._grams
+        lo, hi = 0, len(self._gram_starts) - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if grams[3 * mid:3 * mid + 3] < gram:
+                lo = mid + 1
+            else:
+                hi = mid
+        if grams[3 * lo:3 * lo + 3] != gram:
+            return 0, 0
+        return self._gram_starts[lo], self._gram_starts[lo + 1]
+
+    def search(self, query: str, limit: int = SEARCH_DEFAULT_LIMIT) -> list:
+        """Best matches for `query` as [{'appid', 'name'}], best first"""
+        key = normalize_title(query)
+        if not key or limit <= 0:
+            return []
+        grams = _title_trigrams(key.split(), prefix_last=True)
+        postings = sorted((self._posting(gram) for gram in grams), key=lambda span: span[1] - span[0])
+        docs = self._docs
+        start, end = postings[0]
+        strict = set(docs[start:end])
+        for start, end in postings[1:]:
+            if not strict:
+                break
+            if end - start < 32 * len(strict):
+                strict.intersection_update(docs[start:end])
+            else:
+                # A long list against few survivors: bisect it instead
+                strict = {doc for doc in strict if _sorted_contains(docs, doc, start, end)}
+
+        # Survivors in number order are in tie-break order within each tier.
+        # An exact match is as short as any survivor can be, so once past
+        # that length, tiers 0 and 1 only grow at the back and the walk can
+        # stop as soon as they hold `limit` titles.
+        padded_key = " " + key
+        tiers = ([], [], [], [], [])
+        for doc in sorted(strict):
+            normalized = self._title(doc)
+            if normalized == key:
+                tiers[0].append(doc)
+            elif normalized.startswith(key):
+                tiers[1].append(doc)
+                if len(tiers[0]) + len(tiers[1]) >= limit:
+                    break
+            elif padded_key in " " + normalized:
+                tiers[2].append(doc)
+            elif key in normalized:
+                tiers[3].append(doc)
+            else:
+                tiers[4].append(doc)
+        found = [doc for tier in tiers for doc in tier][:limit]
+
+        if not found and len(key) >= SEARCH_FUZZY_MIN_LENGTH:
+            counts = Counter()
+            for start, end in postings:
+                counts.update(docs[start:end])
+            needed = len(grams) * SEARCH_FUZZY_THRESHOLD
+            close = [(-shared, doc) for doc, shared in counts.items() if shared >= needed]
+            found = [doc for _, doc in heapq.nsmallest(limit, close)]
+        index = self._index
+        return [{"appid": index._appids[self._positions[doc]], "name": index._name_at(self._positions[doc])}
+                for doc in found]
+
+
+def _sorted_contains(values: array, value: int, lo: int = 0, hi: Optional[int] = None) -> bool:
+    hi = len(values) if hi is None else hi
+    i = bisect_left(values, value, lo, hi)
+    return i < hi and values[i] == value
+
+
+class DatabaseSnapshot:
+    """
+    Immutable, versioned state of the games database.
+
+    Readers capture `Plugin._db` once per call and use only that object, so
+    a refresh publishing a new snapshot mid-call cannot change what they
+    see. Writers build a new snapshot off the event loop and publish it by
+    replacing the reference. `generation` increases with every published
+    snapshot and tags anything derived from it, such as cache entries.
+    """
+
+    __slots__ = ("index", "generation", "last_updated")
+
+    def __init__(self, index: GameIndex, generation: int = 0, last_updated: Optional[str] = None):
+        self.index = index
+        self.generation = generation
+        self.last_updated = last_updated
+
+    def __setattr__(self, name, value):
+        if hasattr(self, name):
+            raise AttributeError(f"DatabaseSnapshot.{name} is read-only")
+        super().__setattr__(name, value)
+
+    def successor(self, index: GameIndex, last_updated: Optional[str]) -> "DatabaseSnapshot":
+        """Snapshot that replaces this one with the next generation number"""
+        return DatabaseSnapshot(index, self.generation + 1, last_updated)
+
+
+# How check_gfn_availability answers: "direct" queries the immutable in-memory
+# index; "cached" memoizes through the TTL cache, which only pays off for
+# lookups that hit a remote source
+LOOKUP_MODE = "direct"
+
+
+# Binary database snapshot (defaults/gfn_games.bin), little-endian:
+#
+#   header      magic, version, flags, count, source count, generation, last_updated
+#   source ids  uint32 * source count
+#   appids      uint32 * count, sorted
+#   sources     uint8 * count (bitmask over source ids), padded to 4 bytes
+#   names       uint32 * (count + 1) offsets, then the UTF-8 blob (FLAG_NAMES only)
+#
+# Every section starts 4-byte aligned so the uint32 arrays can be used in
+# place as memoryviews over an mmap of the file.
+SNAPSHOT_FILENAME = "gfn_games.bin"
+SNAPSHOT_MAGIC = b"GFNSNAP\0"
+SNAPSHOT_VERSION = 2
+SNAPSHOT_FLAG_NAMES = 0x1
+_SNAPSHOT_HEADER = struct.Struct("<8sHHIHHI32s")
+
+
+def _pad4(size: int) -> int:
+    return (size + 3) & ~3
+
+
+def _write_atomic(path: Path, data: bytes, fsync: bool = True):
+    """Write `data` to `path` so readers only ever see the old or the new file"""
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _serialize_and_write(path: Path, serialize: Callable[[], bytes], fsync: bool) -> Dict[str, any]:
+    start = time.perf_counter()
+    data = serialize()
+    serialized = time.perf_counter()
+    _write_atomic(path, data, fsync)
+    written = time.perf_counter()
+    return {
+        "bytes": len(data),
+        "serialize_ms": round((serialized - start) * 1000, 1),
+        "write_ms": round((written - serialized) * 1000, 1),
+    }
+
+
+async def write_atomic_async(path: Path, serialize: Callable[[], bytes], fsync: bool = True) -> Dict[str, any]:
+    """
+    Serialize and atomically write a file without blocking the event loop.
+
+    `serialize` runs on a worker thread, and so does the write: temp file,
+    fsync, rename over `path`. Returns {'bytes', 'serialize_ms', 'write_ms'}.
+    """
+    return await asyncio.to_thread(_serialize_and_write, path, serialize, fsync)
+
+
+def encode_snapshot(db: DatabaseSnapshot) -> bytes:
+    """`db` in the binary snapshot format"""
+    index = db.index
+    count = len(index)
+    flags = SNAPSHOT_FLAG_NAMES if index._name_offsets is not None else 0
+
+    def little_endian(values: array) -> bytes:
+        if sys.byteorder != "little":
+            values = array(values.typecode, values)
+            values.byteswap()
+        return values.tobytes()
+
+    parts = [
+        _SNAPSHOT_HEADER.pack(
+            SNAPSHOT_MAGIC, SNAPSHOT_VERSION, flags, count, len(index.source_ids), 0,
+            db.generation, (db.last_updated or "").encode("ascii")
+        ),
+        little_endian(array('I', index.source_ids)),
+        little_endian(array('I', index._appids)),
+        bytes(index._sources).ljust(_pad4(count), b"\0"),
+    ]
+    if flags & SNAPSHOT_FLAG_NAMES:
+        parts.append(little_endian(array('I', index._name_offsets)))
+        parts.append(bytes(index._names))
+    return b"".join(parts)
+
+
+def write_snapshot(path: Path, db: DatabaseSnapshot):
+    """Atomically write `db` as a binary snapshot"""
+    _write_atomic(path, encode_snapshot(db))
+
+
+def load_snapshot(path: Path) -> DatabaseSnapshot:
+    """
+    Map a binary snapshot.
+
+    On little-endian hosts (the Deck) the index queries the mapped file in
+    place; nothing is copied and no per-game Python objects are created.
+    """
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, flags, count, source_count, _, generation, last_updated = \
+        _SNAPSHOT_HEADER.unpack_from(mapped, 0)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+        mapped.close()
+        raise ValueError(f"Unsupported snapshot format in {path}")
+
+    view = memoryview(mapped)
+
+    def section(size: int):
+        nonlocal offset
+        if offset + size > len(mapped):
+            raise ValueError(f"Truncated snapshot {path}")
+        part = view[offset:offset + size]
+        offset += _pad4(size)
+        return part
+
+    def uint32s(n: int):
+        part = section(4 * n)
+        if sys.byteorder == "little":
+            return part.cast('I')
+        values = array('I', part.tobytes())
+        values.byteswap()
+        return values
+
+    offset = _SNAPSHOT_HEADER.size
+    source_ids = tuple(uint32s(source_count))
+    appids = uint32s(count)
+    sources = section(count)
+    name_offsets = None
+    names = b""
+    if flags & SNAPSHOT_FLAG_NAMES:
+        name_offsets = uint32s(count + 1)
+        names = section(name_offsets[count])
+
+    index = GameIndex(appids, sources, name_offsets, names, source_ids, buffer=mapped)
+    return DatabaseSnapshot(index, generation, last_updated.rstrip(b"\0").decode("ascii") or None)
+
+
+def encode_games_json(db: DatabaseSnapshot) -> bytes:
+    """
+    `db` in the defaults/gfn_games.json import/export format, without indentation.
+
+    Games are encoded one at a time: a single json.dumps over the whole
+    catalog holds the GIL throughout and would stall the event loop even
+    from a worker thread.
+    """
+    encode = json.JSONEncoder(separators=(",", ":")).encode
+    header = {
+        "comment": "GeForce NOW supported games from Steam curators and NVIDIA's game list",
+        "last_updated": db.last_updated,
+        "generation": db.generation,
+        "sources": [source.describe() for source in default_sources()],
+    }
+    games = ",".join(f'"{appid}":{encode(data)}' for appid, data in db.index.to_games().items())
+    return (encode(header)[:-1] + ',"games":{' + games + "}}").encode("utf-8")
+
+
+# Catalog change log (defaults/gfn_changes.log), little-endian, append-only:
+#
+#   magic
+#   per published generation:
+#     header   generation, base generation, unix time, added count, removed count, crc32
+#     payload  uint32 * added, then uint32 * removed (sorted app IDs)
+#
+# A record holds the changes from `base` to `generation`: base is the previous
+# generation, except for records that compaction squashed together.
+CHANGELOG_FILENAME = "gfn_changes.log"
+CHANGELOG_MAGIC = b"GFNCHG1\0"
+CHANGELOG_RETENTION = timedelta(days=180)  # older records are squashed into one
+CHANGELOG_MAX_RECORDS = 512
+_CHANGELOG_RECORD = struct.Struct("<IIIIII")
+
+
+class ChangeLog:
+    """
+    Append-only log of the games added and removed by each published refresh.
+
+    Diffs between two generations are answered from the log alone, reading
+    only the records in between, so neither database needs to be loaded.
+    Once records are older than CHANGELOG_RETENTION (or there are more than
+    CHANGELOG_MAX_RECORDS) the oldest are squashed into a single net record,
+    after which diffs can no longer start inside the squashed range.
+
+    Generations only grow; a record that does not continue the log (its
+    generation is not newer than every recorded one) starts a new log. Reads
+    follow the chain of bases backward from the newest record, so a log
+    written before that rule still answers for the database it describes.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def _read(self) -> bytes:
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return b""
+        if data and not data.startswith(CHANGELOG_MAGIC):
+            raise ValueError(f"Not a change log: {self.path}")
+        return data
+
+    @staticmethod
+    def _records(data: bytes) -> Iterator[tuple]:
+        """(generation, base, timestamp, payload offset, added count, removed count, end) per intact record"""
+        offset = len(CHANGELOG_MAGIC)
+        while offset + _CHANGELOG_RECORD.size <= len(data):
+            generation, base, timestamp, n_added, n_removed, crc = _CHANGELOG_RECORD.unpack_from(data, offset)
+            start = offset + _CHANGELOG_RECORD.size
+            end = start + 4 * (n_added + n_removed)
+            if end > len(data) or zlib.crc32(data[start:end]) != crc:
+                break  # torn write at the tail; everything before it is intact
+            yield generation, base, timestamp, start, n_added, n_removed, end
+            offset = end
+
+    @staticmethod
+    def _payload(data: bytes, start: int, n_added: int, n_removed: int) -> tuple:
+        values = array('I', data[start:start + 4 * (n_added + n_removed)])
+        if sys.byteorder != "little":
+            values.byteswap()
+        return values[:n_added], values[n_added:]
+
+    @staticmethod
+    def _encode(generation: int, base: int, timestamp: int, added: Iterable[int], removed: Iterable[int]) -> bytes:
+        added = array('I', added)
+        removed = array('I', removed)
+        payload = array('I', added)
+        payload.extend(removed)
+        if sys.byteorder != "little":
+            payload.byteswap()
+        payload = payload.tobytes()
+        header = _CHANGELOG_RECORD.pack(generation, base, timestamp, len(added), len(removed), zlib.crc32(payload))
+        return header + payload
+
+    def append(self, generation: int, base: int, added: list, removed: list,
+               timestamp: Optional[float] = None):
+        """Record the changes from generation `base` to `generation`"""
+        data = self._read()
+        intact = len(CHANGELOG_MAGIC)
+        count = 0
+        oldest = None
+        newest = None
+        for record in self._records(data):
+            intact = record[6]
+            count += 1
+            oldest = record[2] if oldest is None else oldest
+            newest = record[0] if newest is None else max(newest, record[0])
+
+        record = self._encode(generation, base, int(timestamp or time.time()), added, removed)
+        if newest is not None and generation <= newest:
+            # The database was replaced by one with an older generation: the
+            # recorded history belongs to another lineage
+            logger.warning(f"Generation {generation} does not follow {newest}; starting a new change log")
+            data, count, oldest = b"", 0, None
+        if not data:
+            _write_atomic(self.path, CHANGELOG_MAGIC + record)
+        else:
+            with open(self.path, 'r+b') as f:
+                f.truncate(intact)  # drop a torn record left by a crash
+                f.seek(intact)
+                f.write(record)
+                f.flush()
+                os.fsync(f.fileno())
+            count += 1
+
+        cutoff = time.time() - CHANGELOG_RETENTION.total_seconds()
+        if count > CHANGELOG_MAX_RECORDS or (oldest is not None and oldest < cutoff and count > 2):
+            self.compact()
+
+    def compact(self) -> int:
+        """Squash records older than CHANGELOG_RETENTION (and any excess) into one; returns records removed"""
+        data = self._read()
+        records = list(self._records(data))
+        cutoff = time.time() - CHANGELOG_RETENTION.total_seconds()
+        squash = sum(1 for record in records if record[2] < cutoff)
+        squash = max(squash, len(records) - CHANGELOG_MAX_RECORDS + 1)
+        squash = min(squash, len(records) - 1)  # always keep the newest record as is
+        if squash < 2:
+            return 0
+
+        head = records[:squash]
+        added, removed = self._net(data, head)
+        merged = self._encode(head[-1][0], head[0][1], head[-1][2], added, removed)
+        tail = data[records[squash][3] - _CHANGELOG_RECORD.size:records[-1][6]]
+        _write_atomic(self.path, CHANGELOG_MAGIC + merged + tail)
+        logger.info(f"Compacted change log: squashed {squash} records up to generation {head[-1][0]}")
+        return squash - 1
+
+    def _net(self, data: bytes, records: list) -> tuple:
+        """Net (added, removed) over consecutive records"""
+        added: set = set()
+        removed: set = set()
+        for _, _, _, start, n_added, n_removed, _ in records:
+            record_added, record_removed = self._payload(data, start, n_added, n_removed)
+            for appid in record_added:
+                if appid in removed:
+                    removed.discard(appid)  # removed earlier, back again
+                else:
+                    added.add(appid)
+            for appid in record_removed:
+                if appid in added:
+                    added.discard(appid)
+                else:
+                    removed.add(appid)
+        return sorted(added), sorted(removed)
+
+    def diff(self, from_generation: int, to_generation: Optional[int] = None) -> Dict[str, any]:
+        """
+        Games added and removed between two generations.
+
+        Raises ValueError when the log does not cover the range, e.g. it
+        starts inside a compacted span or the database was replaced.
+        """
+        data = self._read()
+        records = list(self._records(data))
+        if to_generation is None:
+            to_generation = records[-1][0] if records else from_generation
+        if from_generation > to_generation:
+            raise ValueError(f"from_generation {from_generation} is after to_generation {to_generation}")
+
+        span = []
+        generation = to_generation
+        for record in self._chain(records, to_generation):
+            if generation == from_generation:
+                break
+            if record[1] < from_generation < record[0]:
+                raise ValueError(f"Changes before generation {record[0]} have been compacted")
+            span.append(record)
+            generation = record[1]
+        if generation != from_generation:
+            raise ValueError(f"No change history from generation {from_generation} to {to_generation}")
+        span.reverse()
+
+        added, removed = self._net(data, span)
+        return {
+            "from_generation": from_generation,
+            "to_generation": to_generation,
+            "from_time": span[0][2] if span else None,
+            "added": added,
+            "removed": removed,
+        }
+
+    @staticmethod
+    def _chain(records: list, generation: int) -> Iterator[tuple]:
+        """Records leading to `generation`, newest first, following each record's base"""
+        index = len(records)
+        while True:
+            index -= 1
+            while index >= 0 and records[index][0] != generation:
+                index -= 1
+            if index < 0:
+                return
+            yield records[index]
+            generation = records[index][1]
+
+    def generation_at(self, timestamp: float) -> Optional[int]:
+        """Latest generation published at or before `timestamp` that diffs can start from"""
+        records = list(self._records(self._read()))
+        if not records:
+            return None
+        base = None
+        for generation, base, record_time, *_ in self._chain(records, records[-1][0]):
+            if record_time <= timestamp:
+                return generation
+        return base
+
+    def stats(self) -> Dict[str, any]:
+        data = self._read()
+        records = list(self._records(data))
+        return {
+            "records": len(records),
+            "bytes": len(data),
+            "first_generation": records[0][1] if records else None,
+            "last_generation": records[-1][0] if records else None,
+        }
+
+
+# Settings persistence
+SETTINGS_DEFAULTS = {
+    "logoSize": 64,
+    "glowIntensity": 50,
+    "position": "top-right",
+    "enabled": True
+}
+SETTINGS_FLUSH_INTERVAL = 2.0  # seconds; at most one settings.json write per interval
+
+
+class SettingsStore:
+    """
+    Write-behind store for settings.json.
+
+    update() merges into the in-memory settings and returns at once. A
+    background thread writes the file SETTINGS_FLUSH_INTERVAL after the
+    first unsaved change, so a burst of updates costs one write, and skips
+    the write when the serialized settings match what is already on disk.
+    Writes go through a temp file and os.replace, so a crash leaves either
+    the old or the new file. close() stops the thread and writes anything
+    still pending.
+    """
+
+    def __init__(self, path: Optional[Path] = None, defaults: Optional[Dict] = None,
+                 interval: float = SETTINGS_FLUSH_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self._settings: Dict[str, any] = dict(SETTINGS_DEFAULTS if defaults is None else defaults)
+        self._changed = threading.Condition()
+        self._write_lock = threading.Lock()  # keeps flushes, and so file versions, in order
+        self._pending = False
+        self._closed = False
+        self._on_disk: Optional[bytes] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def load(self):
+        """Merge the settings file over the defaults"""
+        if self.path is None:
+            return
+        try:
+            data = self.path.read_bytes()
+            loaded = json.loads(data)
+            if not isinstance(loaded, dict):
+                raise ValueError("settings file does not hold an object")
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.error(f"Error loading settings from {self.path}, using defaults: {e}")
+            return
+        with self._changed:
+            self._settings.update(loaded)
+            if self._serialize() == data:
+                self._on_disk = data
+        logger.info("Settings loaded successfully")
+
+    def get(self) -> Dict[str, any]:
+        with self._changed:
+            return dict(self._settings)
+
+    def update(self, changes: Dict[str, any]) -> Dict[str, any]:
+        """Merge `changes` and schedule a write if anything changed; returns the new settings"""
+        with self._changed:
+            if any(key not in self._settings or self._settings[key] != value for key, value in changes.items()):
+                self._settings.update(changes)
+                self._pending = True
+                if self.path is not None and not self._closed:
+                    if self._thread is None:
+                        self._thread = threading.Thread(target=self._run, name="gfn-settings", daemon=True)
+                        self._thread.start()
+                    self._changed.notify()
+            return dict(self._settings)
+
+    def _serialize(self) -> bytes:
+        return json.dumps(self._settings, indent=2).encode("utf-8")
+
+    def _run(self):
+        while True:
+            with self._changed:
+                self._changed.wait_for(lambda: self._pending or self._closed)
+                if self._closed:
+                    return
+                # Let the rest of a burst land before writing
+                self._changed.wait_for(lambda: self._closed, timeout=self.interval)
+                if self._closed:
+                    return  # close() writes what is left
+            self.flush()
+
+    def flush(self) -> bool:
+        """Write pending changes now; returns whether the file was written"""
+        if self.path is None:
+            return False
+        with self._write_lock:
+            with self._changed:
+                if not self._pending:
+                    return False
+                self._pending = False
+                data = self._serialize()
+            if data == self._on_disk:
+                metrics.incr("settings.writes_skipped")
+                return False
+            try:
+                _write_atomic(self.path, data)
+            except Exception as e:
+                logger.error(f"Error saving settings to {self.path}: {e}")
+                with self._changed:
+                    self._pending = True  # retried on the next update or close()
+                return False
+            self._on_disk = data
+            metrics.incr("settings.writes")
+            return True
+
+    def close(self):
+        """Stop the writer thread and write anything still pending"""
+        with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+
+def _library_appids(appids: Iterable) -> set:
+    """Valid app IDs of a library as ints; anything else is ignored"""
+    keys = set()
+    for appid in appids:
+        try:
+            key = int(appid)
+        except (TypeError, ValueError):
+            continue
+        if 0 < key <= 0xFFFFFFFF:
+            keys.add(key)
+    return keys
+
+
+def library_fingerprint(appids: Iterable[int]) -> str:
+    """
+    Order-independent fingerprint of a set of app IDs: count, 32-bit sum and
+    XOR of a multiplicative hash. The frontend computes the same value
+    (libraryFingerprint in src/index.tsx), so an unchanged library can be
+    recognised without sending it.
+    """
+    count = total = mix = 0
+    for appid in appids:
+        count += 1
+        total = (total + appid) & 0xFFFFFFFF
+        mix ^= (appid * 0x9E3779B1) & 0xFFFFFFFF
+    return f"{count}-{total:x}-{mix:x}"
+
+
+class LibraryCoverage:
+    """
+    GFN coverage of the user's library, kept between panel opens.
+
+    Remembers the library (by fingerprint) and which of its games are
+    available at a given database generation. Library edits are applied as
+    deltas, and a new generation only re-tests the app IDs the change log
+    says were added or removed, so an unchanged library costs nothing.
+    The result is a bitset over the library's app IDs in ascending order.
+    While its generation matches the database, the answers are also pinned
+    for game-page lookups (see Plugin.prefetch_library).
+    """
+
+    def __init__(self):
+        self.library: set = set()
+        self.available: set = set()
+        self.generation: Optional[int] = None
+        self.fingerprint = library_fingerprint(())
+        self._result: Optional[Dict] = None
+
+    def replace(self, appids: Iterable, db: DatabaseSnapshot):
+        """Start over with a full library"""
+        self.library = _library_appids(appids)
+        self.available = set(db.index.intersect(self.library))
+        self.generation = db.generation
+        self.fingerprint = library_fingerprint(self.library)
+        self._result = None
+
+    def apply_delta(self, added: Iterable, removed: Iterable, db: DatabaseSnapshot):
+        """Add and remove library entries, testing only the new ones"""
+        added = _library_appids(added) - self.library
+        removed = _library_appids(removed) & self.library
+        self.library |= added
+        self.library -= removed
+        self.available -= removed
+        self.available.update(db.index.intersect(added))
+        self.fingerprint = library_fingerprint(self.library)
+        self._result = None
+
+    def sync_generation(self, db: DatabaseSnapshot, changes: Optional[Dict] = None):
+        """
+        Bring availability up to `db`, applying `changes` (a ChangeLog.diff)
+        when they cover exactly the gap and re-testing the library otherwise
+        """
+        if self.generation == db.generation:
+            return
+        if changes is None or self.generation is None or \
+                (changes["from_generation"], changes["to_generation"]) != (self.generation, db.generation):
+            self.available = set(db.index.intersect(self.library))
+            self.generation = db.generation
+            self._result = None
+            return
+        self.apply_changes(changes["added"], changes["removed"], db.generation)
+
+    def apply_changes(self, added: Iterable[int], removed: Iterable[int], generation: int):
+        """Move to `generation`, given the app IDs added to and removed from the database"""
+        self.available.difference_update(removed)
+        self.available.update(appid for appid in added if appid in self.library)
+        self.generation = generation
+        self._result = None
+
+    def lookup(self, appid, generation: int) -> Optional[bool]:
+        """Pinned answer for a library game at `generation`; None when there is none"""
+        if generation != self.generation:
+            return None
+        try:
+            key = int(appid)
+        except (TypeError, ValueError):
+            return None
+        if key not in self.library:
+            return None
+        return key in self.available
+
+    def result(self) -> Dict[str, any]:
+        if self._result is None:
+            ordered = sorted(self.library)
+            bits = bytearray((len(ordered) + 7) // 8)
+            available = self.available
+            for i, appid in enumerate(ordered):
+                if appid in available:
+                    bits[i >> 3] |= 1 << (i & 7)
+            self._result = {
+                "status": "success",
+                "fingerprint": self.fingerprint,
+                "generation": self.generation,
+                "total": len(ordered),
+                "available_count": len(available),
+                # bit i (LSB first) is set when the i-th lowest library app ID is on GFN
+                "bitset": base64.b64encode(bits).decode("ascii"),
+            }
+        return self._result
+
+
+# Plugin events for the frontend's long-poll (Plugin.wait_for_events)
+EVENT_BUFFER_SIZE = 256
+EVENT_WAIT_TIMEOUT = 25.0  # seconds a poll is held open when nothing happens
+EVENT_DECKY_NAME = "gfn_event"  # event name when forwarded through decky.emit
+
+
+def _decky_emitter() -> Optional[Callable[..., Awaitable]]:
+    """decky.emit when the loader provides it (Decky Loader 3), else None"""
+    try:
+        import decky
+    except ImportError:
+        return None
+    return getattr(decky, "emit", None)
+
+
+class EventBus:
+    """
+    Ring buffer of recent plugin events, read by long-polling.
+
+    Events get increasing IDs. `wait(after)` returns the events newer than
+    `after`, holding the call open until one is emitted or the timeout
+    passes, so the frontend keeps one call outstanding instead of re-polling
+    every endpoint. A reader whose cursor fell out of the buffer (or belongs
+    to an earlier plugin instance) gets `reset` and reloads its state. The
+    latest event of each type is kept apart from the buffer, so a new reader
+    starts from the current state. With Decky Loader 3 every event is also
+    pushed through `decky.emit`.
+
+    `emit()` must be called on the event loop.
+    """
+
+    def __init__(self, capacity: int = EVENT_BUFFER_SIZE):
+        self._events: deque = deque(maxlen=capacity)
+        self._latest: Dict[str, Dict] = {}
+        self._last_id = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._forward = _decky_emitter()
+        self._forwarding: set = set()
+
+    def emit(self, kind: str, data: Dict):
+        self._last_id += 1
+        event = {"id": self._last_id, "type": kind, "time": time.time(), "data": data}
+        self._events.append(event)
+        self._latest[kind] = event
+        metrics.incr("events.emitted")
+        if self._wakeup is not None:
+            self._wakeup.set()
+            self._wakeup = None
+        if self._forward is not None:
+            task = asyncio.ensure_future(self._push(event))
+            self._forwarding.add(task)
+            task.add_done_callback(self._forwarding.discard)
+
+    async def _push(self, event: Dict):
+        try:
+            await self._forward(EVENT_DECKY_NAME, event)
+        except Exception as e:
+            logger.debug(f"decky.emit failed for {event['type']}: {e}")
+
+    def since(self, after: Optional[int]) -> Dict[str, any]:
+        """Events newer than `after`; the latest state per type when `after` is None"""
+        if after is None:
+            events = sorted(self._latest.values(), key=lambda event: event["id"])
+            return {"cursor": self._last_id, "events": events, "reset": False}
+        oldest = self._events[0]["id"] if self._events else self._last_id + 1
+        if after > self._last_id or after < oldest - 1:
+            return {"cursor": self._last_id, "events": [], "reset": True}
+        return {"cursor": self._last_id, "events": [event for event in self._events if event["id"] > after],
+                "reset": False}
+
+    async def wait(self, after: Optional[int], timeout: float) -> Dict[str, any]:
+        """Like since(), but waits up to `timeout` seconds for a newer event"""
+        if after is not None and after == self._last_id and timeout > 0:
+            if self._wakeup is None:
+                self._wakeup = asyncio.Event()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.since(after)
+
+    def close(self):
+        """Release pending waits, e.g. when the plugin unloads"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+            self._wakeup = None
+
+
+# Deferred startup: _main returns right away and the database is loaded on a
+# worker thread; lookups arriving before it is ready wait for it. Set
+# GFN_DEFERRED_STARTUP=0 to load it inside _main instead.
+DEFERRED_STARTUP = os.environ.get("GFN_DEFERRED_STARTUP", "1") != "0"
+
+# Background refresh schedule
+REFRESH_INTERVAL = 7 * 24 * 60 * 60  # seconds between successful refreshes
+REFRESH_JITTER = 0.1  # +/- fraction of the interval, so Decks do not refresh in lockstep
+REFRESH_BACKOFF_BASE = 5 * 60  # seconds before the first retry after a failure
+REFRESH_BACKOFF_MAX = 12 * 60 * 60
+
+
+class RefreshScheduler:
+    """
+    Single-flight runner and periodic scheduler for database refreshes.
+
+    Concurrent `run()` callers share one in-flight refresh and all receive
+    its result; a caller giving up (cancelled RPC) does not cancel the
+    refresh for the others. In the background the next refresh is due
+    REFRESH_INTERVAL after the last success (with jitter), or after an
+    exponential backoff when it failed.
+    """
+
+    def __init__(self, refresh: Callable[..., Awaitable[Dict]], interval: float = REFRESH_INTERVAL,
+                 jitter: float = REFRESH_JITTER, backoff_base: float = REFRESH_BACKOFF_BASE,
+                 backoff_max: float = REFRESH_BACKOFF_MAX):
+        self._refresh = refresh
+        self.interval = interval
+        self.jitter = jitter
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._inflight: Optional[asyncio.Future] = None
+        self._loop_task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._next_run: Optional[float] = None  # time.monotonic() deadline
+        self.runs = 0
+        self.coalesced = 0
+        self.consecutive_failures = 0
+        self.last_started: Optional[float] = None  # wall clock
+        self.last_duration: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.last_result: Optional[Dict] = None
+
+    @property
+    def running(self) -> bool:
+        return self._inflight is not None and not self._inflight.done()
+
+    async def run(self, **kwargs) -> Dict[str, any]:
+        """Run a refresh now, or join the one already in flight"""
+        if self.running:
+            self.coalesced += 1
+            logger.info("Refresh already in progress, waiting for it")
+        else:
+            self._inflight = asyncio.ensure_future(self._run(**kwargs))
+        return await asyncio.shield(self._inflight)
+
+    async def _run(self, **kwargs) -> Dict[str, any]:
+        self.runs += 1
+        self.last_started = time.time()
+        start = time.monotonic()
+        try:
+            result = await self._refresh(**kwargs)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            result = {"status": "error", "message": str(e)}
+        finally:
+            self.last_duration = time.monotonic() - start
+
+        self.last_result = result
+        # A partial refresh was published but is retried soon; it resumes
+        # from the refresh journal
+        if result.get("status") in ("error", "partial"):
+            self.consecutive_failures += 1
+            self.last_error = result.get("message")
+            delay = min(self.backoff_base * 2 ** (self.consecutive_failures - 1), self.backoff_max)
+            delay *= 1 + random.uniform(0, self.jitter)
+            logger.warning(f"Refresh failed ({self.consecutive_failures} in a row), retrying in {delay:.0f}s")
+        else:
+            self.consecutive_failures = 0
+            self.last_error = None
+            delay = self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+        self.schedule(delay)
+        return result
+
+    def schedule(self, delay: float):
+        """Move the next background refresh to `delay` seconds from now"""
+        self._next_run = time.monotonic() + max(0.0, delay)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def start(self, first_delay: float):
+        """Start the background schedule with the first refresh after `first_delay` seconds"""
+        self._wakeup = asyncio.Event()
+        self.schedule(first_delay)
+        self._loop_task = asyncio.create_task(self._loop())
+
+    async def _loop(self):
+        while True:
+            self._wakeup.clear()
+            delay = self._next_run - time.monotonic()
+            if delay > 0:
+                try:
+                    # Woken early when a manual refresh reschedules us
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                    continue
+                except asyncio.TimeoutError:
+                    pass
+            if self.running:
+                await asyncio.shield(self._inflight)  # a manual refresh reschedules for us
+                continue
+            logger.info("Starting scheduled database refresh...")
+            await self.run()
+
+    async def stop(self):
+        """Cancel the schedule and any in-flight refresh"""
+        tasks = [task for task in (self._loop_task, self._inflight) if task is not None and not task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop_task = None
+        self._next_run = None
+
+    def state(self) -> Dict[str, any]:
+        next_run = None
+        if self._next_run is not None and self._loop_task is not None:
+            next_run = time.time() + max(0.0, self._next_run - time.monotonic())
+
+        def wall(ts: Optional[float]) -> Optional[str]:
+            return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S") if ts else None
+
+        return {
+            "running": self.running,
+            "next_run": wall(next_run),
+            "last_started": wall(self.last_started),
+            "last_duration_s": self.last_duration,
+            "last_error": self.last_error,
+            "last_status": self.last_result.get("status") if self.last_result else None,
+            "consecutive_failures": self.consecutive_failures,
+            "runs": self.runs,
+            "coalesced": self.coalesced,
+        }
+
+
+def fetch_gfn_status(appid: str, local_games_db: GameIndex) -> bool:
     """
     Check GFN status from local database (standalone function)
 
@@ -89,16 +2734,19 @@ def fetch_gfn_status(appid: str, local_games_db: Dict[str, Dict]) -> bool:
     Returns:
         True if game is available on GFN, False otherwise
     """
-    logger.info(f"Checking local database for appid {appid}...")
-    logger.info(f"Database has {len(local_games_db)} games")
+    sampled = _sample_lookup_log()
+    if sampled:
+        logger.debug(f"Checking local database for appid {appid}...")
+        logger.debug(f"Database has {len(local_games_db)} games")
 
-    if appid in local_games_db:
-        game_data = local_games_db[appid]
+    game_data = local_games_db.get(appid)
+    if game_data is not None:
         is_available = game_data.get('available', False)
-        logger.info(f"Found {appid} in local database: {is_available}")
+        if sampled:
+            logger.debug(f"Found {appid} in local database: {is_available}")
         return is_available
-    else:
-        logger.info(f"Game {appid} not found in database")
+    elif sampled:
+        logger.debug(f"Game {appid} not found in database")
 
     return False
 
@@ -106,25 +2754,27 @@ def fetch_gfn_status(appid: str, local_games_db: Dict[str, Dict]) -> bool:
 class Plugin:
     """GeForce NOW availability checker plugin for Steam Deck"""
 
-    # GFN availability cache: {appid: {"available": bool, "timestamp": datetime}}
-    _cache: Dict[str, Dict] = {}
-    _cache_duration = timedelta(hours=2)
-
-    # Settings
-    _settings: Dict[str, any] = {
-        "logoSize": 64,
-        "glowIntensity": 50,
-        "position": "top-right",
-        "enabled": True
-    }
-    _settings_path: Optional[Path] = None
-
-    # Local games database
-    _local_games_db: Dict[str, Dict] = {}
-    _db_last_updated: Optional[str] = None
-    _db_lock: Optional[asyncio.Lock] = None
+    # GFN availability cache: appid -> available (bounded LRU with TTL),
+    # only consulted in the "cached" lookup mode
+    _cache: TTLCache = TTLCache()
+    _lookup_mode: str = LOOKUP_MODE
+
+    # Settings, written behind by a background thread
+    _settings: SettingsStore = SettingsStore()
+
+    # Local games database, published as immutable snapshots
+    _db: DatabaseSnapshot = DatabaseSnapshot(GameIndex())
+    _db_ready: Optional[asyncio.Future] = None  # set while the startup load is running
+    _startup_task: Optional[asyncio.Task] = None
+    _scheduler: Optional[RefreshScheduler] = None
+    _coverage: Optional[LibraryCoverage] = None  # also pins the library's lookup answers
+    _started_at: Optional[float] = None  # perf_counter at _main, until the first lookup
+    _search: Optional[GameSearchIndex] = None
+    _events: EventBus = EventBus()  # pushed to the frontend through wait_for_events
+    _http_cache: Optional[HTTPValidatorCache] = None
     _plugin_dir: Optional[Path] = None
 
+    @instrumented
     async def check_gfn_availability(self, appid: str) -> Dict[str, any]:
         """
         Check if a game is available on GeForce NOW
@@ -135,30 +2785,50 @@ class Plugin:
         Returns:
             Dictionary with 'available' (bool) and 'cached' (bool) keys
         """
-        logger.info(f"Checking GFN availability for app {appid}")
-
-        # Check cache first
-        if appid in self._cache:
-            cached_data = self._cache[appid]
-            cache_age = datetime.now() - cached_data["timestamp"]
-
-            if cache_age < self._cache_duration:
-                logger.info(f"Returning cached result for app {appid}")
+        if self._db_ready is not None:
+            await self._wait_for_db()
+
+        if self._started_at is not None:
+            metrics.observe("startup.first_lookup", time.perf_counter() - self._started_at)
+            self._started_at = None
+
+        # Library games resolved by prefetch_library are answered from memory
+        coverage = self._coverage
+        if coverage is not None:
+            pinned = coverage.lookup(appid, self._db.generation)
+            if pinned is not None:
                 return {
-                    "available": cached_data["available"],
+                    "available": pinned,
                     "cached": True
                 }
 
+        if self._lookup_mode == "direct":
+            # The index is immutable and local: a membership test is cheaper
+            # than any cache bookkeeping around it
+            return {
+                "available": appid in self._db.index,
+                "cached": False
+            }
+
+        db = self._db
+
+        # Check cache first
+        cached = self._cache.get(appid, generation=db.generation)
+        if cached is not None:
+            if _sample_lookup_log():
+                logger.debug(f"Returning cached result for app {appid}")
+            return {
+                "available": cached,
+                "cached": True
+            }
+
         # Fetch fresh data
         try:
             # Call standalone function instead of method
-            available = fetch_gfn_status(appid, self._local_games_db)
+            available = fetch_gfn_status(appid, db.index)
 
             # Update cache
-            self._cache[appid] = {
-                "available": available,
-                "timestamp": datetime.now()
-            }
+            self._cache.set(appid, available, generation=db.generation)
 
             return {
                 "available": available,
@@ -167,9 +2837,10 @@ class Plugin:
         except Exception as e:
             logger.error(f"Error checking GFN availability for {appid}: {e}")
             # Return cached data if available, even if expired
-            if appid in self._cache:
+            stale = self._cache.peek(appid)
+            if stale is not None:
                 return {
-                    "available": self._cache[appid]["available"],
+                    "available": stale,
                     "cached": True,
                     "error": str(e)
                 }
@@ -179,107 +2850,413 @@ class Plugin:
                 "error": str(e)
             }
 
+    @instrumented
+    async def check_gfn_availability_batch(self, appids: list) -> Dict[str, any]:
+        """
+        Check many games at once, e.g. the whole library or a grid of capsules
+
+        Args:
+            appids: Steam app IDs (strings or ints)
+
+        Returns:
+            Dictionary with 'available' (sorted list of the available app IDs
+            as ints) and 'total' (number of app IDs asked about)
+        """
+        if self._db_ready is not None:
+            await self._wait_for_db()
+        available = self._db.index.intersect(appids)
+        return {
+            "available": available,
+            "total": len(appids)
+        }
+
+    @instrumented
+    async def search_games(self, query: str, limit: int = SEARCH_DEFAULT_LIMIT) -> Dict[str, any]:
+        """
+        Find GFN games by title (prefix, substring or close match)
+
+        Args:
+            query: Part of a title; an app ID is looked up directly
+            limit: Maximum number of results (capped at SEARCH_MAX_LIMIT)
+
+        Returns:
+            Dictionary with 'results' (list of {'appid', 'name'}, best first)
+            and 'indexed' (number of titles searched)
+        """
+        await self._wait_for_db()
+        db = self._db
+        search = self._search
+        if search is None or search.generation != db.generation:
+            search = await asyncio.to_thread(GameSearchIndex, db.index, db.generation)
+            if self._db is db:
+                self._search = search
+
+        limit = max(0, min(int(limit), SEARCH_MAX_LIMIT))
+        query = (query or "").strip()
+        results = []
+        if query.isdigit() and query in db.index:
+            results.append({"appid": int(query), "name": (db.index.get(query) or {}).get("name")})
+        results.extend(result for result in search.search(query, limit)
+                       if not results or result["appid"] != results[0]["appid"])
+        return {"status": "success", "results": results[:limit], "indexed": len(search)}
+
+    @instrumented
     async def clear_cache(self) -> Dict[str, str]:
         """Clear the GFN availability cache"""
-        count = len(self._cache)
-        self._cache.clear()
+        count = self._cache.clear()
         logger.info(f"Cleared {count} cached entries")
+        self._events.emit("cache_stats", self._cache_stats())
         return {"status": "success", "cleared": count}
 
+    @instrumented
     async def get_cache_stats(self) -> Dict[str, any]:
-        """Get cache statistics"""
-        total = len(self._cache)
-        expired = sum(
-            1 for data in self._cache.values()
-            if datetime.now() - data["timestamp"] >= self._cache_duration
-        )
+        """
+        Get cache statistics
 
-        return {
-            "total": total,
-            "expired": expired,
-            "fresh": total - expired
-        }
+        'expired' is the running number of entries dropped after their TTL;
+        the other counters are running totals too, so this call is O(1)
+        apart from sweeping entries that have expired since the last sweep.
+        """
+        return self._cache_stats()
 
+    def _cache_stats(self) -> Dict[str, any]:
+        self._cache.purge_expired()
+        stats = self._cache.stats()
+        stats["fresh"] = stats["total"]
+        stats["expired"] = stats["expirations"]
+        stats["lookup_mode"] = self._lookup_mode  # the cache is only consulted in "cached" mode
+        return stats
+
+    @instrumented
     async def get_library_stats(self, appids: list) -> Dict[str, any]:
         """Get GFN availability stats for a list of Steam app IDs"""
-        available = sum(1 for appid in appids if str(appid) in self._local_games_db)
+        result = await self.check_gfn_availability_batch(appids)
+        return {
+            "total": result["total"],
+            "available": len(result["available"])
+        }
+
+    @instrumented
+    async def get_library_coverage(self, fingerprint: Optional[str] = None, appids: Optional[list] = None,
+                                   base_fingerprint: Optional[str] = None, added: Optional[list] = None,
+                                   removed: Optional[list] = None) -> Dict[str, any]:
+        """
+        GFN coverage of the library, remembered between calls
+
+        Send the library's fingerprint first. If the plugin already knows
+        that library it answers from memory; if it knows the library as
+        `base_fingerprint`, `added`/`removed` are applied as a delta.
+        Otherwise the answer has status "resync" and the caller sends the
+        full `appids` list.
+
+        Returns:
+            Dictionary with 'fingerprint', 'generation', 'total',
+            'available_count' and 'bitset' (base64, bit i = i-th lowest app ID)
+        """
+        await self._wait_for_db()
+        db = self._db
+        coverage = self._coverage
+        if coverage is None:
+            coverage = self._coverage = LibraryCoverage()
+
+        if appids is not None:
+            coverage.replace(appids, db)
+            return coverage.result()
+
+        if coverage.generation is not None:
+            if base_fingerprint is not None and base_fingerprint == coverage.fingerprint:
+                coverage.apply_delta(added or (), removed or (), db)
+            if fingerprint is None or fingerprint == coverage.fingerprint:
+                changes = None
+                if self._plugin_dir and coverage.generation not in (None, db.generation):
+                    log = ChangeLog(self._plugin_dir / "defaults" / CHANGELOG_FILENAME)
+                    try:
+                        changes = await asyncio.to_thread(log.diff, coverage.generation, db.generation)
+                    except ValueError:
+                        pass  # no history for the gap: the library is re-tested
+                    # A refresh may have published (and moved the coverage) meanwhile
+                    db = self._db
+                coverage.sync_generation(db, changes)
+                return coverage.result()
+
+        return {"status": "resync", "fingerprint": coverage.fingerprint}
+
+    @instrumented
+    async def prefetch_library(self, appids: list) -> Dict[str, any]:
+        """
+        Resolve the whole library once, right after the plugin loads
+
+        The frontend sends its library's app IDs as soon as it has them.
+        They are tested in one pass over the index and the answers pinned:
+        later `check_gfn_availability` calls for library games are answered
+        from memory, and the frontend can draw badges from the returned
+        list without asking at all. Refreshes keep the pinned answers
+        current.
+
+        Returns:
+            Dictionary with 'generation', 'total', 'fingerprint' and
+            'available' (the library's app IDs that are on GFN, ascending)
+        """
+        await self._wait_for_db()
+        db = self._db
+        start = time.perf_counter()
+        coverage = LibraryCoverage()
+        coverage.replace(appids, db)
+        self._coverage = coverage
+        metrics.observe("prefetch.resolve", time.perf_counter() - start)
         return {
-            "total": len(appids),
-            "available": available
+            "status": "success",
+            "generation": coverage.generation,
+            "fingerprint": coverage.fingerprint,
+            "total": len(coverage.library),
+            "available": sorted(coverage.available),
         }
 
+    @instrumented
     async def get_db_info(self) -> Dict[str, any]:
         """Get local database info for debugging"""
+        await self._wait_for_db()
+        return self._db_info()
+
+    def _db_info(self) -> Dict[str, any]:
+        db = self._db
         return {
-            "db_size": len(self._local_games_db),
+            "db_size": len(db.index),
+            "generation": db.generation,
+            "source_counts": {str(source_id): count for source_id, count in db.index.source_counts().items()},
             "plugin_dir": str(self._plugin_dir) if self._plugin_dir else None,
-            "last_updated": self._db_last_updated
+            "last_updated": db.last_updated
         }
 
-    async def refresh_database(self) -> Dict[str, any]:
-        """Refresh the games database from Steam curator pages"""
+    def _emit_database(self, added: Optional[list] = None, removed: Optional[list] = None):
+        """Announce the published database, with the library's coverage when it is current"""
+        data = self._db_info()
+        if added is not None:
+            data["games_added"] = len(added)
+            data["games_removed"] = len(removed)
+        coverage = self._coverage
+        if coverage is not None and coverage.generation == self._db.generation:
+            result = coverage.result()
+            data["library"] = {key: result[key] for key in ("fingerprint", "total", "available_count")}
+        self._events.emit("database", data)
+
+    @instrumented
+    async def wait_for_events(self, after: Optional[int] = None,
+                              timeout: float = EVENT_WAIT_TIMEOUT) -> Dict[str, any]:
+        """
+        Long-poll for plugin events
+
+        Returns the events after the `after` cursor, waiting up to `timeout`
+        seconds (at most EVENT_WAIT_TIMEOUT) for one when there are none yet.
+        Without `after` it returns the latest event of each type once the
+        database is loaded.
+
+        Event types:
+            database          a database was loaded or a refresh published one
+                              (get_db_info fields, change counts, library coverage)
+            refresh           a refresh started or finished ("state", "result")
+            refresh_progress  pages fetched so far, per source and in total
+            cache_stats       get_cache_stats after a refresh or clear_cache
+
+        Returns:
+            Dictionary with 'cursor' (pass back as `after`), 'events' and
+            'reset' (the cursor was too old: reload state, then continue)
+        """
+        if after is None and self._db_ready is not None:
+            await self._wait_for_db()  # so the initial state includes the database
+        timeout = min(max(float(timeout), 0.0), EVENT_WAIT_TIMEOUT)
+        return await self._events.wait(after, timeout)
+
+    @instrumented
+    async def export_database(self) -> Dict[str, any]:
+        """Export the in-memory database to defaults/gfn_games.json"""
+        if not self._plugin_dir:
+            return {"status": "error", "message": "Plugin directory not set"}
+
+        await self._wait_for_db()
+        db = self._db
+        db_path = self._plugin_dir / "defaults" / "gfn_games.json"
         try:
-            logger.info("Starting database refresh from Steam curators...")
+            timings = await write_atomic_async(db_path, functools.partial(encode_games_json, db))
+            logger.info(f"Exported {len(db.index)} games to {db_path}")
+            return {"status": "success", "path": str(db_path), "count": len(db.index), **timings}
+        except Exception as e:
+            logger.error(f"Error exporting database: {e}")
+            return {"status": "error", "message": str(e)}
 
-            # Fetch from all curator pages in a thread to avoid blocking
-            all_games = {}
+    @instrumented
+    async def refresh_database(self, incremental: bool = True) -> Dict[str, any]:
+        """
+        Refresh the games database from the Steam curators and NVIDIA's list
 
-            for curator_id in CURATOR_IDS:
-                # Run the blocking HTTP requests in a thread pool
-                games = await asyncio.to_thread(fetch_curator_games, curator_id)
-                all_games.update(games)
-                logger.info(f"Fetched {len(games)} games from curator {curator_id}")
+        Callers arriving while a refresh is running wait for that refresh
+        and get its result instead of starting a second one.
 
-            logger.info(f"Total unique games fetched: {len(all_games)}")
+        Args:
+            incremental: Only download pages that changed since the last sync
+                (falls back to a full sync when there is no usable sync state)
+        """
+        return await self._get_scheduler().run(incremental=incremental)
 
-            # Update in-memory database (lock protects the swap)
-            old_count = len(self._local_games_db)
-            async with self._db_lock:
-                self._local_games_db = all_games
-            new_count = len(self._local_games_db)
+    @instrumented
+    async def get_refresh_status(self) -> Dict[str, any]:
+        """Get the refresh scheduler state: next run, last duration, last error"""
+        return self._get_scheduler().state()
 
-            # Save to file
+    async def _run_refresh(self, incremental: bool = True) -> Dict[str, any]:
+        """Run one refresh for the scheduler, announcing its start and outcome"""
+        self._events.emit("refresh", {"state": "running", "incremental": incremental})
+        result = {"status": "error", "message": "cancelled"}
+        try:
+            result = await self._refresh_database(incremental)
+            return result
+        finally:
+            self._events.emit("refresh", {"state": "finished", "result": {
+                key: value for key, value in result.items() if key != "sources"
+            }})
+            self._events.emit("cache_stats", self._cache_stats())
+
+    async def _refresh_database(self, incremental: bool = True) -> Dict[str, any]:
+        """Fetch all sources and publish the merged database (run via the scheduler)"""
+        await self._wait_for_db()
+        try:
+            sources = default_sources()
+            logger.info(f"Starting database refresh from {len(sources)} sources...")
+
+            # Sync state is only trusted while the database it describes is loaded
+            sync_state = CuratorSyncState()
+            sync_state_path = None
+            journal = RefreshJournal()
             if self._plugin_dir:
-                db_path = self._plugin_dir / "defaults" / "gfn_games.json"
+                sync_state_path = self._plugin_dir / "defaults" / SYNC_STATE_FILENAME
+                if incremental and len(self._db.index):
+                    sync_state = CuratorSyncState.load(sync_state_path)
+                # Pick up where an interrupted refresh stopped
+                journal = await asyncio.to_thread(RefreshJournal.load,
+                                                  self._plugin_dir / "defaults" / JOURNAL_FILENAME)
+
+            # Page-by-page progress for the frontend
+            pages = {source.source_id: (0, 0) for source in sources}
+
+            def progress(source_id: int, done: int, total: int):
+                pages[source_id] = (done, total)
+                self._events.emit("refresh_progress", {
+                    "pages_done": sum(done for done, _ in pages.values()),
+                    "pages_total": sum(total for _, total in pages.values()),
+                    "sources": [{"id": source_id, "done": done, "total": total}
+                                for source_id, (done, total) in pages.items()],
+                })
+
+            # All sources share one connection pool and rate limiter, so the
+            # parallelism cap is global; each runs under its own deadline
+            old_db = self._db
+            all_games, reports = await fetch_catalog(sources, sync_state=sync_state, previous=old_db.index,
+                                                     cache=self._get_http_cache(), journal=journal,
+                                                     progress=progress)
+
+            if not any(report["status"] in ("ok", "partial") for report in reports):
+                raise ConnectionError("every source failed: " +
+                                      "; ".join(f"{r['name']}: {r['error']}" for r in reports))
+            if len(old_db.index) and all(report["status"] == "ok" and report.get("not_modified")
+                                         for report in reports):
+                # Nothing changed upstream: keep the current generation rather
+                # than publishing an identical snapshot, events and log record
+                logger.info("No source changed since the last refresh; database already up to date")
+                if self._plugin_dir:
+                    await asyncio.to_thread(journal.discard)
+                old_count = len(old_db.index)
+                return {
+                    "status": "success",
+                    "unchanged": True,
+                    "generation": old_db.generation,
+                    "old_count": old_count,
+                    "new_count": old_count,
+                    "added": 0,
+                    "games_added": 0,
+                    "games_removed": 0,
+                    "sources": reports
+                }
+            missing_pages = sum(report.get("missing_pages", 0) for report in reports)
+            # A source that timed out or failed, or missed pages, was carried
+            # over from the previous database; keep its journal checkpoints so
+            # the retry resumes instead of starting over
+            degraded = [report for report in reports if report["status"] != "ok"]
+            logger.info(f"Total unique games fetched: {len(all_games)}")
 
+            # Build the new index off the event loop, then publish it with a
+            # single reference swap; readers holding the old snapshot keep it
+            index = await asyncio.to_thread(GameIndex.from_games, all_games,
+                                            [source.source_id for source in sources])
+            last_updated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            db = old_db.successor(index, last_updated)
+            self._db = db
+            old_count = len(old_db.index)
+            new_count = len(db.index)
+            added, removed = await asyncio.to_thread(old_db.index.diff, index)
+            coverage = self._coverage
+            if coverage is not None and coverage.generation == old_db.generation:
+                # Re-pin the library's answers; until now lookups used the index
+                coverage.apply_changes(added, removed, db.generation)
+            self._emit_database(added, removed)
+
+            # Save the binary snapshot; the JSON file is only an import/export
+            # format. Serialization and every write run on worker threads so
+            # other RPCs keep being answered meanwhile.
+            persistence = None
+            if self._plugin_dir:
                 # Ensure defaults directory exists and is writable
                 defaults_dir = self._plugin_dir / "defaults"
                 defaults_dir.mkdir(parents=True, exist_ok=True)
-
-                last_updated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                output = {
-                    "comment": "GeForce NOW supported games from Steam curators",
-                    "last_updated": last_updated,
-                    "sources": [
-                        {"curator_id": 38115929, "name": "Geforce Now Friendly"},
-                        {"curator_id": 45481916, "name": "Geforce Now Friendly Part 2"}
-                    ],
-                    "games": {
-                        appid: {"available": True}
-                        for appid in sorted(all_games.keys())
-                    }
-                }
-                self._db_last_updated = last_updated
+                snapshot_path = defaults_dir / SNAPSHOT_FILENAME
 
                 try:
-                    with open(db_path, 'w') as f:
-                        json.dump(output, f, indent=2)
-                    logger.info(f"Database saved to {db_path}")
+                    persistence = await write_atomic_async(snapshot_path, functools.partial(encode_snapshot, db))
+                    metrics.observe("refresh.serialize", persistence["serialize_ms"] / 1000)
+                    metrics.observe("refresh.write", persistence["write_ms"] / 1000)
+                    logger.info(f"Database saved to {snapshot_path} ({persistence['bytes']} bytes, "
+                                f"serialized in {persistence['serialize_ms']} ms, "
+                                f"written in {persistence['write_ms']} ms)")
+                    await asyncio.to_thread(sync_state.save, sync_state_path)
+                    if not degraded:
+                        await asyncio.to_thread(journal.discard)
                 except PermissionError as e:
-                    logger.error(f"Permission denied writing to {db_path}: {e}")
+                    logger.error(f"Permission denied writing to {snapshot_path}: {e}")
                     logger.error("Database updated in memory but could not save to file")
                     # Don't fail the whole operation - the in-memory update succeeded
 
-            # Clear cache since we have fresh data
-            self._cache.clear()
-
-            return {
-                "status": "success",
+                try:
+                    await asyncio.to_thread(ChangeLog(defaults_dir / CHANGELOG_FILENAME).append,
+                                            db.generation, old_db.generation, added, removed)
+                except Exception as e:
+                    logger.error(f"Could not record changes in the change log: {e}")
+
+            # Cached answers are tagged with the old generation and now miss
+            result = {
+                "status": "partial" if degraded else "success",
+                "generation": db.generation,
                 "old_count": old_count,
                 "new_count": new_count,
-                "added": new_count - old_count
+                "added": new_count - old_count,
+                "games_added": len(added),
+                "games_removed": len(removed),
+                "sources": reports
             }
-
+            if persistence is not None:
+                result["persistence"] = persistence
+            if degraded:
+                # Published, but games from the failed sources and missing
+                # pages were kept from the previous database rather than dropped
+                if missing_pages:
+                    result["missing_pages"] = missing_pages
+                problems = [f"{report['name']} ({report['error']})" if "error" in report
+                            else f"{report['name']} ({report.get('missing_pages', 0)} pages missing)"
+                            for report in degraded]
+                result["message"] = "Kept games from the last refresh for " + ", ".join(problems)
+            return result
+
+        except asyncio.CancelledError:
+            logger.info("Database refresh cancelled")
+            raise
         except Exception as e:
             logger.error(f"Error refreshing database: {e}")
             return {
@@ -287,66 +3264,227 @@ class Plugin:
                 "message": str(e)
             }
 
-    async def get_settings(self) -> Dict[str, any]:
-        """Get current settings"""
-        return self._settings
+    @instrumented
+    async def get_changes(self, since_generation: Optional[int] = None, days: Optional[float] = None,
+                          limit: int = 100) -> Dict[str, any]:
+        """
+        Games added to and removed from the database over a period
 
-    async def save_settings(self, settings: Dict[str, any]) -> Dict[str, str]:
-        """Save settings to file"""
-        self._settings = settings
+        Answered from the change log, without loading older databases.
 
-        if self._settings_path:
-            try:
-                with open(self._settings_path, 'w') as f:
-                    json.dump(settings, f, indent=2)
-                logger.info("Settings saved successfully")
-                return {"status": "success"}
-            except Exception as e:
-                logger.error(f"Error saving settings: {e}")
-                return {"status": "error", "message": str(e)}
+        Args:
+            since_generation: Generation to diff from
+            days: Diff from the database as it was this many days ago
+                (used when since_generation is not given; default 7)
+            limit: Maximum number of app IDs listed per direction
+        """
+        if not self._plugin_dir:
+            return {"status": "error", "message": "Plugin directory not set"}
+
+        await self._wait_for_db()
+        db = self._db
+        log = ChangeLog(self._plugin_dir / "defaults" / CHANGELOG_FILENAME)
+        try:
+            if since_generation is None:
+                since = time.time() - (7 if days is None else days) * 24 * 60 * 60
+                since_generation = await asyncio.to_thread(log.generation_at, since)
+                if since_generation is None:
+                    since_generation = db.generation  # no history yet
+            changes = await asyncio.to_thread(log.diff, since_generation, db.generation)
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}
+
+        added = changes["added"]
+        removed = changes["removed"]
+        return {
+            "status": "success",
+            "from_generation": changes["from_generation"],
+            "to_generation": changes["to_generation"],
+            "added_count": len(added),
+            "removed_count": len(removed),
+            "added": [{"appid": appid, "name": (db.index.get(appid) or {}).get("name")} for appid in added[:limit]],
+            "removed": removed[:limit],
+        }
+
+    async def get_metrics(self, dump: bool = False) -> Dict[str, any]:
+        """
+        Get backend metrics: per-RPC call counts and latency histograms,
+        refresh timings per curator and page, HTTP bytes downloaded and
+        cache statistics
+
+        Args:
+            dump: Also write the metrics to metrics.json in the plugin's log
+                (or settings) directory
+        """
+        result = metrics.snapshot()
+        result["cache"] = self._cache.stats()
+        if self._http_cache is not None:
+            result["http_cache"] = self._http_cache.stats()
+        result["lookup_mode"] = self._lookup_mode
+        result["db_generation"] = self._db.generation
+
+        if dump:
+            dump_dir = os.environ.get("DECKY_PLUGIN_LOG_DIR") or os.environ.get("DECKY_PLUGIN_SETTINGS_DIR")
+            if dump_dir:
+                dump_path = Path(dump_dir) / "metrics.json"
+                try:
+                    _write_atomic(dump_path, json.dumps(result, indent=2).encode("utf-8"))
+                    result["dump_path"] = str(dump_path)
+                except Exception as e:
+                    logger.error(f"Error dumping metrics to {dump_path}: {e}")
 
-        return {"status": "error", "message": "Settings path not initialized"}
+        return result
 
-    def _load_settings(self):
-        """Load settings from file"""
-        if self._settings_path and self._settings_path.exists():
+    @instrumented
+    async def get_settings(self) -> Dict[str, any]:
+        """Get current settings"""
+        return self._settings.get()
+
+    @instrumented
+    async def save_settings(self, settings: Dict[str, any]) -> Dict[str, str]:
+        """
+        Merge `settings` (all settings or just the changed ones) into the
+        current settings; settings.json is written in the background
+        """
+        self._settings.update(settings)
+        if self._settings.path is None:
+            return {"status": "error", "message": "Settings path not initialized"}
+        return {"status": "success"}
+
+    async def _wait_for_db(self):
+        """Wait for the startup database load, if it is still running"""
+        ready = self._db_ready
+        if ready is not None and not ready.done():
+            # Shielded: a cancelled caller must not cancel the load for everyone
+            await asyncio.shield(ready)
+
+    async def _load_in_background(self):
+        """Load the database on a worker thread, then release waiting lookups"""
+        load_start = time.perf_counter()
+        try:
+            await asyncio.to_thread(self._load_local_games_db)
+            metrics.observe("startup.db_load", time.perf_counter() - load_start)
+            logger.info(f"Database ready after {(time.perf_counter() - load_start) * 1000:.0f} ms")
+            self._emit_database()
+        except Exception as e:
+            logger.error(f"Error loading local games database: {e}")
+        finally:
+            ready, self._db_ready = self._db_ready, None
+            if ready is not None and not ready.done():
+                ready.set_result(None)
+        self._schedule_refreshes()
+
+    def _schedule_refreshes(self):
+        """Start background refreshes: right away if the DB is empty, otherwise
+        once it is older than REFRESH_INTERVAL"""
+        db = self._db
+        first_delay = 0 if len(db.index) == 0 else REFRESH_INTERVAL
+        if first_delay and db.last_updated:
             try:
-                with open(self._settings_path, 'r') as f:
-                    loaded_settings = json.load(f)
-                    self._settings.update(loaded_settings)
-                logger.info("Settings loaded successfully")
-            except Exception as e:
-                logger.error(f"Error loading settings: {e}")
+                last_updated_dt = datetime.strptime(db.last_updated, "%Y-%m-%d %H:%M:%S")
+                age = (datetime.now() - last_updated_dt).total_seconds()
+                first_delay = max(0, REFRESH_INTERVAL - age)
+            except ValueError:
+                pass  # unparseable timestamp — wait a full interval
+
+        if first_delay == 0:
+            logger.info("Database is empty or stale, scheduling background refresh...")
+        self._get_scheduler().start(first_delay)
+
+    def _get_scheduler(self) -> RefreshScheduler:
+        if self._scheduler is None:
+            self._scheduler = RefreshScheduler(self._run_refresh)
+        return self._scheduler
+
+    def _get_http_cache(self) -> Optional[HTTPValidatorCache]:
+        """On-disk HTTP validator cache in Decky's runtime directory (or next to the database)"""
+        if self._http_cache is None:
+            runtime_dir = os.environ.get("DECKY_PLUGIN_RUNTIME_DIR")
+            if runtime_dir:
+                self._http_cache = HTTPValidatorCache(Path(runtime_dir) / "http_cache")
+            elif self._plugin_dir:
+                self._http_cache = HTTPValidatorCache(self._plugin_dir / "defaults" / "http_cache")
+        return self._http_cache
 
     def _load_local_games_db(self):
-        """Load local games database"""
+        """
+        Load local games database
+
+        The binary snapshot is mapped in place. defaults/gfn_games.json is
+        only imported when there is no snapshot yet or the JSON file is newer
+        (e.g. a fresh plugin install or a hand-edited export); the import is
+        then saved as a snapshot for the next start. An import never reuses a
+        generation: it is numbered after the snapshot it replaces and the
+        change log, and recorded in the log when that snapshot is readable.
+        """
         if not self._plugin_dir:
             logger.warning("Plugin directory not set, cannot load database")
             return
 
+        snapshot_path = self._plugin_dir / "defaults" / SNAPSHOT_FILENAME
         db_path = self._plugin_dir / "defaults" / "gfn_games.json"
-        logger.info(f"Looking for database at: {db_path}")
+        logger.info(f"Looking for database at: {snapshot_path}")
+
+        previous = None
+        if snapshot_path.exists():
+            try:
+                previous = load_snapshot(snapshot_path)
+            except Exception as e:
+                logger.error(f"Error loading database snapshot, falling back to JSON: {e}")
+            if previous is not None and (not db_path.exists() or
+                                         snapshot_path.stat().st_mtime >= db_path.stat().st_mtime):
+                self._db = previous
+                logger.info(f"Mapped {len(self._db.index)} games from database snapshot "
+                            f"(generation {self._db.generation})")
+                return
 
         if db_path.exists():
+            change_log = ChangeLog(self._plugin_dir / "defaults" / CHANGELOG_FILENAME)
             try:
                 with open(db_path, 'r') as f:
                     data = json.load(f)
-                    self._local_games_db = data.get("games", {})
-                    self._db_last_updated = data.get("last_updated")
-                logger.info(f"Loaded {len(self._local_games_db)} games from local database")
+                generation = int(data.get("generation", 0))
+                known = [previous.generation] if previous is not None else []
+                try:
+                    known.append(change_log.stats()["last_generation"])
+                except Exception as e:
+                    logger.warning(f"Could not read the change log: {e}")
+                known = max((g for g in known if g is not None), default=None)
+                if known is not None and generation <= known:
+                    # Reusing a generation would let the change log mix this
+                    # database's history with the one it replaces
+                    generation = known + 1
+                self._db = DatabaseSnapshot(
+                    GameIndex.from_games(data.get("games", {})),
+                    generation,
+                    data.get("last_updated")
+                )
+                logger.info(f"Imported {len(self._db.index)} games from {db_path} (generation {generation})")
             except Exception as e:
                 logger.error(f"Error loading local games database: {e}")
+                return
+
+            if previous is not None:
+                try:
+                    added, removed = previous.index.diff(self._db.index)
+                    change_log.append(self._db.generation, previous.generation, added, removed)
+                except Exception as e:
+                    logger.error(f"Could not record the import in the change log: {e}")
+
+            try:
+                write_snapshot(snapshot_path, self._db)
+            except Exception as e:
+                logger.warning(f"Could not write database snapshot {snapshot_path}: {e}")
         else:
             logger.error(f"Database file not found at {db_path}")
             logger.error(f"Please ensure defaults/gfn_games.json exists in the plugin directory")
 
     # Decky plugin lifecycle methods
     async def _main(self):
+        self._started_at = time.perf_counter()
+        self._events = EventBus()
         logger.info("GFN for Deck plugin loaded")
 
-        # Initialize async lock for DB writes
-        self._db_lock = asyncio.Lock()
-
         # Initialize plugin directory
         plugin_dir = os.environ.get("DECKY_PLUGIN_DIR")
         if plugin_dir:
@@ -357,29 +3495,33 @@ class Plugin:
         # Decky plugins have access to DECKY_PLUGIN_SETTINGS_DIR environment variable
         settings_dir = os.environ.get("DECKY_PLUGIN_SETTINGS_DIR")
         if settings_dir:
-            self._settings_path = Path(settings_dir) / "settings.json"
-            self._load_settings()
+            self._settings = SettingsStore(Path(settings_dir) / "settings.json")
+            self._settings.load()
         else:
             logger.warning("DECKY_PLUGIN_SETTINGS_DIR not found, settings will not persist")
 
-        # Load local games database
-        self._load_local_games_db()
-
-        # Auto-refresh if DB is empty or older than 7 days
-        needs_refresh = len(self._local_games_db) == 0
-        if not needs_refresh and self._db_last_updated:
-            try:
-                last_updated_dt = datetime.strptime(self._db_last_updated, "%Y-%m-%d %H:%M:%S")
-                if datetime.now() - last_updated_dt > timedelta(days=7):
-                    needs_refresh = True
-                    logger.info("Database is older than 7 days, scheduling background refresh")
-            except ValueError:
-                pass  # unparseable timestamp — leave as-is
-
-        if needs_refresh:
-            logger.info("Scheduling background database refresh...")
-            asyncio.create_task(self.refresh_database())
+        # Load local games database; refreshes are scheduled once it is loaded
+        if DEFERRED_STARTUP:
+            self._db_ready = asyncio.get_running_loop().create_future()
+            self._startup_task = asyncio.create_task(self._load_in_background())
+        else:
+            self._load_local_games_db()
+            self._emit_database()
+            self._schedule_refreshes()
 
     async def _unload(self):
         logger.info("GFN for Deck plugin unloaded")
+
+        if self._startup_task is not None and not self._startup_task.done():
+            self._startup_task.cancel()
+            await asyncio.gather(self._startup_task, return_exceptions=True)
+
+        # Stop the schedule and cancel any in-flight refresh; its connections
+        # are closed on the way out
+        if self._scheduler is not None:
+            await self._scheduler.stop()
+
+        await asyncio.to_thread(self._settings.close)
+
+        self._events.close()
         self._cache.clear()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Compare the memory footprint and lookup speed of the compact GameIndex
+against the dict-of-dicts the plugin used to keep in memory.
+
+Usage:
+    python3 scripts/bench_index_memory.py [path/to/gfn_games.json]
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+sys.path.insert(0, str(PROJECT_DIR / "py_modules"))
+
+from main import GameIndex  # noqa: E402
+
+
+def measure(build):
+    """Return (result, bytes still allocated by build())"""
+    build()  # warm up so one-off interpreter allocations are not counted
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def time_lookups(db, appids, rounds=20):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for appid in appids:
+            appid in db
+    elapsed = time.perf_counter() - start
+    return elapsed / (rounds * len(appids)) * 1e9
+
+
+def main():
+    db_path = Path(sys.argv[1]) if len(sys.argv) > 1 else PROJECT_DIR / "defaults" / "gfn_games.json"
+    with open(db_path, 'r') as f:
+        raw = f.read()
+
+    games = json.loads(raw)["games"]
+    print(f"Database: {db_path} ({len(raw) / 1024:.0f} KB, {len(games)} games)")
+    print("=" * 50)
+
+    # Same shape refresh_database used to keep: {appid: {"available": True, "curator_id": ...}}
+    as_dict, dict_bytes = measure(lambda: {
+        appid: {"available": True, "curator_id": 38115929}
+        for appid in json.loads(raw)["games"]
+    })
+    as_index, index_bytes = measure(lambda: GameIndex.from_games(as_dict))
+    as_named_index, named_bytes = measure(lambda: GameIndex.from_games(json.loads(raw)["games"]))
+
+    print(f"dict of dicts:     {dict_bytes / 1024:8.1f} KB  ({dict_bytes / len(games):6.1f} B/game)")
+    print(f"GameIndex:         {index_bytes / 1024:8.1f} KB  ({index_bytes / len(games):6.1f} B/game)")
+    print(f"GameIndex + names: {named_bytes / 1024:8.1f} KB  ({named_bytes / len(games):6.1f} B/game)")
+    print(f"Reduction:         {dict_bytes / max(index_bytes, 1):8.1f}x")
+
+    # Half hits, half misses, as strings like the frontend sends them
+    probes = list(as_dict)[:500] + [str(appid) for appid in range(1, 1001, 2)]
+    print()
+    print(f"dict lookup:       {time_lookups(as_dict, probes):8.0f} ns/lookup")
+    print(f"GameIndex lookup:  {time_lookups(as_index, probes):8.0f} ns/lookup")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
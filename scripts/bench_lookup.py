@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Per-call latency of Plugin.check_gfn_availability.
+
+Compares the original lookup path (datetime-stamped dict cache in front of
+a dict membership check, with per-lookup logging), the TTL-cached path and
+the direct path that queries the immutable index.
+
+The index membership test is also timed on its own, for hits and misses
+separately, against a set of app ID strings (what the dict-of-dicts
+database amounted to).
+
+Usage:
+    python3 scripts/bench_lookup.py [path/to/gfn_games.json]
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import time
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+sys.path.insert(0, str(PROJECT_DIR / "py_modules"))
+
+import main as gfn  # noqa: E402
+
+CALLS = 20000
+
+
+class OriginalLookup:
+    """The lookup path as it was before the index and the bounded cache"""
+
+    def __init__(self, games):
+        self._local_games_db = {appid: {"available": True} for appid in games}
+        self._cache = {}
+        self._cache_duration = timedelta(hours=2)
+
+    async def check_gfn_availability(self, appid):
+        gfn.logger.info(f"Checking GFN availability for app {appid}")
+        if appid in self._cache:
+            cached_data = self._cache[appid]
+            if datetime.now() - cached_data["timestamp"] < self._cache_duration:
+                gfn.logger.info(f"Returning cached result for app {appid}")
+                return {"available": cached_data["available"], "cached": True}
+
+        gfn.logger.info(f"Checking local database for appid {appid}...")
+        gfn.logger.info(f"Database has {len(self._local_games_db)} games")
+        available = appid in self._local_games_db
+        self._cache[appid] = {"available": available, "timestamp": datetime.now()}
+        return {"available": available, "cached": False}
+
+
+async def time_calls(check, appids):
+    start = time.perf_counter()
+    for appid in appids:
+        await check(appid)
+    return (time.perf_counter() - start) / len(appids) * 1e9
+
+
+def time_membership(contains, appids):
+    start = time.perf_counter()
+    for appid in appids:
+        contains(appid)
+    return (time.perf_counter() - start) / len(appids) * 1e9
+
+
+def bench_membership(games, index):
+    """ns per membership test, without the RPC around it"""
+    known = list(games)
+    known_set = set(known)
+    hits = [random.choice(known) for _ in range(CALLS)]
+    misses = []
+    while len(misses) < CALLS:
+        appid = str(random.randrange(10, 3_000_000))
+        if appid not in known_set:
+            misses.append(appid)
+
+    appids = index._appids
+
+    def plain_bisect(appid):
+        key = int(appid)
+        i = bisect_left(appids, key)
+        return i < len(appids) and appids[i] == key
+
+    print(f"{'membership':16} {'hit ns':>10} {'miss ns':>10}")
+    for name, contains in (("GameIndex in", index.__contains__), ("int + bisect", plain_bisect),
+                           ("set of str", known_set.__contains__)):
+        print(f"{name:16} {time_membership(contains, hits):10.0f} {time_membership(contains, misses):10.0f}")
+    print()
+
+
+async def run(games):
+    known = list(games)
+    # Mostly games that are not on GFN, like a typical library
+    probes = [
+        random.choice(known) if random.random() < 0.2 else str(random.randrange(10, 3_000_000))
+        for _ in range(CALLS)
+    ]
+    # A library-sized working set, so the cached paths see repeat lookups
+    repeated = [random.choice(probes[:500]) for _ in range(CALLS)]
+
+    index = gfn.GameIndex.from_games(games)
+    bench_membership(games, index)
+
+    cached = gfn.Plugin()
+    cached._db = gfn.DatabaseSnapshot(index)
+    cached._lookup_mode = "cached"
+    cached._cache = gfn.TTLCache()
+    direct = gfn.Plugin()
+    direct._db = gfn.DatabaseSnapshot(index)
+    direct._lookup_mode = "direct"
+
+    paths = [
+        ("original", lambda: OriginalLookup(games).check_gfn_availability),
+        ("cached", lambda: cached.check_gfn_availability),
+        ("direct", lambda: direct.check_gfn_availability),
+    ]
+
+    print(f"{'path':10} {'unique ns/call':>16} {'repeat ns/call':>16}")
+    for name, make in paths:
+        check = make()
+        unique = await time_calls(check, probes)
+        repeat = await time_calls(check, repeated)
+        print(f"{name:10} {unique:16.0f} {repeat:16.0f}")
+
+
+def main():
+    db_path = Path(sys.argv[1]) if len(sys.argv) > 1 else PROJECT_DIR / "defaults" / "gfn_games.json"
+    with open(db_path, 'r') as f:
+        games = json.load(f)["games"]
+
+    # Keep log formatting in the measurement but do not flood the terminal
+    logging.basicConfig(stream=open(os.devnull, 'w'), level=logging.INFO, force=True)
+
+    print(f"Database: {db_path} ({len(games)} games), {CALLS} calls per run")
+    print("=" * 50)
+    asyncio.run(run(games))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
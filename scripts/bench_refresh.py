@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Offline refresh benchmark.
+
+Starts a local HTTP server standing in for Steam's curator
+`ajaxgetfilteredrecommendations` pages and NVIDIA's gfnpc.json, points the
+plugin at it and times a full Plugin.refresh_database (every source). Each
+measured run happens in a fresh worker process so peak RSS belongs to that
+run alone.
+
+Pages are synthetic by default, shaped like the real responses (escaped
+HTML, ~1 KB per game). `--record DIR` saves the live responses once and
+`--replay DIR` serves them instead.
+
+Usage:
+    python3 scripts/bench_refresh.py [--runs 3] [--latency 50] [--jitter 20]
+                                     [--error-rate 0.02]
+                                     [--no-rate-limit] [--replay DIR]
+    python3 scripts/bench_refresh.py --record DIR
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import multiprocessing
+import os
+import random
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+sys.path.insert(0, str(PROJECT_DIR / "py_modules"))
+
+import main as gfn  # noqa: E402
+
+# Roughly the size of the real lists
+SYNTHETIC_COUNTS = {38115929: 2000, 45481916: 1100}
+SYNTHETIC_NVIDIA_GAMES = 1600
+
+_CURATOR_PATH = re.compile(r'^/curator/(\d+)/ajaxgetfilteredrecommendations/render/\?.*start=(\d+)&count=(\d+)')
+_NVIDIA_PATH = "/supported-public-game-list/gfnpc.json"
+
+
+# --- Stand-in server ---------------------------------------------------------
+
+class Catalog:
+    """Response bodies served by the stand-in, synthetic or replayed"""
+
+    def __init__(self, replay_dir=None):
+        self.replay_dir = Path(replay_dir) if replay_dir else None
+
+    def curator_page(self, curator_id, start, count):
+        if self.replay_dir:
+            path = self.replay_dir / f"curator_{curator_id}_{start}.json"
+            return path.read_bytes() if path.exists() else None
+
+        total = SYNTHETIC_COUNTS.get(curator_id)
+        if total is None:
+            return None
+        rng = random.Random(curator_id * 100003 + start)
+        items = []
+        for appid in range(curator_id % 1000 * 10000 + start, curator_id % 1000 * 10000 + min(start + count, total)):
+            filler = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz ") for _ in range(700))
+            items.append(
+                f'<div class="recommendation" data-ds-appid="{appid}" data-ds-itemkey="App_{appid}">'
+                f'<a href="https://store.steampowered.com/app/{appid}/">'
+                f'<img src="https://cdn/apps/{appid}/capsule.jpg" alt="Benchmark Game {appid}">'
+                f'</a><div class="recommendation_desc">{filler}</div></div>'
+            )
+        return json.dumps({
+            "success": 1,
+            "results_html": "".join(items),
+            "total_count": total,
+            "start": start,
+        }).encode("utf-8")
+
+    def nvidia_list(self):
+        if self.replay_dir:
+            path = self.replay_dir / "gfnpc.json"
+            return path.read_bytes() if path.exists() else None
+
+        curator_id = next(iter(SYNTHETIC_COUNTS))
+        return json.dumps([
+            {
+                "id": 100000000 + i,
+                "title": f"Benchmark Game {i}",
+                "sortName": f"benchmark_game_{i}",
+                "isFullyOptimized": i % 3 == 0,
+                "steamUrl": f"https://store.steampowered.com/app/{curator_id % 1000 * 10000 + i}",
+                "store": "Steam",
+                "publisher": "Benchmark",
+                "genres": ["Action"],
+                "status": "AVAILABLE",
+            }
+            for i in range(SYNTHETIC_NVIDIA_GAMES)
+        ]).encode("utf-8")
+
+
+def _make_handler(catalog, latency, jitter, error_rate, stats, lock):
+    class StandInHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path == "/__stats":
+                with lock:
+                    body = json.dumps(stats).encode("utf-8")
+                return self._send(200, body)
+
+            delay = latency + random.uniform(-jitter, jitter)
+            if delay > 0:
+                time.sleep(delay)
+            if error_rate and random.random() < error_rate:
+                with lock:
+                    stats["errors"] += 1
+                return self._send(503, b"injected error")
+
+            match = _CURATOR_PATH.match(self.path)
+            if match:
+                curator_id, start, count = map(int, match.groups())
+                body = catalog.curator_page(curator_id, start, count)
+                kind = "pages"
+            elif self.path.split("?")[0] == _NVIDIA_PATH:
+                body = catalog.nvidia_list()
+                kind = "lists"
+            else:
+                body, kind = None, None
+
+            if body is None:
+                return self._send(404, b"not found")
+            with lock:
+                stats[kind] += 1
+            self._send(200, body)
+
+        def _send(self, status, body):
+            headers = {"Content-Type": "application/json"}
+            if "gzip" in self.headers.get("Accept-Encoding", "") and len(body) > 1024:
+                body = gzip.compress(body, compresslevel=6)
+                headers["Content-Encoding"] = "gzip"
+            headers["Content-Length"] = str(len(body))
+
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+            with lock:
+                stats["bytes_sent"] += len(body)
+
+    return StandInHandler
+
+
+def _serve(port_queue, replay_dir, latency, jitter, error_rate):
+    stats = {"pages": 0, "lists": 0, "errors": 0, "bytes_sent": 0}
+    handler = _make_handler(Catalog(replay_dir), latency, jitter, error_rate, stats, threading.Lock())
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+def start_server(args):
+    """Run the stand-in in its own process so it does not count towards RSS"""
+    port_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=_serve,
+        args=(port_queue, args.replay, args.latency / 1000, args.jitter / 1000, args.error_rate),
+        daemon=True,
+    )
+    process.start()
+    return process, port_queue.get(timeout=10)
+
+
+def server_stats(base_url):
+    with urllib.request.urlopen(f"{base_url}/__stats") as response:
+        return json.load(response)
+
+
+# --- Worker (one measured run) -------------------------------------------------
+
+def run_worker(base_url, no_rate_limit):
+    gfn.STEAM_STORE_URL = base_url
+    gfn.NVIDIA_GAME_LIST_URL = base_url + _NVIDIA_PATH
+    if no_rate_limit:
+        gfn.FETCH_RATE_LIMIT = 1e9
+    gfn.metrics.reset()
+
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as plugin_dir:
+        os.environ["DECKY_PLUGIN_RUNTIME_DIR"] = plugin_dir
+        plugin = gfn.Plugin()
+        plugin._plugin_dir = Path(plugin_dir)
+        result = asyncio.run(plugin.refresh_database(incremental=False))
+        status, count = result["status"], result.get("new_count", 0)
+    wall = time.perf_counter() - start
+
+    counters = gfn.metrics.snapshot()["counters"]
+    print(json.dumps({
+        "status": status,
+        "games": count,
+        "wall_s": wall,
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "client_bytes": counters.get("http.bytes_downloaded", 0),
+    }))
+
+
+def measure(base_url, no_rate_limit):
+    before = server_stats(base_url)
+    command = [sys.executable, __file__, "--worker", "--base-url", base_url]
+    if no_rate_limit:
+        command.append("--no-rate-limit")
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    after = server_stats(base_url)
+
+    result["pages"] = after["pages"] - before["pages"]
+    result["errors"] = after["errors"] - before["errors"]
+    result["bytes"] = after["bytes_sent"] - before["bytes_sent"]
+    return result
+
+
+# --- Recording -----------------------------------------------------------------
+
+def record(directory):
+    """Save the live curator pages and gfnpc.json for --replay"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    context = gfn._ssl_context()
+    for curator_id in gfn.CURATOR_IDS:
+        start = 0
+        while True:
+            url = gfn._curator_page_url(curator_id, start, 100)
+            with urllib.request.urlopen(url, timeout=30, context=context) as response:
+                body = response.read()
+            (directory / f"curator_{curator_id}_{start}.json").write_bytes(body)
+            total = int(json.loads(body).get("total_count", 0))
+            print(f"curator {curator_id}: saved offset {start}/{total}")
+            start += 100
+            if start >= total:
+                break
+            time.sleep(1)  # be nice to Steam's servers
+
+    with urllib.request.urlopen(gfn.NVIDIA_GAME_LIST_URL, timeout=60, context=context) as response:
+        body = response.read()
+    (directory / "gfnpc.json").write_bytes(body)
+    print(f"saved gfnpc.json ({len(body) / 1024:.0f} KB)")
+
+
+# --- Main ----------------------------------------------------------------------
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Offline refresh benchmark")
+    parser.add_argument("--runs", type=int, default=3, help="measured runs")
+    parser.add_argument("--latency", type=float, default=50, help="added latency per response (ms)")
+    parser.add_argument("--jitter", type=float, default=20, help="+/- random latency (ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--no-rate-limit", action="store_true", help="lift FETCH_RATE_LIMIT to measure raw throughput")
+    parser.add_argument("--replay", help="serve responses saved with --record instead of synthetic pages")
+    parser.add_argument("--record", help="save live responses to this directory and exit")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.worker:
+        run_worker(args.base_url, args.no_rate_limit)
+        return 0
+    if args.record:
+        record(args.record)
+        return 0
+
+    server, port = start_server(args)
+    base_url = f"http://127.0.0.1:{port}"
+    print(f"Stand-in server on {base_url} ({'replay ' + args.replay if args.replay else 'synthetic'}), "
+          f"latency {args.latency:.0f}±{args.jitter:.0f} ms, error rate {args.error_rate:.0%}, "
+          f"rate limit {'off' if args.no_rate_limit else f'{gfn.FETCH_RATE_LIMIT:g}/s'}")
+    print("=" * 78)
+    print(f"{'run':>3} {'status':>8} {'games':>6} {'pages':>6} {'errors':>6} "
+          f"{'wall s':>7} {'pages/s':>8} {'peak RSS MB':>11} {'KB sent':>8}")
+
+    try:
+        for run in range(1, args.runs + 1):
+            r = measure(base_url, args.no_rate_limit)
+            print(f"{run:3} {r['status']:>8} {r['games']:6} {r['pages']:6} {r['errors']:6} "
+                  f"{r['wall_s']:7.2f} {r['pages'] / r['wall_s']:8.1f} {r['peak_rss_kb'] / 1024:11.1f} "
+                  f"{r['bytes'] / 1024:8.0f}")
+    finally:
+        server.terminate()
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Title search latency of GameSearchIndex.
+
+Builds the trigram index over the catalog's titles and times queries as
+Quick Lookup sends them: prefixes typed one character at a time, whole
+titles, words out of order, typos and misses. A linear scan (substring
+match over every normalized title) is timed alongside as the baseline,
+with the share of queries each one found anything for: the scan has no
+answer for typos or reordered words.
+
+The shipped gfn_games.json may only carry placeholder names; when it has
+fewer named games than --titles, synthetic titles shaped like real ones
+are generated for the unnamed app IDs (and for extra app IDs beyond the
+catalog, to measure larger ones).
+
+Usage:
+    python3 scripts/bench_search.py [--titles 4000] [--queries 2000] [path/to/gfn_games.json]
+"""
+
+import argparse
+import gc
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+sys.path.insert(0, str(PROJECT_DIR / "py_modules"))
+
+import main as gfn  # noqa: E402
+
+# Frequent title words, plus invented ones for the long tail real titles have
+COMMON_WORDS = (
+    "the of dark souls legend shadow star war call duty age empire city last dead space "
+    "battle world simulator ghost hunter kingdom dragon quest final fantasy racing total "
+    "castle dungeon tactics arena hero night fire storm galaxy survival island edge"
+).split()
+SYLLABLES = "ba ka ra to mi zen dor vel qua nix tar lo sh ar en ix um or fy gal tri bel cro sta".split()
+
+
+def make_vocabulary(rng, size=3000):
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def synthetic_title(rng, vocabulary):
+    def word():
+        return (rng.choice(COMMON_WORDS) if rng.random() < 0.4 else rng.choice(vocabulary)).capitalize()
+
+    title = " ".join(word() for _ in range(rng.randint(1, 4)))
+    if rng.random() < 0.3:
+        title += f" {rng.randint(2, 5)}"
+    if rng.random() < 0.2:
+        title += ": " + " ".join(word() for _ in range(rng.randint(1, 3)))
+    return title
+
+
+def build_games(db_path, titles, rng):
+    with open(db_path, 'r') as f:
+        games = json.load(f)["games"]
+    named = sum(1 for appid, data in games.items() if data.get("name") not in (None, f"Game {appid}"))
+    if named < titles:
+        vocabulary = make_vocabulary(rng)
+        for appid in list(games)[:titles]:
+            if games[appid].get("name") in (None, f"Game {appid}"):
+                games[appid] = dict(games[appid], name=synthetic_title(rng, vocabulary))
+        appid = 100_000_000
+        while len(games) < titles:
+            games[str(appid)] = {"name": synthetic_title(rng, vocabulary), "available": True}
+            appid += 1
+    return games, named
+
+
+def typo(word, rng):
+    if len(word) < 4:
+        return word
+    i = rng.randrange(1, len(word) - 1)
+    return word[:i] + word[i + 1:] if rng.random() < 0.5 else word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def make_queries(titles, count, rng):
+    """(kind, query) pairs in roughly the mix a user produces"""
+    queries = []
+    for _ in range(count):
+        title = rng.choice(titles)
+        words = title.split()
+        kind = rng.choice(("prefix", "prefix", "title", "reordered", "typo", "miss"))
+        if kind == "prefix":
+            query = title[:rng.randint(1, min(8, len(title)))]
+        elif kind == "title":
+            query = title
+        elif kind == "reordered":
+            query = " ".join(reversed(words[:3]))
+        elif kind == "typo":
+            query = " ".join(typo(word, rng) for word in words[:2])
+        else:
+            query = "zqx" + "".join(rng.choice("bcdfghjkmnpvw") for _ in range(4))
+        queries.append((kind, query))
+    return queries
+
+
+def linear_search(normalized, query, limit):
+    """Substring match over every title, ranked like the index ranks its strict matches"""
+    key = gfn.normalize_title(query)
+    if not key:
+        return []
+    padded_key = " " + key
+    matches = [title for title in normalized if key in title]
+    return sorted(matches, key=lambda title: (
+        0 if title == key else 1 if title.startswith(key) else 2 if padded_key in " " + title else 3,
+        len(title), title,
+    ))[:limit]
+
+
+def time_queries(search, queries):
+    """Per query kind: the latencies in ms and how many queries found anything"""
+    per_kind = {}
+    found = {}
+    for kind, query in queries:
+        start = time.perf_counter()
+        results = search(query)
+        per_kind.setdefault(kind, []).append((time.perf_counter() - start) * 1000)
+        found[kind] = found.get(kind, 0) + bool(results)
+    return per_kind, found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Title search latency")
+    parser.add_argument("db_path", nargs="?", default=str(PROJECT_DIR / "defaults" / "gfn_games.json"))
+    parser.add_argument("--titles", type=int, default=4000, help="minimum number of titles to index")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=gfn.SEARCH_DEFAULT_LIMIT)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    games, real = build_games(args.db_path, args.titles, rng)
+    index = gfn.GameIndex.from_games(games)
+
+    start = time.perf_counter()
+    search_index = gfn.GameSearchIndex(index)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    tracemalloc.start()
+    measured = gfn.GameSearchIndex(index)
+    gc.collect()  # also empties the free lists still holding build temporaries
+    index_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del measured
+
+    titles = [name for _, name in index.named()]
+    normalized = [gfn.normalize_title(name) for name in titles]
+    queries = make_queries(titles, args.queries, rng)
+
+    print(f"Database: {args.db_path} ({len(index)} games, {real} with real names, "
+          f"{len(search_index)} titles indexed)")
+    print(f"Index build: {build_ms:.1f} ms, {index_bytes / 1024:.0f} KB")
+    print("=" * 86)
+    print(f"{'query':10} {'count':>6} {'index p50 ms':>13} {'p95 ms':>8} {'max ms':>8} {'found':>6} "
+          f"{'scan p50 ms':>12} {'found':>6}")
+
+    indexed, indexed_found = time_queries(lambda query: search_index.search(query, args.limit), queries)
+    scanned, scanned_found = time_queries(lambda query: linear_search(normalized, query, args.limit), queries)
+    for kind in ("prefix", "title", "reordered", "typo", "miss"):
+        times = sorted(indexed.get(kind, []))
+        if not times:
+            continue
+        p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+        print(f"{kind:10} {len(times):6} {statistics.median(times):13.3f} {p95:8.3f} {times[-1]:8.3f} "
+              f"{indexed_found[kind] / len(times):6.0%} {statistics.median(scanned[kind]):12.3f} "
+              f"{scanned_found[kind] / len(times):6.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
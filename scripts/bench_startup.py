@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Plugin cold-start time.
+
+Each measurement runs in a fresh interpreter, like Decky loading the
+plugin: time to import main.py, time until `_main()` returns, and time from
+the start of the import until the first game-page badge can be drawn.
+Measured for the deferred startup (background database load) and the
+eager one, with and without a binary snapshot next to the JSON.
+
+Two ways to the first badge are compared:
+    lookup    the game page asks `check_gfn_availability` (before)
+    prefetch  the frontend sends its library to `prefetch_library` at load
+              and draws the badge from the answer (after)
+The mean time per `check_gfn_availability` over the library's games is
+reported as well; after a prefetch those are pinned, in-memory answers.
+The frontend logs the real number on the Deck ("GFN: first badge ... ms").
+
+Usage:
+    python3 scripts/bench_startup.py [--runs 5] [--library 1000] [path/to/gfn_games.json]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+# Runs inside the fresh interpreter; prints one JSON line
+WORKER = r"""
+import time
+start = time.perf_counter()
+import asyncio, json, sys
+sys.path.insert(0, sys.argv[1])
+sys.path.insert(0, sys.argv[1] + "/py_modules")
+import main as gfn
+imported = time.perf_counter()
+http_stack_loaded = "certifi" in sys.modules
+
+gfn.REFRESH_INTERVAL = 10 ** 9  # keep the scheduler from refreshing mid-measurement
+prefetch = sys.argv[2] == "prefetch"
+with open(sys.argv[3], 'r') as f:
+    library = json.load(f)
+appid = str(library[0])
+
+async def run():
+    plugin = gfn.Plugin()
+    await plugin._main()
+    main_returned = time.perf_counter()
+    if prefetch:
+        answer = await plugin.prefetch_library(library)
+        available = library[0] in answer["available"]
+    else:
+        available = (await plugin.check_gfn_availability(appid))["available"]
+    badge = time.perf_counter()
+    for other in library:
+        await plugin.check_gfn_availability(str(other))
+    looked_up = time.perf_counter()
+    await plugin._unload()
+    return main_returned, badge, (looked_up - badge) / len(library), available
+
+main_returned, badge, lookup, available = asyncio.run(run())
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "main_ms": (main_returned - imported) * 1000,
+    "first_badge_ms": (badge - start) * 1000,
+    "lookup_us": lookup * 1e6,
+    "available": available,
+    "http_stack_loaded": http_stack_loaded,
+}))
+"""
+
+
+def make_library(games, size):
+    """App IDs shaped like a library: some on GFN, most not"""
+    appids = [int(appid) for appid in games][:size // 3]
+    appids += range(2_000_000_000, 2_000_000_000 + size - len(appids))
+    return appids
+
+
+def measure(plugin_dir, library_path, deferred, mode):
+    env = dict(os.environ, DECKY_PLUGIN_DIR=str(plugin_dir), GFN_DEFERRED_STARTUP="1" if deferred else "0")
+    output = subprocess.run(
+        [sys.executable, "-c", WORKER, str(PROJECT_DIR), mode, str(library_path)],
+        env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plugin cold-start time")
+    parser.add_argument("db_path", nargs="?", default=str(PROJECT_DIR / "defaults" / "gfn_games.json"))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--library", type=int, default=1000, help="app IDs in the simulated library")
+    args = parser.parse_args()
+
+    with open(args.db_path, 'r') as f:
+        library = make_library(json.load(f)["games"], args.library)
+
+    print(f"Database: {args.db_path}, library of {len(library)} games, median of {args.runs} runs")
+    print("=" * 86)
+    print(f"{'startup':10} {'database':10} {'badge via':10} {'import ms':>10} {'_main ms':>10} "
+          f"{'first badge ms':>15} {'lookup µs':>10} {'certifi':>9}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        plugin_dir = Path(tmp)
+        defaults = plugin_dir / "defaults"
+        defaults.mkdir()
+        library_path = plugin_dir / "library.json"
+        library_path.write_text(json.dumps(library))
+
+        for database in ("json", "snapshot"):
+            for deferred in (False, True):
+                for mode in ("lookup", "prefetch"):
+                    runs = []
+                    for _ in range(args.runs):
+                        # "json": only the JSON file exists, as on a fresh install;
+                        # "snapshot": the first run's import left gfn_games.bin behind
+                        if database == "json":
+                            for leftover in defaults.iterdir():
+                                leftover.unlink()
+                            shutil.copy(args.db_path, defaults / "gfn_games.json")
+                        runs.append(measure(plugin_dir, library_path, deferred, mode))
+
+                    median = {key: statistics.median(run[key] for run in runs)
+                              for key in ("import_ms", "main_ms", "first_badge_ms", "lookup_us")}
+                    loaded = "loaded" if any(run["http_stack_loaded"] for run in runs) else "deferred"
+                    print(f"{'deferred' if deferred else 'eager':10} {database:10} {mode:10} "
+                          f"{median['import_ms']:10.1f} {median['main_ms']:10.1f} {median['first_badge_ms']:15.1f} "
+                          f"{median['lookup_us']:10.2f} {loaded:>9}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -1,5 +1,9 @@
 #!/bin/bash
 # Bundle Python dependencies with the plugin
+#
+# Usage: bash scripts/bundle-python-deps.sh [--slim]
+#   --slim  keep only the modules the plugin imports and precompile them
+#           (scripts/slim_py_modules.py)
 
 echo "Bundling Python dependencies..."
 
@@ -8,8 +12,16 @@ DEPS_DIR="py_modules"
 rm -rf "$DEPS_DIR"
 mkdir -p "$DEPS_DIR"
 
-# Install requests and its dependencies to the py_modules directory
-pip3 install --target="$DEPS_DIR" requests
+# The plugin's HTTP client is built on asyncio; all it needs vendored is
+# certifi's CA bundle
+pip3 install --target="$DEPS_DIR" certifi
+
+if [ "$1" = "--slim" ]; then
+    # Use the Deck's Python version for the .pyc files when it is available
+    PYTHON=python3
+    command -v python3.11 > /dev/null && PYTHON=python3.11
+    "$PYTHON" scripts/slim_py_modules.py --modules "$DEPS_DIR" --python "$PYTHON" || exit 1
+fi
 
 echo "✅ Python dependencies bundled in $DEPS_DIR/"
 echo "These will be included when you deploy the plugin."
@@ -30,6 +30,15 @@ cp main.py "$PACKAGE_DIR/"
 cp -r defaults "$PACKAGE_DIR/"
 cp -r py_modules "$PACKAGE_DIR/"
 
+# Ship only the vendored modules the plugin imports, and bytecode for them
+# and main.py: the installed plugin directory is root-owned, so Python
+# cannot cache what it compiles and would recompile on every start
+echo "Slimming Python dependencies..."
+PYTHON=python3
+command -v python3.11 > /dev/null && PYTHON=python3.11
+"$PYTHON" scripts/slim_py_modules.py --modules "$PACKAGE_DIR/py_modules" --python "$PYTHON" || exit 1
+"$PYTHON" -m compileall -q --invalidation-mode checked-hash "$PACKAGE_DIR/main.py"
+
 # Create installation instructions
 cat > "$PACKAGE_DIR/INSTALL.txt" << 'EOF'
 GFN for Deck - Manual Installation Instructions
@@ -48,7 +57,7 @@ GFN for Deck - Manual Installation Instructions
    mkdir -p ~/homebrew/plugins/gfn-for-deck
 
    # Copy files
-   sudo cp -r dist plugin.json main.py defaults py_modules ~/homebrew/plugins/gfn-for-deck/
+   sudo cp -r dist plugin.json main.py __pycache__ defaults py_modules ~/homebrew/plugins/gfn-for-deck/
 
 4. Switch back to Gaming Mode
 
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Slim the vendored py_modules down to what the plugin imports.
+
+`pip install --target py_modules` brings whole distributions: console
+scripts, dist-info and, in an older py_modules that still vendors requests,
+urllib3's emscripten backend and http2 shims, the charset_normalizer CLI
+and idna's 8,800-line uts46data table. This script traces which vendored
+modules the plugin actually loads: a fresh interpreter runs the Plugin
+lifecycle (startup, lookups, search, a full and an incremental refresh
+with 200/304 responses against a local stand-in server, export, unload).
+The plugin refreshes through AsyncHTTPClient, so that is just certifi. The
+directory is then rebuilt with only the traced modules plus their
+packages' data files (e.g. certifi's cacert.pem) and precompiled to .pyc.
+
+The .pyc files are checked-hash: they stay valid after copying to the Deck
+(where mtimes change) and are ignored if the source is edited. The plugin
+directory is usually root-owned, so without them every cold start compiles
+main.py and the vendored modules again; scripts/package-for-deck.sh
+precompiles main.py the same way. .pyc files are only used by the
+interpreter version that compiled them; pass --python to compile with the
+Deck's (Decky Loader runs Python DECK_PYTHON).
+
+Prints an import-time report for the full and the slim bundle, with and
+without .pyc: `import main` and loading the refresh's HTTP stack, each in
+a fresh interpreter that cannot write bytecode.
+
+Usage:
+    python3 scripts/slim_py_modules.py [--modules py_modules] [--python python3.11]
+                                       [--runs 5] [--dry-run]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+DECK_PYTHON = "3.11"
+
+# Never part of the slim bundle, whatever the trace says
+EXCLUDED_DIRS = {"bin", "__pycache__", "tests"}
+
+# Runs in a fresh interpreter; prints the vendored files that were imported
+TRACE = r"""
+import asyncio, gzip, json, os, shutil, sys, tempfile, threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+project, modules = sys.argv[1], sys.argv[2]
+sys.path[:0] = [project, modules]
+import main
+
+PAGE = json.dumps({"success": 1, "total_count": 2, "start": 0, "results_html":
+    '<div data-ds-appid="10"><img alt="A"></div><div data-ds-appid="20"><img alt="B"></div>'}).encode()
+NVIDIA = json.dumps([{"title": "C", "steamUrl": "https://store.steampowered.com/app/30"}]).encode()
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if "missing" in self.path:
+            return self.send(404, b"not found", {})
+        if self.headers.get("If-None-Match") == '"v1"':
+            return self.send(304, b"", {"ETag": '"v1"'})
+        body = NVIDIA if self.path.endswith("gfnpc.json") else PAGE
+        headers = {"ETag": '"v1"', "Content-Type": "application/json"}
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body, headers["Content-Encoding"] = gzip.compress(body), "gzip"
+        self.send(200, body, headers)
+
+    def send(self, status, body, headers):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+base = f"http://127.0.0.1:{server.server_address[1]}"
+main.STEAM_STORE_URL = base
+main.NVIDIA_GAME_LIST_URL = base + "/gfnpc.json"
+main.REFRESH_INTERVAL = 10 ** 9
+
+async def run_plugin(plugin_dir):
+    os.environ["DECKY_PLUGIN_DIR"] = str(plugin_dir)
+    os.environ["DECKY_PLUGIN_SETTINGS_DIR"] = str(plugin_dir)
+    plugin = main.Plugin()
+    await plugin._main()
+    await plugin.check_gfn_availability("10")
+    await plugin.check_gfn_availability_batch(["10", "20"])
+    await plugin.refresh_database(incremental=False)
+    await plugin.refresh_database()
+    await plugin.search_games("a")
+    await plugin.save_settings({"logoSize": 48})
+    await plugin.export_database()
+    await plugin._unload()
+    main._ssl_context()  # https sources
+
+with tempfile.TemporaryDirectory() as tmp:
+    plugin_dir = Path(tmp)
+    (plugin_dir / "defaults").mkdir()
+    shutil.copy(Path(project) / "defaults" / "gfn_games.json", plugin_dir / "defaults")
+    asyncio.run(run_plugin(plugin_dir))
+
+root = Path(modules).resolve()
+files = set()
+for module in list(sys.modules.values()):
+    path = getattr(module, "__file__", None)
+    if path and Path(path).resolve().is_relative_to(root):
+        files.add(str(Path(path).resolve().relative_to(root)))
+print(json.dumps(sorted(files)))
+"""
+
+# Cold-start cost in a fresh interpreter: `import main`, then loading the
+# refresh's HTTP stack
+IMPORT_TIMER = r"""
+import sys, time
+plugin_dir = sys.argv[1]
+sys.path[:0] = [plugin_dir, plugin_dir + "/py_modules"]
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+main._ssl_context()
+loaded = time.perf_counter()
+print((imported - start) * 1000, (loaded - imported) * 1000)
+"""
+
+
+def trace_imports(python, modules_dir):
+    output = subprocess.run(
+        [python, "-c", TRACE, str(PROJECT_DIR), str(modules_dir)],
+        check=True, capture_output=True, text=True,
+        env=dict(os.environ, PYTHONDONTWRITEBYTECODE="1"),
+    ).stdout
+    return set(json.loads(output.strip().splitlines()[-1]))
+
+
+def copy_slim(source, target, used):
+    """
+    Copy the traced modules, the data files of their packages and the
+    dist-info (licenses) of the distributions still present from `source`
+    to `target`
+    """
+    package_dirs = {Path(path).parent for path in used}
+    top_level = {Path(path).parts[0].removesuffix(".py") for path in used}
+    for path in sorted(source.rglob("*")):
+        relative = path.relative_to(source)
+        if path.is_dir() or EXCLUDED_DIRS & set(relative.parts):
+            continue
+        if relative.parts[0].endswith(".dist-info"):
+            keep = relative.parts[0].split("-")[0].lower() in top_level
+        elif path.suffix == ".py":
+            keep = str(relative) in used
+        else:
+            keep = path.suffix not in (".pyc", ".pyo") and relative.parent in package_dirs
+        if keep:
+            (target / relative).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(path, target / relative)
+
+
+def strip_bytecode(directory):
+    for cache in list(directory.rglob("__pycache__")):
+        shutil.rmtree(cache)
+
+
+def compile_bytecode(python, directory):
+    subprocess.run(
+        [python, "-m", "compileall", "-q", "--invalidation-mode", "checked-hash", str(directory)],
+        check=True,
+    )
+
+
+def tree_size(directory):
+    files = [path for path in directory.rglob("*") if path.is_file()]
+    return len(files), sum(path.stat().st_size for path in files)
+
+
+def time_import(python, plugin_dir, runs):
+    """Median ms for `import main` and for loading the HTTP stack afterwards"""
+    imports, stacks = [], []
+    for _ in range(runs):
+        output = subprocess.run(
+            [python, "-c", IMPORT_TIMER, str(plugin_dir.resolve())],
+            check=True, capture_output=True, text=True,
+            # Like a root-owned plugin directory: nothing gets cached between runs
+            env=dict(os.environ, PYTHONDONTWRITEBYTECODE="1"),
+        ).stdout.split()
+        imports.append(float(output[0]))
+        stacks.append(float(output[1]))
+    return statistics.median(imports), statistics.median(stacks)
+
+
+def python_version(python):
+    return subprocess.run(
+        [python, "-c", "import sys; print(f'{sys.version_info[0]}.{sys.version_info[1]}')"],
+        check=True, capture_output=True, text=True,
+    ).stdout.strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Slim and precompile the vendored py_modules")
+    parser.add_argument("--modules", default=str(PROJECT_DIR / "py_modules"), help="directory to slim in place")
+    parser.add_argument("--python", default=sys.executable, help="interpreter to trace and compile with")
+    parser.add_argument("--runs", type=int, default=5, help="fresh-interpreter runs per import timing")
+    parser.add_argument("--dry-run", action="store_true", help="report only, leave the directory as it is")
+    args = parser.parse_args()
+
+    modules_dir = Path(args.modules)
+    version = python_version(args.python)
+    if version != DECK_PYTHON:
+        print(f"⚠ Compiling with Python {version}; Decky Loader runs {DECK_PYTHON}, "
+              f"so the Deck will ignore these .pyc files (use --python python{DECK_PYTHON})")
+
+    used = trace_imports(args.python, modules_dir)
+    print(f"Traced {len(used)} vendored modules in use: "
+          f"{', '.join(sorted({path.split('/')[0].removesuffix('.py') for path in used}))}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # A plugin directory per bundle: main.py next to py_modules
+        bundles = {}
+        for name in ("full", "slim"):
+            plugin_dir = bundles[name] = Path(tmp) / name
+            plugin_dir.mkdir()
+            shutil.copy(PROJECT_DIR / "main.py", plugin_dir)
+        shutil.copytree(modules_dir, bundles["full"] / "py_modules")
+        strip_bytecode(bundles["full"] / "py_modules")
+        (bundles["slim"] / "py_modules").mkdir()
+        copy_slim(bundles["full"] / "py_modules", bundles["slim"] / "py_modules", used)
+
+        # The slim bundle must still serve every traced path
+        missing = used - trace_imports(args.python, bundles["slim"] / "py_modules")
+        if missing:
+            print(f"❌ Slim bundle lost modules the plugin imports: {sorted(missing)}")
+            return 1
+
+        rows = []
+        for name, plugin_dir in bundles.items():
+            files, size = tree_size(plugin_dir / "py_modules")
+            cold = time_import(args.python, plugin_dir, args.runs)
+            compile_bytecode(args.python, plugin_dir)
+            warm = time_import(args.python, plugin_dir, args.runs)
+            rows.append((name, files, size, cold, warm))
+
+        print()
+        print(f"Cold start, median of {args.runs} fresh interpreters that cannot write bytecode")
+        print("=" * 78)
+        print(f"{'bundle':8} {'files':>6} {'size KB':>8} {'.pyc':>5} {'import main ms':>15} {'HTTP stack ms':>14} "
+              f"{'total ms':>9}")
+        for name, files, size, cold, warm in rows:
+            for compiled, (import_ms, stack_ms) in (("no", cold), ("yes", warm)):
+                print(f"{name:8} {files:6} {size / 1024:8.0f} {compiled:>5} {import_ms:15.1f} {stack_ms:14.1f} "
+                      f"{import_ms + stack_ms:9.1f}")
+
+        if args.dry_run:
+            return 0
+        shutil.rmtree(modules_dir)
+        shutil.copytree(bundles["slim"] / "py_modules", modules_dir)
+
+    print(f"\n✅ {modules_dir} slimmed to {len(used)} modules and precompiled for Python {version}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
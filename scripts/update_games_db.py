@@ -2,111 +2,53 @@
 """
 Script to update the GFN games database from online sources.
 
-This script fetches the current list of GeForce NOW supported games
-and updates the local database file.
+This script fetches the current list of GeForce NOW supported games from
+every source the plugin knows (NVIDIA's public list and the Steam curators),
+merges them and updates the local database file.
 """
 
+import asyncio
 import json
-import requests
+import sys
 from datetime import datetime
 from pathlib import Path
 
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+sys.path.insert(0, str(PROJECT_DIR / "py_modules"))
 
-def fetch_from_cloudbase():
-    """
-    Fetch games list from Cloudbase.gg
+from main import (  # noqa: E402
+    CuratorSyncState, GameIndex, HTTPValidatorCache, default_sources, fetch_catalog,
+)
 
-    Note: This is a placeholder - adjust based on actual API structure
-    """
-    print("Fetching from Cloudbase.gg...")
-
-    try:
-        # Example endpoint - adjust based on actual API
-        response = requests.get(
-            "https://static.nvidiagrid.net/supported-public-game-list/gfnpc.json",
-            timeout=30
-        )
-
-        if response.status_code == 200:
-            data = response.json()
-            games = {}
-
-            # Parse the response - adjust based on actual structure
-            # NVIDIA's actual list format may vary
-            for item in data:
-                steam_app_id = item.get("steamAppId") or item.get("id")
-                if steam_app_id:
-                    games[str(steam_app_id)] = {
-                        "name": item.get("title", "Unknown"),
-                        "available": True
-                    }
-
-            print(f"Found {len(games)} games from Cloudbase")
-            return games
-        else:
-            print(f"Failed to fetch: HTTP {response.status_code}")
-            return None
-
-    except Exception as e:
-        print(f"Error fetching from Cloudbase: {e}")
-        return None
+# Validators and bodies from previous runs; a 304 skips download and parsing
+HTTP_CACHE_DIR = PROJECT_DIR / ".cache" / "http"
 
+# Curator page fingerprints from the previous run, for incremental syncs
+SYNC_STATE_PATH = PROJECT_DIR / ".cache" / "gfn_sync_state.json"
 
-def fetch_from_nvidia():
-    """
-    Fetch games list directly from NVIDIA's public list
-    """
-    print("Fetching from NVIDIA...")
 
+def load_previous(output_path):
+    """Index of the current database file, used to carry over failed sources"""
     try:
-        # NVIDIA maintains a public JSON list
-        response = requests.get(
-            "https://static.nvidiagrid.net/supported-public-game-list/gfnpc.json",
-            timeout=30
-        )
-
-        if response.status_code == 200:
-            data = response.json()
-            games = {}
-
-            # Parse NVIDIA's format
-            for item in data:
-                # Look for Steam app ID in various fields
-                steam_id = None
-
-                if "steamAppId" in item:
-                    steam_id = str(item["steamAppId"])
-                elif "id" in item and "steam" in item.get("store", "").lower():
-                    steam_id = str(item["id"])
-
-                if steam_id and steam_id != "0":
-                    games[steam_id] = {
-                        "name": item.get("title", "Unknown Game"),
-                        "available": True
-                    }
-
-            print(f"Found {len(games)} games from NVIDIA")
-            return games
-        else:
-            print(f"Failed to fetch: HTTP {response.status_code}")
-            return None
-
-    except Exception as e:
-        print(f"Error fetching from NVIDIA: {e}")
+        with open(output_path, 'r') as f:
+            return GameIndex.from_games(json.load(f).get("games", {}))
+    except (OSError, ValueError):
         return None
 
 
-def update_database(games_dict, output_path):
+def update_database(games_dict, sources, output_path):
     """Update the local games database file"""
 
     database = {
         "comment": "Auto-generated list of GFN-supported games. Do not edit manually - run update script instead.",
         "last_updated": datetime.now().strftime("%Y-%m-%d"),
+        "sources": [source.describe() for source in sources],
         "games": games_dict,
         "notes": [
             "This file serves as a fallback when external APIs are unavailable",
             "Updated by scripts/update_games_db.py",
-            "Format: Steam AppID as key, with name and availability status"
+            "Format: Steam AppID as key, with name, availability status and the IDs of the sources listing it"
         ]
     }
 
@@ -117,19 +59,50 @@ def update_database(games_dict, output_path):
     print(f"✓ Total games: {len(games_dict)}")
 
 
+def print_source_reports(reports):
+    for report in reports:
+        carried = f", kept {report['carried_over']} games from the last run" if report.get("carried_over") else ""
+        if report["status"] == "ok":
+            unchanged = " (not modified)" if report.get("not_modified") else ""
+            print(f"  {report['name']}: {report['count']} games in {report['duration_s']:.1f}s{unchanged}")
+        elif report["status"] == "partial":
+            print(f"  {report['name']}: partial - {report['count']} games, "
+                  f"{report['missing_pages']} pages missing{carried}")
+        else:
+            print(f"  {report['name']}: {report['status']} - {report['error']}{carried}")
+
+
+def print_cache_stats(http_cache):
+    stats = http_cache.stats()
+    print(f"HTTP cache: {stats['hits']} hits, {stats['misses']} misses, "
+          f"{stats['bytes_saved'] / 1024:.0f} KB saved")
+
+
 def main():
     print("GFN Games Database Updater")
     print("=" * 50)
 
-    # Try NVIDIA first (most reliable)
-    games = fetch_from_nvidia()
-
-    # Fallback to other sources if needed
-    if not games or len(games) < 100:
-        print("\nTrying alternative sources...")
-        games = fetch_from_cloudbase()
-
-    if not games:
+    # Determine output path
+    output_path = PROJECT_DIR / "defaults" / "gfn_games.json"
+
+    http_cache = HTTPValidatorCache(HTTP_CACHE_DIR)
+    previous = load_previous(output_path)
+    # Incremental curator syncs are only valid against the file they produced
+    sync_state = CuratorSyncState.load(SYNC_STATE_PATH) if previous is not None else CuratorSyncState()
+
+    # Fetch every source concurrently; a failing one does not block the rest
+    sources = default_sources()
+    print(f"Fetching from {len(sources)} sources...")
+    games, reports = asyncio.run(fetch_catalog(sources, sync_state=sync_state, previous=previous,
+                                               cache=http_cache))
+    print_source_reports(reports)
+    print_cache_stats(http_cache)
+
+    if previous is not None and all(report.get("not_modified") for report in reports):
+        print("\n✓ Database already up to date")
+        return 0
+
+    if not any(report["status"] in ("ok", "partial") for report in reports) or not games:
         print("\n✗ Failed to fetch games from any source")
         print("\nManual alternatives:")
         print("1. Visit: https://www.nvidia.com/en-us/geforce-now/games/")
@@ -137,15 +110,15 @@ def main():
         print("3. Manually populate defaults/gfn_games.json")
         return 1
 
-    # Determine output path
-    script_dir = Path(__file__).parent
-    project_root = script_dir.parent
-    output_path = project_root / "defaults" / "gfn_games.json"
-
     # Update the database
-    update_database(games, output_path)
-
-    print("\n✓ Update complete!")
+    update_database(games, sources, output_path)
+    SYNC_STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    sync_state.save(SYNC_STATE_PATH)
+
+    if any(report["status"] != "ok" for report in reports):
+        print("\n⚠ Update complete, but some sources were kept from the last run; run again to retry them")
+    else:
+        print("\n✓ Update complete!")
     return 0
 
 
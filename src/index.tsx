@@ -2,8 +2,21 @@ import { ServerAPI, staticClasses } from 'decky-frontend-lib';
 import React, { VFC, useState, useEffect, useRef } from 'react';
 import { FaCloud } from 'react-icons/fa';
 import { SettingsPanel } from './components/SettingsPanel';
-import { GFNSettings, DEFAULT_SETTINGS } from './types';
-import { patchGamePage } from './patches/GamePagePatch';
+import {
+  GFNSettings,
+  GFNChanges,
+  GFNLibraryCoverage,
+  GFNLibraryPrefetch,
+  GFNSearchResults,
+  GFNDbInfo,
+  GFNCacheStats,
+  GFNEvent,
+  GFNEventBatch,
+  GFNRefreshProgress,
+  GFNRefreshResult,
+  DEFAULT_SETTINGS,
+} from './types';
+import { patchGamePage, setPrefetchedLibrary } from './patches/GamePagePatch';
 
 // Global settings that can be updated and read by both the content panel and game page patch
 class SettingsManager {
@@ -31,30 +44,175 @@ function getLibraryAppIds(): string[] {
   }
 }
 
+// Library app IDs as numbers, without anything that is not a valid app ID
+function getLibraryAppIdSet(): Set<number> {
+  return new Set(
+    getLibraryAppIds()
+      .map(Number)
+      .filter((appid) => Number.isInteger(appid) && appid > 0 && appid <= 0xffffffff)
+  );
+}
+
+// Order-independent fingerprint of a set of app IDs; must match
+// library_fingerprint() in main.py
+function libraryFingerprint(appids: Iterable<number>): string {
+  let count = 0;
+  let sum = 0;
+  let mix = 0;
+  for (const appid of appids) {
+    count++;
+    sum = (sum + appid) >>> 0;
+    mix = (mix ^ Math.imul(appid, 0x9e3779b1)) >>> 0;
+  }
+  return `${count}-${sum.toString(16)}-${mix.toString(16)}`;
+}
+
+// Library last synced with the plugin; survives the panel being closed
+let syncedLibrary: { fingerprint: string; appids: Set<number> } | null = null;
+
+// Library coverage from the plugin, sending the whole library only when it
+// does not already know it and a delta when it knows an earlier version
+async function loadLibraryCoverage(serverAPI: ServerAPI): Promise<GFNLibraryCoverage | null> {
+  const appids = getLibraryAppIdSet();
+  if (appids.size === 0) return null;
+
+  const fingerprint = libraryFingerprint(appids);
+  let args: Record<string, unknown> = { fingerprint };
+  if (syncedLibrary && syncedLibrary.fingerprint !== fingerprint) {
+    const previous = syncedLibrary.appids;
+    args = {
+      fingerprint,
+      base_fingerprint: syncedLibrary.fingerprint,
+      added: Array.from(appids).filter((appid) => !previous.has(appid)),
+      removed: Array.from(previous).filter((appid) => !appids.has(appid)),
+    };
+  }
+
+  let result = await serverAPI.callPluginMethod<typeof args, GFNLibraryCoverage>('get_library_coverage', args);
+  if (result.success && result.result.status === 'resync') {
+    result = await serverAPI.callPluginMethod<{ appids: number[] }, GFNLibraryCoverage>(
+      'get_library_coverage',
+      { appids: Array.from(appids) }
+    );
+  }
+  if (!result.success || result.result.status !== 'success') return null;
+
+  syncedLibrary = { fingerprint: result.result.fingerprint, appids };
+  return result.result;
+}
+
+// Steam fills the library collection shortly after the plugin loads
+const PREFETCH_ATTEMPTS = 20;
+const PREFETCH_RETRY_MS = 500;
+
+// Database generation the prefetched answers belong to
+let prefetchedGeneration: number | null = null;
+
+// Resolve the whole library once at load so game pages get their badge
+// without a lookup round trip
+async function prefetchLibrary(serverAPI: ServerAPI): Promise<void> {
+  let appids = getLibraryAppIdSet();
+  for (let attempt = 1; appids.size === 0 && attempt < PREFETCH_ATTEMPTS; attempt++) {
+    await new Promise((resolve) => setTimeout(resolve, PREFETCH_RETRY_MS));
+    appids = getLibraryAppIdSet();
+  }
+  if (appids.size === 0) return;
+
+  const result = await serverAPI.callPluginMethod<{ appids: number[] }, GFNLibraryPrefetch>(
+    'prefetch_library',
+    { appids: Array.from(appids) }
+  );
+  if (!result.success || result.result.status !== 'success') return;
+
+  setPrefetchedLibrary(appids, result.result.available);
+  prefetchedGeneration = result.result.generation;
+  // The plugin now knows this library, so the panel's coverage needs no resync
+  syncedLibrary = { fingerprint: result.result.fingerprint, appids };
+}
+
+// Latest plugin state pushed through events; the panel starts from it
+// instead of asking again every time it opens
+const pluginState: {
+  dbInfo: GFNDbInfo | null;
+  cacheStats: GFNCacheStats | null;
+  libraryStats: { total: number; available: number } | null;
+  refreshing: boolean;
+  refreshProgress: GFNRefreshProgress | null;
+} = { dbInfo: null, cacheStats: null, libraryStats: null, refreshing: false, refreshProgress: null };
+
+const eventListeners = new Set<(event: GFNEvent) => void>();
+
+function onPluginEvent(listener: (event: GFNEvent) => void): () => void {
+  eventListeners.add(listener);
+  return () => {
+    eventListeners.delete(listener);
+  };
+}
+
+function handlePluginEvent(serverAPI: ServerAPI, event: GFNEvent): void {
+  switch (event.type) {
+    case 'database': {
+      pluginState.dbInfo = event.data;
+      const library = event.data.library;
+      pluginState.libraryStats =
+        library && syncedLibrary?.fingerprint === library.fingerprint
+          ? { total: library.total, available: library.available_count }
+          : null;
+      // Refreshed: resolve the library again so prefetched badges stay current
+      if (prefetchedGeneration !== null && event.data.generation !== prefetchedGeneration) {
+        prefetchLibrary(serverAPI).catch((error) => console.error('GFN: Error prefetching library:', error));
+      }
+      break;
+    }
+    case 'cache_stats':
+      pluginState.cacheStats = event.data;
+      break;
+    case 'refresh':
+      pluginState.refreshing = event.data.state === 'running';
+      pluginState.refreshProgress = null;
+      break;
+    case 'refresh_progress':
+      pluginState.refreshProgress = event.data;
+      break;
+  }
+  eventListeners.forEach((listener) => listener(event));
+}
+
+const EVENT_RETRY_MS = 5000;
+
+// Keep one wait_for_events call outstanding for as long as the plugin is
+// loaded; the first call (and one after missed events) returns the latest
+// event of each type
+async function subscribeToEvents(serverAPI: ServerAPI, isActive: () => boolean): Promise<void> {
+  let cursor: number | null = null;
+  while (isActive()) {
+    try {
+      const result = await serverAPI.callPluginMethod<{ after?: number }, GFNEventBatch>(
+        'wait_for_events',
+        cursor === null ? {} : { after: cursor }
+      );
+      if (!result.success) throw new Error(String(result.result));
+      cursor = result.result.reset ? null : result.result.cursor;
+      result.result.events.forEach((event) => handlePluginEvent(serverAPI, event));
+    } catch (error) {
+      console.error('GFN: Error waiting for events:', error);
+      await new Promise((resolve) => setTimeout(resolve, EVENT_RETRY_MS));
+    }
+  }
+}
+
 const Content: VFC<{ serverAPI: ServerAPI }> = ({ serverAPI }) => {
   const [settings, setSettings] = useState<GFNSettings>(settingsManager.getSettings());
-  const [cacheStats, setCacheStats] = useState<{
-    total: number;
-    expired: number;
-    fresh: number;
-  } | null>(null);
-  const [dbInfo, setDbInfo] = useState<{
-    db_size: number;
-    plugin_dir: string | null;
-    last_updated: string | null;
-  } | null>(null);
+  const [cacheStats, setCacheStats] = useState<GFNCacheStats | null>(pluginState.cacheStats);
+  const [dbInfo, setDbInfo] = useState<GFNDbInfo | null>(pluginState.dbInfo);
+  const [weeklyChanges, setWeeklyChanges] = useState<GFNChanges | null>(null);
   const [libraryStats, setLibraryStats] = useState<{
     total: number;
     available: number;
-  } | null>(null);
-  const [refreshing, setRefreshing] = useState(false);
-  const [refreshResult, setRefreshResult] = useState<{
-    status: string;
-    old_count?: number;
-    new_count?: number;
-    added?: number;
-    message?: string;
-  } | null>(null);
+  } | null>(pluginState.libraryStats);
+  const [refreshing, setRefreshing] = useState(pluginState.refreshing);
+  const [refreshProgress, setRefreshProgress] = useState<GFNRefreshProgress | null>(pluginState.refreshProgress);
+  const [refreshResult, setRefreshResult] = useState<GFNRefreshResult | null>(null);
   const [showDebug, setShowDebug] = useState(false);
 
   // Quick lookup state
@@ -64,8 +222,10 @@ const Content: VFC<{ serverAPI: ServerAPI }> = ({ serverAPI }) => {
     available: boolean;
     appid: string;
   } | null>(null);
+  const [searchResults, setSearchResults] = useState<GFNSearchResults['results'] | null>(null);
 
   const saveDebounceRef = useRef<ReturnType<typeof setTimeout> | null>(null);
+  const searchDebounceRef = useRef<ReturnType<typeof setTimeout> | null>(null);
 
   // Load settings, cache stats, and library stats on mount
   useEffect(() => {
@@ -83,12 +243,10 @@ const Content: VFC<{ serverAPI: ServerAPI }> = ({ serverAPI }) => {
       }
     };
 
+    // Hit counts change with every lookup, so these are not pushed
     const loadCacheStats = async () => {
       try {
-        const result = await serverAPI.callPluginMethod<
-          {},
-          { total: number; expired: number; fresh: number }
-        >('get_cache_stats', {});
+        const result = await serverAPI.callPluginMethod<{}, GFNCacheStats>('get_cache_stats', {});
         if (result.success && result.result) {
           setCacheStats(result.result);
         }
@@ -99,14 +257,10 @@ const Content: VFC<{ serverAPI: ServerAPI }> = ({ serverAPI }) => {
 
     const loadLibraryStats = async () => {
       try {
-        const appids = getLibraryAppIds();
-        if (appids.length === 0) return;
-        const result = await serverAPI.callPluginMethod<
-          { appids: string[] },
-          { total: number; available: number }
-        >('get_library_stats', { appids });
-        if (result.success && result.result) {
-          setLibraryStats(result.result);
+        const coverage = await loadLibraryCoverage(serverAPI);
+        if (coverage) {
+          pluginState.libraryStats = { total: coverage.total ?? 0, available: coverage.available_count ?? 0 };
+          setLibraryStats(pluginState.libraryStats);
         }
       } catch (error) {
         console.error('Error loading library stats:', error);
@@ -115,10 +269,41 @@ const Content: VFC<{ serverAPI: ServerAPI }> = ({ serverAPI }) => {
 
     loadSettings();
     loadCacheStats();
+    // Always check: games may have been installed or removed since the panel
+    // was last open. The last stats show meanwhile, and the plugin answers
+    // from memory when the fingerprint still matches
     loadLibraryStats();
 
+    // Database, refresh and cache changes arrive as events, including
+    // refreshes started in the background
+    const unsubscribe = onPluginEvent((event) => {
+      switch (event.type) {
+        case 'database':
+          setDbInfo(event.data);
+          if (pluginState.libraryStats) {
+            setLibraryStats(pluginState.libraryStats);
+          } else {
+            loadLibraryStats();
+          }
+          break;
+        case 'cache_stats':
+          setCacheStats(event.data);
+          break;
+        case 'refresh':
+          setRefreshing(event.data.state === 'running');
+          setRefreshProgress(null);
+          if (event.data.result) setRefreshResult(event.data.result);
+          break;
+        case 'refresh_progress':
+          setRefreshProgress(event.data);
+          break;
+      }
+    });
+
     return () => {
+      unsubscribe();
       if (saveDebounceRef.current) clearTimeout(saveDebounceRef.current);
+      if (searchDebounceRef.current) clearTimeout(searchDebounceRef.current);
     };
   }, []);
 
@@ -159,6 +344,11 @@ const Content: VFC<{ serverAPI: ServerAPI }> = ({ serverAPI }) => {
       if (result.success) {
         setDbInfo(result.result);
       }
+
+      const changesResult = await serverAPI.callPluginMethod<{ days: number }, GFNChanges>('get_changes', { days: 7 });
+      if (changesResult.success && changesResult.result.status === 'success') {
+        setWeeklyChanges(changesResult.result);
+      }
     } catch (error) {
       console.error('Error loading DB info:', error);
     }
@@ -169,21 +359,10 @@ const Content: VFC<{ serverAPI: ServerAPI }> = ({ serverAPI }) => {
     setRefreshResult(null);
 
     try {
-      const result = await serverAPI.callPluginMethod('refresh_database', {});
+      // Cache stats, db info and library stats follow as events
+      const result = await serverAPI.callPluginMethod<{}, GFNRefreshResult>('refresh_database', {});
       if (result.success) {
         setRefreshResult(result.result);
-        // Reload cache stats, db info, and library stats after refresh
-        const statsResult = await serverAPI.callPluginMethod('get_cache_stats', {});
-        if (statsResult.success) setCacheStats(statsResult.result);
-
-        const dbResult = await serverAPI.callPluginMethod('get_db_info', {});
-        if (dbResult.success) setDbInfo(dbResult.result);
-
-        const appids = getLibraryAppIds();
-        if (appids.length > 0) {
-          const libResult = await serverAPI.callPluginMethod('get_library_stats', { appids });
-          if (libResult.success) setLibraryStats(libResult.result);
-        }
       } else {
         setRefreshResult({ status: 'error', message: 'Failed to refresh database' });
       }
@@ -195,12 +374,46 @@ const Content: VFC<{ serverAPI: ServerAPI }> = ({ serverAPI }) => {
     }
   };
 
+  const handleSearch = async (query: string) => {
+    try {
+      const result = await serverAPI.callPluginMethod<{ query: string; limit: number }, GFNSearchResults>(
+        'search_games',
+        { query, limit: 8 }
+      );
+      if (result.success) {
+        setSearchResults(result.result.results);
+      }
+    } catch (error) {
+      console.error('Error searching games:', error);
+    }
+  };
+
+  const handleLookupInput = (value: string) => {
+    setLookupAppId(value);
+    setLookupResult(null);
+    if (searchDebounceRef.current) clearTimeout(searchDebounceRef.current);
+
+    // Titles are searched as you type; app IDs wait for Check
+    const query = value.trim();
+    if (query.length < 2 || /^\d+$/.test(query)) {
+      setSearchResults(null);
+      return;
+    }
+    searchDebounceRef.current = setTimeout(() => handleSearch(query), 150);
+  };
+
   const handleLookup = async () => {
     const appid = lookupAppId.trim();
     if (!appid) return;
+    if (!/^\d+$/.test(appid)) {
+      if (searchDebounceRef.current) clearTimeout(searchDebounceRef.current);
+      await handleSearch(appid);
+      return;
+    }
 
     setLookupLoading(true);
     setLookupResult(null);
+    setSearchResults(null);
 
     try {
       const result = await serverAPI.callPluginMethod('check_gfn_availability', { appid });
@@ -282,13 +495,10 @@ const Content: VFC<{ serverAPI: ServerAPI }> = ({ serverAPI }) => {
         </div>
         <div style={{ display: 'flex', gap: '8px' }}>
           <input
-            type="number"
-            placeholder="Steam App ID"
+            type="text"
+            placeholder="Game title or Steam App ID"
             value={lookupAppId}
-            onChange={(e) => {
-              setLookupAppId(e.target.value);
-              setLookupResult(null);
-            }}
+            onChange={(e) => handleLookupInput(e.target.value)}
             onKeyDown={(e) => { if (e.key === 'Enter') handleLookup(); }}
             style={{
               flex: 1,
@@ -339,6 +549,30 @@ const Content: VFC<{ serverAPI: ServerAPI }> = ({ serverAPI }) => {
               : `✗ App ${lookupResult.appid} is not on GeForce NOW`}
           </div>
         )}
+
+        {searchResults && (
+          <div style={{ marginTop: '10px', fontSize: '13px' }}>
+            {searchResults.length === 0 ? (
+              <div style={{ color: '#aaa' }}>No GeForce NOW game matches "{lookupAppId.trim()}"</div>
+            ) : (
+              searchResults.map((game) => (
+                <div
+                  key={game.appid}
+                  style={{
+                    display: 'flex',
+                    justifyContent: 'space-between',
+                    gap: '8px',
+                    padding: '6px 0',
+                    borderBottom: '1px solid rgba(255,255,255,0.08)',
+                  }}
+                >
+                  <span style={{ color: '#76b900', fontWeight: 'bold' }}>✓ {game.name ?? `App ${game.appid}`}</span>
+                  <span style={{ color: '#888' }}>{game.appid}</span>
+                </div>
+              ))
+            )}
+          </div>
+        )}
       </div>
 
       {/* Refresh progress / result */}
@@ -354,7 +588,9 @@ const Content: VFC<{ serverAPI: ServerAPI }> = ({ serverAPI }) => {
             Refreshing database from Steam curators...
           </div>
           <div style={{ fontSize: '12px', marginTop: '4px', opacity: 0.7 }}>
-            This may take 30-60 seconds
+            {refreshProgress && refreshProgress.pages_total > 0
+              ? `Fetched ${refreshProgress.pages_done} of ${refreshProgress.pages_total} pages`
+              : 'This may take 30-60 seconds'}
           </div>
         </div>
       )}
@@ -363,18 +599,22 @@ const Content: VFC<{ serverAPI: ServerAPI }> = ({ serverAPI }) => {
         <div style={{
           marginBottom: '20px',
           padding: '16px',
-          backgroundColor: refreshResult.status === 'success'
+          backgroundColor: refreshResult.status !== 'error'
             ? 'rgba(118, 185, 0, 0.1)'
             : 'rgba(255, 0, 0, 0.1)',
           borderRadius: '8px',
-          border: refreshResult.status === 'success'
+          border: refreshResult.status !== 'error'
             ? '1px solid rgba(118, 185, 0, 0.3)'
             : '1px solid rgba(255, 0, 0, 0.3)',
         }}>
-          {refreshResult.status === 'success' ? (
+          {refreshResult.status !== 'error' ? (
             <>
               <div style={{ fontSize: '14px', fontWeight: 'bold', color: '#76b900' }}>
-                ✓ Database Refreshed Successfully!
+                {refreshResult.status === 'partial'
+                  ? '✓ Database Partially Refreshed'
+                  : refreshResult.unchanged
+                    ? '✓ Database Already Up to Date'
+                    : '✓ Database Refreshed Successfully!'}
               </div>
               <div style={{ fontSize: '12px', marginTop: '8px' }}>
                 <div>Previous count: {refreshResult.old_count} games</div>
@@ -386,6 +626,17 @@ const Content: VFC<{ serverAPI: ServerAPI }> = ({ serverAPI }) => {
                     ? 'Database is up to date'
                     : `${Math.abs(refreshResult.added || 0)} games removed`}
                 </div>
+                {refreshResult.status === 'partial' && (
+                  <div style={{ color: '#ffb300', marginTop: '4px' }}>
+                    ⚠ {refreshResult.message} (will be retried automatically)
+                  </div>
+                )}
+                {showDebug && refreshResult.persistence && (
+                  <div style={{ color: '#888', marginTop: '4px' }}>
+                    Saved {(refreshResult.persistence.bytes / 1024).toFixed(0)} KB: serialized in{' '}
+                    {refreshResult.persistence.serialize_ms} ms, written in {refreshResult.persistence.write_ms} ms
+                  </div>
+                )}
               </div>
             </>
           ) : (
@@ -413,6 +664,11 @@ const Content: VFC<{ serverAPI: ServerAPI }> = ({ serverAPI }) => {
           <div style={{ fontSize: '14px', marginTop: '4px' }}>
             Total: {cacheStats.total} | Fresh: {cacheStats.fresh} | Expired: {cacheStats.expired}
           </div>
+          {cacheStats.hit_ratio !== undefined && cacheStats.lookup_mode !== 'direct' && (
+            <div style={{ fontSize: '12px', marginTop: '4px', opacity: 0.7 }}>
+              Hit rate: {Math.round(cacheStats.hit_ratio * 100)}%
+            </div>
+          )}
         </div>
       )}
 
@@ -470,7 +726,13 @@ const Content: VFC<{ serverAPI: ServerAPI }> = ({ serverAPI }) => {
                 fontSize: '12px',
               }}>
                 <div><strong>DB Size:</strong> {dbInfo.db_size} games</div>
+                <div><strong>Generation:</strong> {dbInfo.generation ?? 'Unknown'}</div>
                 <div><strong>Last Updated:</strong> {dbInfo.last_updated || 'Unknown'}</div>
+                {weeklyChanges && (
+                  <div>
+                    <strong>Last 7 Days:</strong> +{weeklyChanges.added_count} added, -{weeklyChanges.removed_count} removed
+                  </div>
+                )}
                 <div><strong>Plugin Dir:</strong> {dbInfo.plugin_dir || 'Not set'}</div>
               </div>
             )}
@@ -502,6 +764,10 @@ export default function (serverApi: ServerAPI) {
   };
 
   initPlugin();
+  prefetchLibrary(serverApi).catch((error) => console.error('GFN: Error prefetching library:', error));
+
+  let subscribed = true;
+  subscribeToEvents(serverApi, () => subscribed);
 
   // Register game page patch
   const unpatch = patchGamePage(serverApi, settingsManager);
@@ -511,6 +777,7 @@ export default function (serverApi: ServerAPI) {
     content: <Content serverAPI={serverApi} />,
     icon: <FaCloud />,
     onDismount() {
+      subscribed = false;
       unpatch();
     },
   };
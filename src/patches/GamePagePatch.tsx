@@ -8,6 +8,29 @@ interface SettingsManager {
   updateSettings(settings: GFNSettings): void;
 }
 
+// Answers for the library, resolved by prefetch_library when the plugin
+// loads; badges for these games are drawn without waiting for the plugin
+let prefetched: { library: Set<number>; available: Set<number> } | null = null;
+
+export function setPrefetchedLibrary(library: Iterable<number>, available: Iterable<number>): void {
+  prefetched = { library: new Set(library), available: new Set(available) };
+}
+
+function prefetchedAvailability(appid: string): GFNAvailability | null {
+  const key = Number(appid);
+  if (!prefetched || !prefetched.library.has(key)) return null;
+  return { available: prefetched.available.has(key), cached: true };
+}
+
+// Startup-to-first-badge latency, logged once per plugin load
+let patchedAt: number | null = null;
+
+function recordFirstBadge(source: 'prefetch' | 'lookup'): void {
+  if (patchedAt === null) return;
+  console.log(`GFN: first badge ${Math.round(performance.now() - patchedAt)} ms after load (${source})`);
+  patchedAt = null;
+}
+
 // GFN Indicator Component
 function GFNIndicator({
   id,
@@ -20,8 +43,8 @@ function GFNIndicator({
   serverAPI: ServerAPI;
   settingsManager: SettingsManager;
 }) {
-  const [gfnStatus, setGfnStatus] = useState<GFNAvailability | null>(null);
-  const [loading, setLoading] = useState(true);
+  const [gfnStatus, setGfnStatus] = useState<GFNAvailability | null>(() => prefetchedAvailability(appid));
+  const [loading, setLoading] = useState(gfnStatus === null);
   const settings = settingsManager.getSettings();
 
   useEffect(() => {
@@ -32,9 +55,20 @@ function GFNIndicator({
 
     let mounted = true;
 
+    // A prefetched answer is shown right away; the lookup still runs (an
+    // in-memory hit in the plugin) in case a refresh changed it since
+    const pinned = prefetchedAvailability(appid);
+    if (pinned) {
+      setGfnStatus(pinned);
+      setLoading(false);
+      recordFirstBadge('prefetch');
+    }
+
     const checkAvailability = async () => {
       try {
-        setLoading(true);
+        if (!pinned) {
+          setLoading(true);
+        }
         const result = await serverAPI.callPluginMethod<
           { appid: string },
           GFNAvailability
@@ -42,6 +76,7 @@ function GFNIndicator({
 
         if (mounted && result.success) {
           setGfnStatus(result.result);
+          recordFirstBadge('lookup');
         }
       } catch (error) {
         console.error('GFN: Error checking availability:', error);
@@ -80,6 +115,7 @@ export function patchGamePage(
     console.error('GFN: routerHook not available');
     return () => {};
   }
+  patchedAt = performance.now();
 
   try {
     const patch = serverAPI.routerHook.addPatch(
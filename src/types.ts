@@ -23,3 +23,90 @@ export const DEFAULT_SETTINGS: GFNSettings = {
   enabled: true,
   hideUnavailable: false,
 };
+
+export interface GFNBatchAvailability {
+  available: number[]; // Sorted app IDs that are on GFN
+  total: number;
+}
+
+export interface GFNChanges {
+  status: 'success' | 'error';
+  message?: string;
+  from_generation: number;
+  to_generation: number;
+  added_count: number;
+  removed_count: number;
+  added: { appid: number; name: string | null }[]; // Up to `limit` entries
+  removed: number[];
+}
+
+export interface GFNLibraryCoverage {
+  status: 'success' | 'resync';
+  fingerprint: string; // libraryFingerprint() of the library the plugin knows
+  generation?: number;
+  total?: number;
+  available_count?: number;
+  bitset?: string; // base64, bit i (LSB first) = i-th lowest library app ID is on GFN
+}
+
+export interface GFNLibraryPrefetch {
+  status: 'success';
+  generation: number;
+  fingerprint: string;
+  total: number;
+  available: number[]; // library app IDs that are on GFN, ascending
+}
+
+export interface GFNSearchResults {
+  status: 'success';
+  results: { appid: number; name: string | null }[]; // Best match first
+  indexed: number; // Titles searched
+}
+
+export interface GFNDbInfo {
+  db_size: number;
+  generation?: number;
+  plugin_dir: string | null;
+  last_updated: string | null;
+  games_added?: number; // set when a refresh published the database
+  games_removed?: number;
+  library?: { fingerprint: string; total: number; available_count: number };
+}
+
+export interface GFNCacheStats {
+  total: number;
+  expired: number;
+  fresh: number;
+  hit_ratio?: number;
+  lookup_mode?: 'direct' | 'cached'; // the cache is only consulted in "cached" mode
+}
+
+export interface GFNRefreshProgress {
+  pages_done: number;
+  pages_total: number; // grows as sources report their size; incremental syncs stop early
+  sources: { id: number; done: number; total: number }[];
+}
+
+export type GFNEvent = { id: number; time: number } & (
+  | { type: 'database'; data: GFNDbInfo }
+  | { type: 'refresh'; data: { state: 'running' | 'finished'; incremental?: boolean; result?: GFNRefreshResult } }
+  | { type: 'refresh_progress'; data: GFNRefreshProgress }
+  | { type: 'cache_stats'; data: GFNCacheStats }
+);
+
+export interface GFNEventBatch {
+  cursor: number; // pass back as `after`
+  events: GFNEvent[];
+  reset: boolean; // events were missed: start over from the latest state
+}
+
+export interface GFNRefreshResult {
+  status: string;
+  old_count?: number;
+  new_count?: number;
+  added?: number;
+  unchanged?: boolean; // no source changed; nothing was published
+  missing_pages?: number;
+  message?: string;
+  persistence?: { bytes: number; serialize_ms: number; write_ms: number };
+}
@@ -0,0 +1,74 @@
+"""AppidStreamParser on curator pages fed in small chunks (run: python3 -m pytest tests)"""
+
+import json
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main  # noqa: E402
+
+
+def parse(results_html, chunk_size=7):
+    """Parse a JSON curator page chunk by chunk and in one go; both must agree"""
+    body = json.dumps({"success": 1, "results_html": results_html, "total_count": 3}).encode("utf-8")
+    pages = []
+    for size in (chunk_size, len(body)):
+        parser = main.AppidStreamParser()
+        for start in range(0, len(body), size):
+            parser.feed(body[start:start + size])
+        pages.append(parser.page())
+    assert pages[0] == pages[1], pages
+    return pages[0]
+
+
+class AppidStreamParserTest(unittest.TestCase):
+    def test_titles(self):
+        page = parse('<div data-ds-appid="1"><img alt="Caf&eacute; &quot;One&quot; a\\b"></div>'
+                     '<div data-ds-appid="2"><img alt="Two &amp; Co"></div>')
+        self.assertEqual(page["total_count"], 3)
+        self.assertEqual(page["appids"], [1, 2])
+        self.assertEqual(page["names"], {"1": 'Café "One" a\\b', "2": "Two & Co"})
+
+    def test_empty_alt_is_not_a_title(self):
+        page = parse('<div data-ds-appid="1"><img alt=""></div>'
+                     '<div data-ds-appid="2"><img alt="Two"></div>')
+        self.assertEqual(page["names"], {"2": "Two"})
+
+    def test_later_alt_is_not_attached(self):
+        page = parse('<div data-ds-appid="1"><img alt=""><img alt="Badge"></div>'
+                     '<div data-ds-appid="2"></div><span><img alt="Stray"></span>'
+                     '<div data-ds-appid="3"><img alt="Three"><img alt="Overlay"></div>')
+        self.assertEqual(page["appids"], [1, 2, 3])
+        self.assertEqual(page["names"], {"3": "Three"})
+
+    def test_alt_must_be_inside_the_appid_element(self):
+        page = parse('<div class="rec" data-ds-appid="1"><a href="/app/1"><span/><img src="x" alt="One" /></a></div>'
+                     '<div data-ds-appid="2"><a><div class="desc">text</div></a></div><img alt="Stray">'
+                     '<div data-ds-appid="3"/><img alt="Stray">')
+        self.assertEqual(page["appids"], [1, 2, 3])
+        self.assertEqual(page["names"], {"1": "One"})
+
+    def test_escaped_closing_tags(self):
+        # Steam's JSON escapes "/" as "\/"
+        parser = main.AppidStreamParser()
+        for chunk in (b'{"results_html":"<div data-ds-appid=\\"4\\"><a><\\', b'/a><\\/div><img alt=\\"Stray\\">',
+                      b'<div data-ds-appid=\\"5\\"><a><img alt=\\"Five\\"><\\/a><\\/div>","total_count":2}'):
+            parser.feed(chunk)
+        self.assertEqual(parser.page(), {"total_count": 2, "appids": [4, 5], "names": {"5": "Five"}})
+
+    def test_long_escaped_title_across_chunks(self):
+        title = "日本語" * 20
+        page = parse(f'<div data-ds-appid="9"><img alt="{title}"></div>', chunk_size=300)
+        self.assertEqual(page["names"], {"9": title})
+
+    def test_plain_html(self):
+        parser = main.AppidStreamParser()
+        parser.feed(b'"total_count":2 <a data-ds-appid="5"><img alt="Five"></a>')
+        parser.feed(b'<a data-ds-appid="6"><img alt=""></a><img alt="late">')
+        self.assertEqual(parser.page(), {"total_count": 2, "appids": [5, 6], "names": {"5": "Five"}})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+"""AsyncHTTPClient against a local asyncio server (run: python3 -m pytest tests)"""
+
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main  # noqa: E402
+
+# path -> (status, extra headers, body)
+ROUTES = {
+    "/games.json": (200, {}, b'{"ok": 1}'),
+    "/moved": (301, {"Location": "/games.json"}, b"<html>moved</html>"),
+    "/temporary": (307, {"Location": "/moved"}, b""),
+    "/loop": (302, {"Location": "/loop"}, b""),
+}
+
+
+async def handle(reader, writer):
+    while True:
+        request_line = await reader.readline()
+        if not request_line:
+            break
+        while (await reader.readline()) not in (b"\r\n", b""):
+            pass
+        status, headers, body = ROUTES.get(request_line.split()[1].decode(), (404, {}, b""))
+        head = f"HTTP/1.1 {status} X\r\nContent-Length: {len(body)}\r\n"
+        head += "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        writer.write(head.encode("latin-1") + b"\r\n" + body)
+        await writer.drain()
+    writer.close()
+
+
+class AsyncHTTPClientTest(unittest.TestCase):
+    def get(self, path, sink=None):
+        async def run():
+            server = await asyncio.start_server(handle, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            client = main.AsyncHTTPClient()
+            try:
+                return await client.get(f"http://127.0.0.1:{port}{path}", sink=sink)
+            finally:
+                await client.close()
+                server.close()
+                await server.wait_closed()
+        return asyncio.run(run())
+
+    def test_follows_redirects(self):
+        response = self.get("/temporary")
+        self.assertEqual((response.status, response.json()), (200, {"ok": 1}))
+
+    def test_redirect_body_is_not_streamed(self):
+        chunks = []
+        self.assertEqual(self.get("/moved", sink=chunks.append).status, 200)
+        self.assertEqual(b"".join(chunks), b'{"ok": 1}')
+
+    def test_redirect_loop(self):
+        with self.assertRaises(ConnectionError):
+            self.get("/loop")
+
+    def test_not_found(self):
+        self.assertEqual(self.get("/missing").status, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
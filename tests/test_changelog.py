@@ -0,0 +1,140 @@
+"""Round trips through the change log's on-disk format (run: python3 -m pytest tests)"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main  # noqa: E402
+
+
+class ChangeLogTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = Path(self._tmp.name) / main.CHANGELOG_FILENAME
+        self.log = main.ChangeLog(self.path)
+
+    def test_round_trip(self):
+        self.log.append(1, 0, [10, 11], [])
+        self.log.append(2, 1, [12], [10])
+        self.log.append(3, 2, [10], [11])
+
+        reopened = main.ChangeLog(self.path)
+        self.assertEqual(reopened.diff(0, 1)["added"], [10, 11])
+        changes = reopened.diff(1, 2)
+        self.assertEqual((changes["added"], changes["removed"]), ([12], [10]))
+        self.assertIsNotNone(changes["from_time"])
+        changes = reopened.diff(0)
+        self.assertEqual((changes["to_generation"], changes["added"], changes["removed"]), (3, [10, 12], []))
+        self.assertEqual(reopened.diff(3, 3)["added"], [])
+        self.assertEqual(reopened.stats()["records"], 3)
+
+    def test_torn_tail_is_ignored_and_replaced(self):
+        self.log.append(1, 0, [10], [])
+        self.log.append(2, 1, [11], [])
+        with open(self.path, 'r+b') as f:
+            f.truncate(os.path.getsize(self.path) - 2)
+
+        self.assertEqual(self.log.diff(0)["to_generation"], 1)
+        self.log.append(2, 1, [12], [])
+        self.assertEqual(self.log.diff(0, 2)["added"], [10, 12])
+
+    def test_follows_the_newest_lineage(self):
+        # A log written before generations were kept unique: the database was
+        # re-imported at generation 0 after reaching generation 3
+        records = [(1, 0, [10, 11], []), (2, 1, [12], []), (3, 2, [13], []), (1, 0, [99], [])]
+        with open(self.path, 'wb') as f:
+            f.write(main.CHANGELOG_MAGIC)
+            for generation, base, added, removed in records:
+                f.write(main.ChangeLog._encode(generation, base, int(time.time()), added, removed))
+
+        self.assertEqual(self.log.diff(0, 1)["added"], [99])
+        self.assertEqual(self.log.diff(0)["added"], [99])
+        # The next refresh (generation 2 again) replaces the mixed history
+        self.log.append(2, 1, [14], [])
+        self.assertEqual(self.log.stats()["records"], 1)
+        self.assertEqual(self.log.generation_at(time.time()), 2)
+
+    def test_older_generation_starts_a_new_log(self):
+        self.log.append(1, 0, [10], [])
+        self.log.append(2, 1, [11], [])
+        self.log.append(2, 1, [12], [])
+
+        self.assertEqual(self.log.stats()["records"], 1)
+        self.assertEqual(self.log.diff(1, 2)["added"], [12])
+        with self.assertRaises(ValueError):
+            self.log.diff(0, 2)
+
+    def test_compacted_range(self):
+        old = time.time() - main.CHANGELOG_RETENTION.total_seconds() - 60
+        self.log.append(1, 0, [10], [], timestamp=old)
+        self.log.append(2, 1, [11], [], timestamp=old)
+        self.log.append(3, 2, [12], [10])
+
+        self.assertEqual(self.log.stats()["records"], 2)
+        self.assertEqual(self.log.diff(0, 3)["added"], [11, 12])
+        self.assertEqual(self.log.diff(2, 3)["removed"], [10])
+        with self.assertRaises(ValueError):
+            self.log.diff(1, 3)
+
+    def test_generation_at(self):
+        self.log.append(1, 0, [10], [], timestamp=1000)
+        self.log.append(2, 1, [11], [], timestamp=2000)
+
+        self.assertEqual(self.log.generation_at(500), 0)
+        self.assertEqual(self.log.generation_at(1500), 1)
+        self.assertEqual(self.log.generation_at(2500), 2)
+        self.assertIsNone(main.ChangeLog(self.path.with_name("missing.bin")).generation_at(0))
+
+
+class JsonImportGenerationTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.plugin_dir = Path(self._tmp.name)
+        self.defaults = self.plugin_dir / "defaults"
+        self.defaults.mkdir()
+
+    def load(self):
+        plugin = main.Plugin()
+        plugin._plugin_dir = self.plugin_dir
+        plugin._load_local_games_db()
+        return plugin._db
+
+    def write_json(self, appids, generation=0):
+        games = {str(appid): {"available": True} for appid in appids}
+        with open(self.defaults / "gfn_games.json", 'w') as f:
+            json.dump({"generation": generation, "games": games}, f)
+        # Newer than the snapshot, like a hand-edited export
+        later = time.time() + 10
+        os.utime(self.defaults / "gfn_games.json", (later, later))
+
+    def test_reimport_continues_the_change_log(self):
+        games = {"10": {"available": True}, "11": {"available": True}}
+        db = main.DatabaseSnapshot(main.GameIndex.from_games(games), 3, None)
+        main.write_snapshot(self.defaults / main.SNAPSHOT_FILENAME, db)
+        log = main.ChangeLog(self.defaults / main.CHANGELOG_FILENAME)
+        log.append(3, 2, [11], [])
+
+        self.write_json([10, 12])
+        db = self.load()
+
+        self.assertEqual(db.generation, 4)
+        changes = log.diff(2, 4)
+        self.assertEqual((changes["added"], changes["removed"]), ([12], []))
+        self.assertEqual(log.diff(3, 4)["removed"], [11])
+        self.assertEqual(main.load_snapshot(self.defaults / main.SNAPSHOT_FILENAME).generation, 4)
+
+    def test_fresh_install_keeps_the_exported_generation(self):
+        self.write_json([10], generation=7)
+        self.assertEqual(self.load().generation, 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
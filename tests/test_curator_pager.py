@@ -0,0 +1,114 @@
+"""_CuratorPager stop conditions on synthetic curator lists (run: python3 -m pytest tests)"""
+
+import sys
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main  # noqa: E402
+
+BATCH = 10
+OLD = list(range(50, 0, -1))  # newest first, 5 pages
+
+
+def crawl(catalog, sync_state=None, journal=None, missing=()):
+    """Drive a pager like fetch_curator_games_async; returns (pager, games, offsets fetched after page 0)"""
+    pages = {start: {"total_count": len(catalog), "appids": catalog[start:start + BATCH], "names": {}}
+             for start in range(0, len(catalog), BATCH)}
+    pager = main._CuratorPager(7, BATCH, sync_state, wave_size=1, journal=journal)
+    fetched = []
+    wave = pager.start(pages[0])
+    while wave:
+        fetched += wave
+        wave = pager.feed(wave, [None if start in missing else pages[start] for start in wave])
+    return pager, pager.finish(), fetched
+
+
+def synced(catalog=OLD):
+    """Sync state after a full sync of `catalog`"""
+    state = main.CuratorSyncState()
+    crawl(catalog, state)
+    return state
+
+
+class CuratorPagerTest(unittest.TestCase):
+    def test_full_sync_records_state(self):
+        state = main.CuratorSyncState()
+        pager, games, fetched = crawl(OLD, state)
+
+        self.assertEqual(pager.mode, "full")
+        self.assertEqual(fetched, [10, 20, 30, 40])
+        self.assertEqual(len(games), 50)
+        self.assertEqual(games["50"], {"available": True, "curator_id": 7})
+        entry = state.get(7)
+        self.assertEqual((entry["total_count"], len(entry["pages"]), len(entry["appids"])), (50, 5, 50))
+
+    def test_unchanged_stops_after_the_first_page(self):
+        pager, games, fetched = crawl(OLD, synced())
+        self.assertEqual((pager.mode, fetched, pager.requests), ("unchanged", [], 1))
+        self.assertEqual(len(games), 50)
+
+    def test_incremental_stops_at_a_known_page(self):
+        state = synced()
+        last_full_sync = state.get(7)["last_full_sync"]
+        pager, games, fetched = crawl([53, 52, 51] + OLD, state)
+
+        self.assertEqual(pager.mode, "incremental")
+        self.assertEqual(fetched, [10])
+        self.assertEqual(len(games), 53)
+        entry = state.get(7)
+        self.assertEqual((entry["total_count"], entry["last_full_sync"]), (53, last_full_sync))
+        # Offsets after the changed first page shifted: only fetched pages keep fingerprints
+        self.assertEqual(sorted(entry["pages"]), ["0", "10"])
+
+    def test_incremental_walks_until_the_growth_is_found(self):
+        catalog = [52] + OLD[:24] + [51] + OLD[24:]
+        pager, games, fetched = crawl(catalog, synced())
+
+        # Page 10 is all known, but only one of the two new games was seen by then
+        self.assertEqual(fetched, [10, 20, 30])
+        self.assertIn("51", games)
+        self.assertEqual(len(games), 52)
+
+    def test_shrink_falls_back_to_a_full_sync(self):
+        pager, games, fetched = crawl(OLD[1:], synced())
+        self.assertEqual((pager.mode, fetched), ("full", [10, 20, 30, 40]))
+        self.assertNotIn("50", games)
+
+    def test_full_sync_is_forced_after_the_interval(self):
+        state = synced()
+        old = datetime.now() - main.FULL_SYNC_INTERVAL - timedelta(days=1)
+        state.get(7)["last_full_sync"] = old.strftime("%Y-%m-%d %H:%M:%S")
+        pager, _, fetched = crawl(OLD, state)
+        self.assertEqual((pager.mode, fetched), ("full", [10, 20, 30, 40]))
+        self.assertNotEqual(state.get(7)["last_full_sync"], old.strftime("%Y-%m-%d %H:%M:%S"))
+
+    def test_missing_pages_make_it_partial(self):
+        state = main.CuratorSyncState()
+        pager, games, _ = crawl(OLD, state, missing={20})
+
+        self.assertEqual((pager.mode, pager.missing), ("partial", [20]))
+        self.assertEqual(len(games), 40)
+        self.assertNotIn("25", games)
+        # The next refresh must not trust this sync
+        self.assertIsNone(state.get(7))
+
+    def test_resumes_from_the_journal(self):
+        journal = main.RefreshJournal()
+        crawl(OLD, journal=journal, missing={30, 40})
+        pager, games, fetched = crawl(OLD, journal=journal)
+
+        self.assertEqual(fetched, [30, 40])
+        self.assertEqual(len(games), 50)
+
+    def test_journal_is_ignored_when_total_count_changed(self):
+        journal = main.RefreshJournal()
+        crawl(OLD, journal=journal, missing={30, 40})
+        _, _, fetched = crawl([51] + OLD, journal=journal)
+        self.assertEqual(fetched, [10, 20, 30, 40, 50])
+
+
+if __name__ == "__main__":
+    unittest.main()
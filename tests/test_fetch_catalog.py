@@ -0,0 +1,67 @@
+"""fetch_catalog merging and carry-over with stub sources (run: python3 -m pytest tests)"""
+
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main  # noqa: E402
+
+
+class StubSource(main.CatalogSource):
+    """Returns fixed games, or raises the given exception"""
+
+    def __init__(self, source_id, games=None, error=None):
+        super().__init__(source_id, f"Stub {source_id}", deadline=5)
+        self.games = games
+        self.error = error
+
+    async def fetch(self, client, rate_limiter, sync_state, report, journal=None, progress=None):
+        if self.error is not None:
+            raise self.error
+        return self.games
+
+
+def fetch(sources, previous):
+    return asyncio.run(main.fetch_catalog(sources, client=main.AsyncHTTPClient(),
+                                          rate_limiter=main.RateLimiter(1000), previous=previous))
+
+
+class FetchCatalogTest(unittest.TestCase):
+    def test_failed_source_keeps_its_games(self):
+        previous = main.GameIndex.from_games({
+            "10": {"sources": [101]},
+            "20": {"sources": [202]},
+            "30": {"sources": [101, 202]},
+        }, source_ids=[101, 202])
+        games, reports = fetch([StubSource(101, {"10": {}}), StubSource(202, error=ConnectionError("down"))],
+                               previous)
+
+        self.assertEqual(sorted(games), ["10", "20", "30"])
+        self.assertEqual(games["10"]["sources"], [101])
+        self.assertEqual(games["30"]["sources"], [202])
+        self.assertEqual([report["status"] for report in reports], ["ok", "error"])
+        self.assertEqual(reports[1]["carried_over"], 2)
+
+    def test_legacy_games_survive_a_failed_source(self):
+        # Like the shipped defaults/gfn_games.json: no "sources" or "curator_id"
+        previous = main.GameIndex.from_games({str(appid): {"name": f"Game {appid}"} for appid in range(1, 51)},
+                                             source_ids=[101, 202])
+        fresh = {str(appid): {} for appid in range(1, 21)}
+        games, reports = fetch([StubSource(101, fresh), StubSource(202, error=ConnectionError("down"))], previous)
+
+        self.assertEqual(len(games), 50)
+        self.assertEqual(reports[1]["carried_over"], 50)
+        self.assertEqual(games["1"]["sources"], [101, 202])
+        self.assertEqual(games["50"]["sources"], [202])
+
+    def test_every_source_ok_drops_unlisted_games(self):
+        previous = main.GameIndex.from_games({"1": {}, "2": {}}, source_ids=[101])
+        games, _ = fetch([StubSource(101, {"2": {"name": "Two"}})], previous)
+        self.assertEqual(games, {"2": {"available": True, "sources": [101], "name": "Two"}})
+
+
+if __name__ == "__main__":
+    unittest.main()
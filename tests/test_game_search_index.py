@@ -0,0 +1,59 @@
+"""GameSearchIndex ranking over a small catalog (run: python3 -m pytest tests)"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main  # noqa: E402
+
+TITLES = {
+    10: "Dark Souls III",
+    20: "Dark Souls",
+    30: "Darksiders",
+    40: "The Dark Pictures",
+    50: "Hades",
+    60: "Star Wars: Dark Forces",
+    70: "Souls of Darkness",
+    80: None,  # unnamed games are not indexed
+}
+
+
+def names(results):
+    return [result["name"] for result in results]
+
+
+class GameSearchIndexTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        games = {str(appid): {"available": True, "name": name} for appid, name in TITLES.items()}
+        cls.search = main.GameSearchIndex(main.GameIndex.from_games(games), generation=3)
+
+    def test_tiers(self):
+        self.assertEqual(len(self.search), 7)
+        # Title prefixes, then word prefixes; shorter titles first, then alphabetical
+        self.assertEqual(names(self.search.search("dark")),
+                         ["Dark Souls", "Darksiders", "Dark Souls III", "Souls of Darkness", "The Dark Pictures",
+                          "Star Wars: Dark Forces"])
+        # Only the word being typed is a prefix: "dark" is a whole word here
+        self.assertEqual(names(self.search.search("dark souls")), ["Dark Souls", "Dark Souls III"])
+        self.assertEqual(names(self.search.search("souls dark")),
+                         ["Dark Souls", "Dark Souls III", "Souls of Darkness"])
+
+    def test_limit_stops_at_the_best_tiers(self):
+        self.assertEqual(names(self.search.search("dark", limit=2)), ["Dark Souls", "Darksiders"])
+        self.assertEqual(self.search.search("dark", limit=0), [])
+
+    def test_prefix_and_appids(self):
+        self.assertEqual(self.search.search("ha"), [{"appid": 50, "name": "Hades"}])
+        self.assertEqual(names(self.search.search("d")), names(self.search.search("dark")))
+
+    def test_typos_and_misses(self):
+        self.assertEqual(names(self.search.search("darksidres"))[:1], ["Darksiders"])
+        self.assertEqual(self.search.search("zqxwv"), [])
+        self.assertEqual(self.search.search("  "), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
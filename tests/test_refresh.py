@@ -0,0 +1,100 @@
+"""Plugin refreshes against a stub Steam store (run: python3 -m pytest tests)"""
+
+import asyncio
+import json
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main  # noqa: E402
+
+
+class StubStore:
+    """
+    Answers curator pages for AsyncHTTPClient.get: curator N lists app IDs
+    N * 1000 + 1 .. N * 1000 + totals[N]. Pages at or past `hang_from[N]`
+    never arrive.
+    """
+
+    def __init__(self, totals, hang_from=None):
+        self.totals = totals
+        self.hang_from = hang_from or {}
+        self.requested = {curator_id: [] for curator_id in totals}
+
+    def client(self, *args, **kwargs):
+        return self
+
+    async def get(self, url, timeout=None, sink=None):
+        parts = urlsplit(url)
+        curator_id = int(parts.path.split("/")[2])
+        start = int(parse_qs(parts.query)["start"][0])
+        self.requested[curator_id].append(start)
+        if start >= self.hang_from.get(curator_id, float("inf")):
+            await asyncio.sleep(3600)
+        total = self.totals[curator_id]
+        html = "".join(f'<div data-ds-appid="{curator_id * 1000 + i}"></div>'
+                       for i in range(start + 1, min(start + 100, total) + 1))
+        sink(json.dumps({"success": 1, "results_html": html, "total_count": total}).encode("utf-8"))
+        return main.AsyncHTTPResponse(200, {}, b"")
+
+    async def close(self):
+        pass
+
+
+class RefreshTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.plugin = main.Plugin()
+        self.plugin._plugin_dir = Path(self._tmp.name)
+        (self.plugin._plugin_dir / "defaults").mkdir()
+        self.journal_path = self.plugin._plugin_dir / "defaults" / main.JOURNAL_FILENAME
+        games = {str(appid): {"sources": [1]} for appid in (1001, 1450, 2001)}
+        self.plugin._db = main.DatabaseSnapshot(main.GameIndex.from_games(games, [1, 2]), 1, None)
+
+    def refresh(self, store, curator_deadline=60):
+        sources = [main.CuratorSource(1, deadline=curator_deadline), main.CuratorSource(2)]
+        with mock.patch.object(main, "AsyncHTTPClient", store.client), \
+                mock.patch.object(main, "default_sources", lambda: sources), \
+                mock.patch.object(main, "FETCH_RATE_LIMIT", 0):
+            return asyncio.run(self.plugin._get_scheduler().run(incremental=False))
+
+    def test_timed_out_source_makes_a_partial_refresh(self):
+        result = self.refresh(StubStore({1: 500, 2: 50}, hang_from={1: 200}), curator_deadline=0.5)
+
+        self.assertEqual(result["status"], "partial")
+        self.assertEqual([report["status"] for report in result["sources"]], ["timeout", "ok"])
+        self.assertIn("Curator 1", result["message"])
+        # Curator 1's games are carried over from the previous database
+        self.assertEqual(result["sources"][0]["carried_over"], 3)
+        self.assertIn(1450, self.plugin._db.index)
+        self.assertEqual(len(self.plugin._db.index), 52)
+        self.assertTrue(self.journal_path.exists())
+        scheduler = self.plugin._get_scheduler()
+        self.assertEqual(scheduler.consecutive_failures, 1)
+        # Retried after the first backoff step, not a full interval later
+        self.assertLessEqual(scheduler._next_run - time.monotonic(), scheduler.backoff_base * (1 + scheduler.jitter))
+
+    def test_resume_after_timeout(self):
+        self.refresh(StubStore({1: 500, 2: 50}, hang_from={1: 200}), curator_deadline=0.5)
+        journal = json.loads(self.journal_path.read_text())
+        self.assertEqual(sorted(journal["curators"]["1"]["pages"]), ["0", "100"])
+
+        store = StubStore({1: 500, 2: 50})
+        result = self.refresh(store)
+
+        self.assertEqual(result["status"], "success")
+        # The first page is always fetched to check total_count; 100 comes from the journal
+        self.assertEqual(sorted(store.requested[1]), [0, 200, 300, 400])
+        self.assertEqual(len(self.plugin._db.index), 550)
+        self.assertFalse(self.journal_path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""RefreshScheduler coalescing and backoff with a stub refresh (run: python3 -m pytest tests)"""
+
+import asyncio
+import sys
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main  # noqa: E402
+
+
+class StubRefresh:
+    """Returns the queued results in order, each after `delay` seconds"""
+
+    def __init__(self, *results, delay=0.05):
+        self.results = list(results)
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def scheduler(refresh):
+    return main.RefreshScheduler(refresh, interval=1000, jitter=0, backoff_base=10, backoff_max=25)
+
+
+def next_delay(scheduler):
+    return round(scheduler._next_run - time.monotonic())
+
+
+class RefreshSchedulerTest(unittest.TestCase):
+    def test_concurrent_callers_share_one_refresh(self):
+        refresh = StubRefresh({"status": "success"})
+        runner = scheduler(refresh)
+
+        async def run():
+            return await asyncio.gather(runner.run(), runner.run(), runner.run())
+
+        results = asyncio.run(run())
+        self.assertEqual(results, [{"status": "success"}] * 3)
+        self.assertEqual((refresh.calls, runner.runs, runner.coalesced), (1, 1, 2))
+
+    def test_cancelled_caller_does_not_cancel_the_refresh(self):
+        refresh = StubRefresh({"status": "success"})
+        runner = scheduler(refresh)
+
+        async def run():
+            first = asyncio.ensure_future(runner.run())
+            second = asyncio.ensure_future(runner.run())
+            await asyncio.sleep(0.01)
+            first.cancel()
+            return await second, first.cancelled()
+
+        self.assertEqual(asyncio.run(run()), ({"status": "success"}, True))
+        self.assertEqual(runner.last_result, {"status": "success"})
+
+    def test_backoff_after_failures_and_reset_on_success(self):
+        refresh = StubRefresh({"status": "error", "message": "offline"}, {"status": "partial"},
+                              RuntimeError("boom"), {"status": "success"}, delay=0)
+        runner = scheduler(refresh)
+
+        async def run():
+            delays = []
+            for _ in range(4):
+                result = await runner.run()
+                delays.append((result["status"], runner.consecutive_failures, next_delay(runner)))
+            return delays
+
+        self.assertEqual(asyncio.run(run()), [
+            ("error", 1, 10),
+            ("partial", 2, 20),  # published, but retried like a failure
+            ("error", 3, 25),  # capped at backoff_max
+            ("success", 0, 1000),
+        ])
+        self.assertIsNone(runner.last_error)
+
+    def test_schedule_runs_in_the_background(self):
+        refresh = StubRefresh({"status": "success"}, delay=0)
+        runner = scheduler(refresh)
+
+        async def run():
+            runner.start(0)
+            for _ in range(100):
+                if refresh.calls:
+                    break
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.01)
+            state = runner.state()
+            await runner.stop()
+            return state
+
+        state = asyncio.run(run())
+        self.assertEqual((refresh.calls, state["last_status"], state["running"]), (1, "success", False))
+        self.assertIsNotNone(state["next_run"])
+        self.assertIsNone(runner.state()["next_run"])
+
+
+if __name__ == "__main__":
+    unittest.main()